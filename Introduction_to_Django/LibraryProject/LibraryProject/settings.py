@@ -10,11 +10,17 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Packages shared by the projects of this repository live in ../../shared.
+sys.path.append(str(BASE_DIR.parent.parent / 'shared'))
+
+from sqlite_options import SQLITE_OPTIONS  # noqa: E402
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -38,6 +44,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles', 
     'bookshelf',  
+    'sqlite_options',  # per-connection pragmas, manage.py enable_wal
 ]
 
 MIDDLEWARE = [
@@ -73,10 +80,14 @@ WSGI_APPLICATION = 'LibraryProject.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Concurrent-friendly SQLite on every new connection: a 20s busy timeout, BEGIN
+# IMMEDIATE transactions and a larger page cache (see ../../shared/sqlite_options).
+# Run `manage.py enable_wal` once to switch db.sqlite3 to the WAL journal.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_OPTIONS,
     }
 }
 
@@ -0,0 +1,51 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from seeding import AUTHOR_NAMES, book_rows, insert_rows
+
+from bookshelf.models import Book
+
+
+class Command(BaseCommand):
+    """
+    Generate realistic, deterministic Book rows for scale testing.
+
+        python manage.py seed_data                       # 1M books
+        python manage.py seed_data --books 5000000 --clear
+        python manage.py seed_data --seed 7              # another, equally reproducible, data set
+
+    The same --seed and size always produce the same rows (on an empty or --clear'ed table).
+    Books are inserted in batches of plain INSERTs (no model instances), in one transaction,
+    without model signals.
+    """
+    help = "Bulk-insert deterministic synthetic books."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--books', type=int, default=1_000_000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--clear', action='store_true', help='Delete every book first.')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        connection = connections[using]
+        rng = random.Random(options['seed'])
+        start = time.perf_counter()
+
+        with transaction.atomic(using=using):
+            if options['clear']:
+                with connection.cursor() as cursor:
+                    cursor.execute(f'DELETE FROM {connection.ops.quote_name(Book._meta.db_table)}')
+            created = 0
+            while created < options['books']:
+                size = min(options['batch_size'], options['books'] - created)
+                insert_rows(connection, Book, ['title', 'author', 'publication_year'],
+                            book_rows(rng, size, AUTHOR_NAMES, years=True))
+                created += size
+                if created % 100_000 < size:
+                    self.stdout.write(f"  {created} books ({time.perf_counter() - start:.1f}s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Created {created} books in {time.perf_counter() - start:.1f}s."))
@@ -1,3 +1,20 @@
+import io
+
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+from .models import Book
+
+
+class SeedDataTests(TestCase):
+    def seed(self, **options):
+        call_command("seed_data", books=25, batch_size=10, stdout=io.StringIO(), **options)
+        return list(Book.objects.order_by("id").values_list("title", "author", "publication_year"))
+
+    def test_seed_data_is_deterministic_and_clears(self):
+        Book.objects.create(title="Things Fall Apart", author="Chinua Achebe", publication_year=1958)
+        first = self.seed(clear=True)
+        self.assertEqual(len(first), 25)
+        self.assertTrue(all(1900 <= year < 2025 for _, _, year in first))
+        self.assertEqual(self.seed(clear=True), first)
+        self.assertEqual(len(self.seed()), 50)
@@ -10,11 +10,18 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Packages shared by the projects of this repository live in ../shared.
+sys.path.append(str(BASE_DIR.parent / 'shared'))
+
+from sqlite_options import SQLITE_OPTIONS  # noqa: E402
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -41,14 +48,18 @@ INSTALLED_APPS = [
     'rest_framework',
     'django_filters',
     'api',
+    'db_replicas',  # manage.py sync_replicas
+    'sqlite_options',  # per-connection pragmas, manage.py enable_wal
 ]
 
 MIDDLEWARE = [
+    'api.instrumentation.InstrumentationMiddleware',  # first, so its "total" covers every other layer
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'db_replicas.ReplicaStickinessMiddleware',  # read-your-writes for replica reads
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -76,11 +87,34 @@ WSGI_APPLICATION = 'advanced_api_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Concurrent-friendly SQLite on every new connection: a 20s busy timeout, BEGIN
+# IMMEDIATE transactions and a larger page cache (see ../shared/sqlite_options).
+# Run `manage.py enable_wal` once to switch db.sqlite3 to the WAL journal.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_OPTIONS,
+    }
+}
+
+# Read replicas for the book endpoints (see api/replicas.py and ../shared/db_replicas).
+# Locally, API_REPLICAS=2 adds two replicas that are copies of db.sqlite3, refreshed by
+# `python manage.py sync_replicas --interval 1` (a stand-in for real replication).
+# TEST MIRROR: the test run reads "replicas" from the test database itself.
+for number in range(1, int(os.environ.get('API_REPLICAS', 0)) + 1):
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'NAME': BASE_DIR / f'db.replica{number}.sqlite3',
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_ROUTERS = ['db_replicas.ReplicaRouter']
+
+DATABASE_REPLICAS = {
+    'ALIASES': [alias for alias in DATABASES if alias != 'default'],
+    'STICKY_SECONDS': 10,   # a user's reads stay on the primary this long after a write
+    'MAX_LAG': 5,           # replication lag bound; data changed more recently is read from the primary
 }
 
 
@@ -120,6 +154,29 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Cache (response cache for the book/author read endpoints, see api/cache.py)
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'api.cache.LRUCache',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+            'MAX_BYTES': 64 * 1024 * 1024,
+        },
+    }
+}
+
+# Per-request SQL/serializer/render instrumentation (see api/instrumentation.py);
+# lower SAMPLE_RATE (e.g. 0.01) in production.
+
+INSTRUMENTATION = {
+    'SAMPLE_RATE': 1.0,
+    'SERVER_TIMING': True,
+    'N_PLUS_ONE_THRESHOLD': 3,
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -142,6 +199,20 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
 
+    # orjson-backed JSON (falls back to the stdlib json module, see drf_orjson)
+    'DEFAULT_RENDERER_CLASSES': [
+        'drf_orjson.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'drf_orjson.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+
+    # Keyset (cursor) pagination: deep pages cost the same as the first one
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
 }
 
 
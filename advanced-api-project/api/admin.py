@@ -3,7 +3,7 @@ from .models import Author, Book
 
 @admin.register(Author)
 class AuthorAdmin(admin.ModelAdmin):
-    list_display = ("id", "name")
+    list_display = ("id", "name", "book_count", "latest_publication_year")
     search_fields = ("name",)
 
 @admin.register(Book)
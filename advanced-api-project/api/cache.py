@@ -0,0 +1,295 @@
+"""
+Response caching for the read endpoints.
+
+- LRUCache: in-process, size-bounded cache backend for single-process deployments
+  (configured in settings.CACHES) with hit/miss/eviction counters. With several
+  worker processes use a shared backend (Redis, Memcached) instead, so that
+  generation bumps reach every worker.
+- Generation counters: every cached response records the "generations" of the
+  data it depends on (e.g. "books", "book:42"). Writes bump those counters
+  (see api.signals), which changes the cache key, so stale entries are simply
+  never read again and age out of the LRU. Nothing is ever flushed wholesale.
+- CachedResponseMixin: caches the rendered body of successful GET responses,
+  keyed on the view, URL kwargs, normalized query string, user class,
+  negotiated media type and the current generations; the same key doubles as
+  the ETag for conditional GETs (304 Not Modified).
+"""
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, urlencode
+
+RESPONSE_CACHE_ALIAS = 'default'
+
+
+class LRUCache(BaseCache):
+    """
+    Thread-safe least-recently-used cache living in the process memory.
+
+    OPTIONS:
+        MAX_ENTRIES  maximum number of keys (default 300, like Django's built-in backends)
+        MAX_BYTES    maximum total size of the pickled values (default: unbounded)
+    """
+    def __init__(self, name, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._max_bytes = options.get('MAX_BYTES')
+        self._data = OrderedDict()  # key -> (pickled value, expiry or None)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    # -------------------- BaseCache API --------------------
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            if self._get_live(key) is not None:
+                return False
+            self._store(key, value, timeout)
+            return True
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            entry = self._get_live(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._data.move_to_end(key)
+            pickled = entry[0]
+        return pickle.loads(pickled)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            self._store(key, value, timeout)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            entry = self._get_live(key)
+            if entry is None:
+                return False
+            self._data[key] = (entry[0], self.get_backend_timeout(timeout))
+            return True
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            entry = self._get_live(key)
+            if entry is None:
+                raise ValueError("Key '%s' not found" % key)
+            value = pickle.loads(entry[0]) + delta
+            self._replace(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), entry[1])
+            self._data.move_to_end(key)
+        return value
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            return self._delete(key)
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            return self._get_live(key) is not None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    # -------------------- metrics --------------------
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'max_entries': self._max_entries,
+                'max_bytes': self._max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+    # -------------------- internals (lock held) --------------------
+    def _get_live(self, key):
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            self._delete(key)
+            return None
+        return entry
+
+    def _store(self, key, value, timeout):
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self._replace(key, pickled, self.get_backend_timeout(timeout))
+        self._data.move_to_end(key)
+        self._evict()
+
+    def _replace(self, key, pickled, expiry):
+        old = self._data.get(key)
+        if old is not None:
+            self._bytes -= len(old[0])
+        self._data[key] = (pickled, expiry)
+        self._bytes += len(pickled)
+
+    def _delete(self, key):
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= len(entry[0])
+        return True
+
+    def _evict(self):
+        while self._data and (
+            len(self._data) > self._max_entries
+            or (self._max_bytes is not None and self._bytes > self._max_bytes)
+        ):
+            _, (pickled, _) = self._data.popitem(last=False)
+            self._bytes -= len(pickled)
+            self.evictions += 1
+
+
+# -------------------- generations --------------------
+def get_versions(names):
+    """
+    Current generation of each name, and when the most recent of them changed
+    (a Unix timestamp, used for Last-Modified).
+
+    A missing counter (never used, or evicted) starts from the current time, so
+    it can never repeat a value that cached responses were stored under; a
+    missing modification time is reported as "now", which is never too early.
+    """
+    cache = caches[RESPONSE_CACHE_ALIAS]
+    generation_keys = [f'generation:{name}' for name in names]
+    modified_keys = [f'modified:{name}' for name in names]
+    found = cache.get_many(generation_keys + modified_keys)
+    for key in generation_keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key, time.time_ns())
+    for key in modified_keys:
+        if key not in found:
+            cache.add(key, time.time(), timeout=None)
+            found[key] = cache.get(key, time.time())
+    generations = [found[key] for key in generation_keys]
+    last_modified = max((found[key] for key in modified_keys), default=time.time())
+    return generations, last_modified
+
+
+def bump_generations(*names):
+    """Invalidate every cached response (and ETag) that depends on any of `names`."""
+    cache = caches[RESPONSE_CACHE_ALIAS]
+    now = time.time()
+    for name in names:
+        try:
+            cache.incr(f'generation:{name}')
+        except ValueError:
+            # Never read yet (or evicted): get_versions() will start a fresh
+            # generation, and without a stored time it reports "modified now".
+            cache.delete(f'modified:{name}')
+            continue
+        cache.set(f'modified:{name}', now, timeout=None)
+
+
+# -------------------- views --------------------
+class CachedResponseMixin:
+    """
+    Serve successful GET responses from the response cache, with conditional GET.
+
+    Views must declare what they depend on in cache_dependencies, generation names
+    formatted with the URL kwargs, e.g.
+        cache_dependencies = ['books']                      for a list
+        cache_dependencies = ['book:{pk}', 'author-names']  for a detail view
+    (or override get_cache_dependencies() when they vary with the request).
+
+    - Every response carries a strong ETag (the cache key: same data, query and
+      media type -> same bytes) and Last-Modified (last bump of a dependency).
+    - If-None-Match / If-Modified-Since are answered with 304 Not Modified before
+      touching the database or the serializer. The ETag is authoritative: HTTP
+      dates only have one-second resolution.
+    - Responses carry `X-Cache: HIT` or `X-Cache: MISS`.
+    """
+    cache_timeout = 300
+    cache_dependencies = None
+    # Query parameters that never change the response (tracking, cache busting...).
+    cache_ignored_params = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.cache_dependencies is None and cls.get_cache_dependencies is CachedResponseMixin.get_cache_dependencies:
+            raise ImproperlyConfigured(f'{cls.__name__} must set cache_dependencies (see CachedResponseMixin).')
+
+    def get_cache_dependencies(self):
+        return [name.format(**self.kwargs) for name in self.cache_dependencies]
+
+    def get_user_class(self, request):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return 'anon'
+        return 'staff' if user.is_staff else 'user'
+
+    def get_cache_key(self, request, generations):
+        params = sorted(
+            (key, sorted(values)) for key, values in request.query_params.lists()
+            if key not in self.cache_ignored_params
+        )
+        dependencies = self.get_cache_dependencies()
+        parts = [
+            f'{type(self).__module__}.{type(self).__name__}',
+            request.get_host(),  # pagination links are absolute URLs
+            urlencode(sorted(self.kwargs.items())),
+            urlencode(params, doseq=True),
+            self.get_user_class(request),
+            request.accepted_media_type,
+            ','.join(f'{name}={generation}' for name, generation in zip(dependencies, generations)),
+        ]
+        return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+    def get(self, request, *args, **kwargs):
+        generations, last_modified = get_versions(self.get_cache_dependencies())
+        self.data_modified_at = last_modified  # see api.replicas.ReplicaReadMixin
+        digest = self.get_cache_key(request, generations)
+        etag = f'"{digest}"'
+        last_modified = int(last_modified)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            return self.add_validators(response, etag, last_modified)
+
+        cache = caches[RESPONSE_CACHE_ALIAS]
+        key = f'response:{digest}'
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Cache'] = 'HIT'
+            return self.add_validators(response, etag, last_modified)
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+        response['X-Cache'] = 'MISS'
+
+        def store(rendered):
+            cache.set(key, (rendered.content, rendered['Content-Type']), self.cache_timeout)
+        response.add_post_render_callback(store)
+        return self.add_validators(response, etag, last_modified)
+
+    @staticmethod
+    def add_validators(response, etag, last_modified):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ['Accept'])
+        return response
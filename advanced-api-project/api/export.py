@@ -0,0 +1,68 @@
+"""
+Streaming exports of query results.
+
+Rows are read from the database with QuerySet.iterator(chunk_size) (a
+server-side cursor on PostgreSQL, fetchmany() on SQLite), encoded one at a
+time and sent in blocks of roughly `buffer_size` bytes, so memory use depends
+on the chunk and buffer sizes, never on the number of rows exported.
+"""
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+
+
+class _Echo:
+    """File-like object whose write() returns the text instead of storing it (for csv.writer)."""
+    def write(self, value):
+        return value
+
+
+def ndjson_lines(columns, rows):
+    """One JSON object per row: {"id": 1, "title": "..."}\\n"""
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+def csv_lines(columns, rows):
+    """A header line, then one CSV line per row."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def buffered(lines, buffer_size=BUFFER_SIZE, encoding='utf-8'):
+    """Join encoded lines into blocks of about `buffer_size` bytes (fewer, larger writes)."""
+    block = []
+    size = 0
+    for line in lines:
+        data = line.encode(encoding)
+        block.append(data)
+        size += len(data)
+        if size >= buffer_size:
+            yield b''.join(block)
+            block = []
+            size = 0
+    if block:
+        yield b''.join(block)
+
+
+FORMATS = {
+    # name: (line encoder, content type, file extension)
+    'ndjson': (ndjson_lines, 'application/x-ndjson', 'ndjson'),
+    'csv': (csv_lines, 'text/csv; charset=utf-8', 'csv'),
+}
+
+
+def stream_queryset(queryset, fields, fmt, chunk_size=CHUNK_SIZE, columns=None):
+    """
+    Iterable of byte blocks exporting `fields` of every row in `queryset` as `fmt`.
+    `columns` renames the fields in the output (defaults to the field names).
+    """
+    encode = FORMATS[fmt][0]
+    rows = queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+    return buffered(encode(columns or fields, rows))
@@ -0,0 +1,33 @@
+from django.db.models import F
+from rest_framework import filters as drf_filters
+
+from .search import fts_available, match_expression
+
+
+class FullTextSearchFilter(drf_filters.SearchFilter):
+    """
+    FullTextSearchFilter
+    - Drop-in replacement for SearchFilter on Book querysets (same ?search= parameter).
+    - On SQLite with FTS5 it matches word prefixes through the api_book_fts index instead of
+      running LIKE '%term%' over every row, and annotates each match with `search_rank`
+      (bm25, lower is more relevant).
+    - Everywhere else it behaves exactly like SearchFilter (icontains over search_fields).
+    """
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms or not fts_available(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+        return queryset.filter(search_index__document__match=match_expression(terms)).annotate(
+            search_rank=F('search_index__rank')
+        )
+
+
+class RelevanceOrderingFilter(drf_filters.OrderingFilter):
+    """
+    OrderingFilter that sorts full-text matches by relevance when the client did not ask
+    for an explicit ?ordering=. Must run after FullTextSearchFilter.
+    """
+    def get_ordering(self, request, queryset, view):
+        if self.ordering_param not in request.query_params and 'search_rank' in queryset.query.annotations:
+            return ['search_rank']
+        return super().get_ordering(request, queryset, view)
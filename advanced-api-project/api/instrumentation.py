@@ -0,0 +1,276 @@
+"""
+Per-request SQL and timing instrumentation.
+
+For each sampled request InstrumentationMiddleware records:
+
+- the number of SQL queries and the time spent running them (a database
+  execute wrapper installed on every connection, see install_query_recorder),
+- repeated queries: statements that differ only in their parameters and ran
+  at least N_PLUS_ONE_THRESHOLD times in the request (the usual N+1 pattern),
+- serializer time (DRF serializers' to_representation(), ValuesSerializer.serialize())
+  and render time (Response.render()), both excluding the SQL they trigger,
+
+and reports them in a Server-Timing header (visible in the browser's network
+panel) and in per-endpoint totals served by InstrumentationStatsView, e.g.
+
+    Server-Timing: db;dur=3.12;desc="7 queries", serialize;dur=0.85, render;dur=0.41, total;dur=5.96
+
+Settings (settings.INSTRUMENTATION, every key optional):
+
+    SAMPLE_RATE           fraction of requests instrumented (default 1.0). Requests that
+                          are not sampled cost one random() call, and each of their queries
+                          one context variable lookup, so e.g. 0.01 is cheap enough for
+                          production.
+    SERVER_TIMING         add the Server-Timing header to sampled responses (default True).
+    N_PLUS_ONE_THRESHOLD  repeats of one statement that count as an N+1 (default 3).
+
+Everything runs in the request's context (a contextvars.ContextVar), so
+concurrent requests, threads and async views (whose ORM calls run in a worker
+thread) are measured separately. Bodies of streaming responses are produced
+after the middleware returns and are not measured.
+"""
+import functools
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+DEFAULTS = {
+    'SAMPLE_RATE': 1.0,
+    'SERVER_TIMING': True,
+    'N_PLUS_ONE_THRESHOLD': 3,
+}
+PHASES = ('serialize', 'render')
+MAX_SIGNATURES = 20  # N+1 signatures kept per endpoint
+
+_current = ContextVar('api_instrumentation', default=None)
+
+# "IN (%s, %s, %s)" -> "IN (...)", so batches of different sizes share one signature.
+PLACEHOLDER_LIST = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+
+
+def get_setting(name):
+    return getattr(settings, 'INSTRUMENTATION', {}).get(name, DEFAULTS[name])
+
+
+def get_signature(sql):
+    return PLACEHOLDER_LIST.sub('(...)', sql)
+
+
+class RequestMetrics:
+    """What one sampled request did; filled in by the query recorder and the timers."""
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = Counter()  # SQL (with placeholders) -> executions
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.phase = None  # phase being timed, so nested timers are not counted twice
+
+    def repeated_queries(self, threshold):
+        """{signature: executions} of the statements that ran at least `threshold` times."""
+        signatures = Counter()
+        for sql, count in self.statements.items():
+            signatures[get_signature(sql)] += count
+        return {signature: count for signature, count in signatures.items() if count >= threshold}
+
+
+# -------------------- hooks --------------------
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper: counts and times the queries of sampled requests."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - start
+        metrics.queries += 1
+        metrics.statements[sql] += 1
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """connection_created receiver (see ApiConfig.ready); connections are per thread."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def start_phase(metrics, phase):
+    if metrics is None or metrics.phase is not None:
+        return None
+    metrics.phase = phase
+    return time.perf_counter(), metrics.db_time
+
+
+def end_phase(metrics, phase, started):
+    start, db_time = started
+    metrics.phase = None
+    # SQL run while serializing/rendering (lazy querysets, N+1 lookups) stays in "db".
+    metrics.phases[phase] += time.perf_counter() - start - (metrics.db_time - db_time)
+
+
+def timed(phase):
+    """Decorator: adds the function's run time to `phase` of the current request."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            metrics = _current.get()
+            started = start_phase(metrics, phase)
+            if started is None:
+                return func(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end_phase(metrics, phase, started)
+        return wrapper
+    return decorator
+
+
+class TimedSerializerMixin:
+    """Reports the time DRF serializers spend in to_representation() as "serialize"."""
+    @timed('serialize')
+    def to_representation(self, instance):
+        return super().to_representation(instance)
+
+
+# -------------------- aggregation --------------------
+class StatsCollector:
+    """Thread-safe per-endpoint totals of the sampled requests."""
+    orderings = ('db_ms', 'total_ms', 'queries', 'serialize_ms', 'render_ms', 'requests')
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, metrics, total, repeated):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = {
+                    'requests': 0, 'queries': 0, 'db_ms': 0.0, 'serialize_ms': 0.0,
+                    'render_ms': 0.0, 'total_ms': 0.0, 'max_total_ms': 0.0,
+                    'repeated_queries': 0, 'n_plus_one': Counter(),
+                }
+            stats['requests'] += 1
+            stats['queries'] += metrics.queries
+            stats['db_ms'] += metrics.db_time * 1000
+            stats['serialize_ms'] += metrics.phases['serialize'] * 1000
+            stats['render_ms'] += metrics.phases['render'] * 1000
+            stats['total_ms'] += total * 1000
+            stats['max_total_ms'] = max(stats['max_total_ms'], total * 1000)
+            stats['repeated_queries'] += sum(repeated.values())
+            signatures = stats['n_plus_one']
+            signatures.update(repeated.keys())
+            if len(signatures) > 2 * MAX_SIGNATURES:
+                stats['n_plus_one'] = Counter(dict(signatures.most_common(MAX_SIGNATURES)))
+
+    def snapshot(self, order='db_ms', limit=None):
+        """Endpoints sorted by `order` (descending), with totals and per-request averages."""
+        with self._lock:
+            endpoints = [(endpoint, dict(stats)) for endpoint, stats in self._endpoints.items()]
+        result = []
+        for endpoint, stats in sorted(endpoints, key=lambda item: item[1][order], reverse=True)[:limit]:
+            requests = stats['requests']
+            result.append({
+                'endpoint': endpoint,
+                **{key: round(value, 3) if isinstance(value, float) else value
+                   for key, value in stats.items() if key != 'n_plus_one'},
+                'avg_queries': round(stats['queries'] / requests, 2),
+                'avg_db_ms': round(stats['db_ms'] / requests, 3),
+                'avg_total_ms': round(stats['total_ms'] / requests, 3),
+                'n_plus_one': [{'sql': sql, 'requests': count}
+                               for sql, count in stats['n_plus_one'].most_common(5)],
+            })
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+stats = StatsCollector()
+
+
+# -------------------- middleware --------------------
+class InstrumentationMiddleware:
+    """
+    InstrumentationMiddleware
+    - Put it first in MIDDLEWARE so "total" covers the whole request.
+    - Works under WSGI and ASGI (sync and async views).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = self.start(request)
+        if metrics is None:
+            return self.get_response(request)
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = self.start(request)
+        if metrics is None:
+            return await self.get_response(request)
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    def process_template_response(self, request, response):
+        # DRF Responses are rendered right after the view (and after this hook) returns.
+        metrics = _current.get()
+        started = start_phase(metrics, 'render')
+        if started is not None:
+            def rendered(response):
+                end_phase(metrics, 'render', started)
+            response.add_post_render_callback(rendered)
+        return response
+
+    @staticmethod
+    def start(request):
+        sample_rate = get_setting('SAMPLE_RATE')
+        if sample_rate <= 0 or (sample_rate < 1 and random.random() >= sample_rate):
+            return None
+        return RequestMetrics()
+
+    @staticmethod
+    def get_endpoint(request):
+        match = request.resolver_match
+        return f"{request.method} /{match.route}" if match is not None else f"{request.method} <unresolved>"
+
+    def finish(self, request, response, metrics):
+        total = time.perf_counter() - metrics.started
+        repeated = metrics.repeated_queries(get_setting('N_PLUS_ONE_THRESHOLD'))
+        stats.record(self.get_endpoint(request), metrics, total, repeated)
+        if get_setting('SERVER_TIMING'):
+            response.headers['Server-Timing'] = self.server_timing(metrics, total, repeated)
+        return response
+
+    @staticmethod
+    def server_timing(metrics, total, repeated):
+        entries = [f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} queries"']
+        entries += [f'{phase};dur={metrics.phases[phase] * 1000:.2f}' for phase in PHASES]
+        if repeated:
+            entries.append(f'n-plus-one;desc="{sum(repeated.values())} repeated queries"')
+        entries.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(entries)
@@ -0,0 +1,70 @@
+"""
+Shared helpers for the benchmark_* management commands.
+
+Benchmarks run against their own SQLite file so the project database is never
+touched; the fixture is created on first use and reused by later runs.
+"""
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from django.core.management import call_command
+from django.db import connections, transaction
+
+from api.models import Author, Book
+
+DEFAULT_FIXTURE = os.path.join(tempfile.gettempdir(), 'api_benchmark.sqlite3')
+
+
+def add_fixture_argument(parser):
+    parser.add_argument('--fixture', default=DEFAULT_FIXTURE,
+                        help='SQLite file holding the generated benchmark data.')
+
+
+def use_fixture_database(path):
+    """Point the default connection at the benchmark fixture and migrate it."""
+    connection = connections['default']
+    connection.close()
+    connection.settings_dict['NAME'] = path
+    call_command('migrate', verbosity=0)
+
+
+def seed_books(rows, authors, stdout=None):
+    """Top the fixture up to `rows` books spread across `authors` authors (deterministic)."""
+    existing = Book.objects.count()
+    if existing >= rows:
+        return
+    if stdout is not None:
+        stdout.write(f"Seeding {rows - existing} books ...")
+    rng = random.Random(42)
+    with transaction.atomic():
+        missing_authors = authors - Author.objects.count()
+        if missing_authors > 0:
+            Author.objects.bulk_create(
+                [Author(name=f"Author {rng.randrange(10 * authors):06d}") for _ in range(missing_authors)],
+                batch_size=5000,
+            )
+        author_ids = list(Author.objects.values_list('id', flat=True))
+        batch = []
+        for _ in range(existing, rows):
+            batch.append(Book(
+                title=f"Title {rng.randrange(rows):07d}",
+                publication_year=rng.randint(1900, 2024),
+                author_id=rng.choice(author_ids),
+            ))
+            if len(batch) == 10_000:
+                Book.objects.bulk_create(batch)
+                batch = []
+        Book.objects.bulk_create(batch)
+
+
+def timed(func, repeat):
+    """Median wall time of `func` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from api.models import Book
+from api.views import BookListView
+
+from ._benchmark import add_fixture_argument, seed_books, timed, use_fixture_database
+
+
+class NaiveBookListView(BookListView):
+    """BookListView without the join planning, for comparison."""
+    def get_queryset(self):
+        return Book.objects.all()
+
+
+class Command(BaseCommand):
+    """
+    Query count and latency of BookListView for the author-related query shapes.
+
+        python manage.py benchmark_book_list --rows 100000 --authors 10000
+
+    Runs with a DummyCache: BookListView's response cache would otherwise answer
+    every repetition after the first, and only the cache hit would be measured.
+    """
+    help = "Benchmark BookListView queries that touch the author relation."
+
+    queries = [
+        '',
+        '?expand=author',
+        '?ordering=author__name',
+        '?ordering=-author__name&expand=author',
+        '?search=author 00',
+        '?author__name__icontains=00',
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000)
+        parser.add_argument('--authors', type=int, default=10_000)
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=5)
+        add_fixture_argument(parser)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+    def handle(self, *args, **options):
+        use_fixture_database(options['fixture'])
+        seed_books(options['rows'], options['authors'], self.stdout)
+        factory = APIRequestFactory()
+
+        self.stdout.write(f"{'query':<40} {'view':<8} {'queries':>8} {'ms':>9}")
+        for query in self.queries:
+            separator = '&' if query else '?'
+            path = f"/api/books/{query}{separator}page_size={options['page_size']}"
+            for label, view in [('naive', NaiveBookListView.as_view()), ('joined', BookListView.as_view())]:
+                request = lambda: view(factory.get(path, HTTP_HOST='localhost')).render()
+                with CaptureQueriesContext(connection) as ctx:
+                    request()
+                ms = timed(request, options['repeat'])
+                self.stdout.write(f"{query or '(none)':<40} {label:<8} {len(ctx.captured_queries):>8} {ms:>9.2f}")
@@ -0,0 +1,84 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory
+
+from api.views import BookExportView, BookListView
+
+from ._benchmark import add_fixture_argument, seed_books, use_fixture_database
+
+
+class Command(BaseCommand):
+    """
+    Throughput and peak Python memory of the streaming book export, for growing slices of
+    the catalog (filtered by publication year). Peak memory should stay flat as rows grow.
+
+        python manage.py benchmark_export --rows 5000000
+        python manage.py benchmark_export --rows 5000000 --formats csv --no-trace
+    """
+    help = "Benchmark the streaming NDJSON/CSV book export."
+
+    # Years are uniform over 1900-2024 in the fixture: ~10%, ~50% and 100% of the rows.
+    slices = [('10%', '?publication_year__lte=1912'), ('50%', '?publication_year__lte=1962'), ('100%', '')]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5_000_000)
+        parser.add_argument('--authors', type=int, default=50_000)
+        parser.add_argument('--formats', nargs='+', default=['ndjson', 'csv'])
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--no-trace', action='store_true',
+                            help='Skip tracemalloc (faster, but no memory numbers).')
+        parser.add_argument('--compare-list', type=int, default=0, metavar='ROWS',
+                            help='Also time one BookListView page of ROWS rows (the materialized alternative).')
+        add_fixture_argument(parser)
+
+    def handle(self, *args, **options):
+        use_fixture_database(options['fixture'])
+        seed_books(options['rows'], options['authors'], self.stdout)
+        factory = APIRequestFactory()
+        trace = not options['no_trace']
+
+        self.stdout.write(f"{'format':<8} {'slice':>6} {'lines':>10} {'MB out':>9} {'seconds':>9} "
+                          f"{'rows/s':>10} {'peak MB':>9}")
+        for fmt in options['formats']:
+            for label, query in self.slices:
+                separator = '&' if query else '?'
+                path = f"/api/books/export/{fmt}/{query}{separator}chunk_size={options['chunk_size']}"
+                lines, size, seconds, peak = self.measure(
+                    lambda: BookExportView.as_view()(factory.get(path, HTTP_HOST='localhost'), fmt=fmt).streaming_content,
+                    trace,
+                )
+                self.stdout.write(f"{fmt:<8} {label:>6} {lines:>10} {size / 2**20:>9.1f} {seconds:>9.2f} "
+                                  f"{lines / seconds:>10.0f} {self.format_peak(peak):>9}")
+
+        if options['compare_list']:
+            path = f"/api/books/?ordering=id&page_size={options['compare_list']}"
+
+            def render_page():
+                return [BookListView.as_view()(factory.get(path, HTTP_HOST='localhost')).render().content]
+            lines, size, seconds, peak = self.measure(render_page, trace)
+            self.stdout.write(f"{'list':<8} {options['compare_list']:>6} {'-':>10} {size / 2**20:>9.1f} "
+                              f"{seconds:>9.2f} {'-':>10} {self.format_peak(peak):>9}")
+
+    @staticmethod
+    def measure(make_blocks, trace):
+        """Consume the blocks returned by make_blocks(): (lines, bytes, seconds, peak bytes or None)."""
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        lines = size = 0
+        try:
+            for block in make_blocks():
+                lines += block.count(b'\n')
+                size += len(block)
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if trace else None
+        finally:
+            if trace:
+                tracemalloc.stop()
+        return lines, size, seconds, peak
+
+    @staticmethod
+    def format_peak(peak):
+        return '-' if peak is None else f"{peak / 2**20:.1f}"
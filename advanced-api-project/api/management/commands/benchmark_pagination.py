@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.models import Book
+from api.pagination import KeysetPagination
+
+from ._benchmark import add_fixture_argument, seed_books, timed, use_fixture_database
+
+
+class Command(BaseCommand):
+    """
+    Compare keyset pagination against OFFSET pagination at increasing page depths.
+
+        python manage.py benchmark_pagination --rows 1000000
+        python manage.py benchmark_pagination --ordering=-publication_year --depths 1,1000,10000
+    """
+    help = "Benchmark deep-page latency of KeysetPagination vs OFFSET pagination."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000)
+        parser.add_argument('--authors', type=int, default=10_000)
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--depths', default='1,100,1000,10000',
+                            help='Comma separated page numbers to measure.')
+        parser.add_argument('--ordering', default='title')
+        parser.add_argument('--repeat', type=int, default=5)
+        add_fixture_argument(parser)
+
+    def handle(self, *args, **options):
+        use_fixture_database(options['fixture'])
+        seed_books(options['rows'], options['authors'], self.stdout)
+
+        page_size = options['page_size']
+        queryset = Book.objects.order_by(*options['ordering'].split(','))
+        factory = APIRequestFactory()
+
+        self.stdout.write(f"{'page':>8} {'keyset ms':>10} {'offset ms':>10}")
+        for depth in [int(d) for d in options['depths'].split(',')]:
+            offset = (depth - 1) * page_size
+
+            # Build the cursor pointing at this depth (setup, not timed).
+            query = f'?page_size={page_size}'
+            if offset:
+                keyset = KeysetPagination()
+                keyset.ordering = keyset.get_ordering(queryset)
+                keyset.base_url = 'http://localhost/'
+                previous_row = queryset.order_by(*keyset.ordering)[offset - 1]
+                cursor_url = keyset.encode_cursor(keyset.get_position(previous_row), reverse=False)
+                query += '&cursor=' + cursor_url.split('cursor=')[1]
+
+            keyset_request = Request(factory.get('/api/books/' + query, HTTP_HOST='localhost'))
+            offset_request = Request(factory.get(f'/api/books/?limit={page_size}&offset={offset}', HTTP_HOST='localhost'))
+            keyset_ms = timed(lambda: KeysetPagination().paginate_queryset(queryset, keyset_request), options['repeat'])
+            offset_ms = timed(lambda: LimitOffsetPagination().paginate_queryset(queryset, offset_request), options['repeat'])
+            self.stdout.write(f"{depth:>8} {keyset_ms:>10.2f} {offset_ms:>10.2f}")
@@ -0,0 +1,66 @@
+import datetime
+import decimal
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.utils.translation import gettext_lazy
+from drf_orjson.renderers import ORJSONRenderer
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Book
+from api.serializers import BookExpandedValuesSerializer, BookValuesSerializer
+
+from ._benchmark import add_fixture_argument, seed_books, timed, use_fixture_database
+
+
+class Command(BaseCommand):
+    """
+    Render time and peak Python memory of DRF's JSONRenderer vs. ORJSONRenderer for a
+    list response of N books (plain, ?expand=author, and with datetime/decimal/lazy-string
+    fields that go through DRF's encoder).
+
+        python manage.py benchmark_renderers --books 10000
+    """
+    help = "Benchmark the JSON renderers on large book list payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--books', type=int, default=10_000)
+        parser.add_argument('--authors', type=int, default=1_000)
+        parser.add_argument('--repeat', type=int, default=10)
+        add_fixture_argument(parser)
+
+    def handle(self, *args, **options):
+        use_fixture_database(options['fixture'])
+        seed_books(options['books'], options['authors'], self.stdout)
+        books = Book.objects.order_by('id')[:options['books']]
+
+        plain = BookValuesSerializer()
+        expanded = BookExpandedValuesSerializer()
+        plain_rows = plain.serialize(books.values(*plain.lookups))
+        payloads = [
+            ('books', plain_rows),
+            ('books ?expand=author', expanded.serialize(books.values(*expanded.lookups))),
+            ('books + datetime/decimal', [
+                {**row,
+                 'added': datetime.datetime(2024, 1, 1, 12, 30, tzinfo=datetime.timezone.utc),
+                 'price': decimal.Decimal('12.50'),
+                 'label': gettext_lazy('Book')}
+                for row in plain_rows
+            ]),
+        ]
+
+        self.stdout.write(f"{'payload':<26} {'renderer':<10} {'KB':>8} {'ms':>8} {'peak KB':>9} {'speedup':>8}")
+        for label, rows in payloads:
+            data = {'next': 'http://localhost/api/books/?cursor=abc', 'previous': None, 'results': rows}
+            baseline = None
+            for name, renderer in [('json', JSONRenderer()), ('orjson', ORJSONRenderer())]:
+                render = lambda: renderer.render(data, 'application/json')
+                size = len(render())
+                ms = timed(render, options['repeat'])
+                tracemalloc.start()
+                render()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                baseline = baseline or ms
+                self.stdout.write(f"{label:<26} {name:<10} {size / 1024:>8.0f} {ms:>8.2f} "
+                                  f"{peak / 1024:>9.0f} {baseline / ms:>7.1f}x")
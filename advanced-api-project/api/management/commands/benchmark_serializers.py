@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
+
+from api.models import Author, Book
+from api.serializers import (
+    AuthorSerializer,
+    AuthorValuesSerializer,
+    BookExpandedSerializer,
+    BookExpandedValuesSerializer,
+    BookSerializer,
+    BookValuesSerializer,
+)
+
+from ._benchmark import add_fixture_argument, seed_books, timed, use_fixture_database
+
+
+class Command(BaseCommand):
+    """
+    Rows per second of the ModelSerializers vs. the ValuesSerializer read path, both for
+    serialization alone (data already loaded) and end to end (query + serialization).
+    AuthorValuesSerializer loads the nested books itself, so its "serialize" stage includes
+    that query while AuthorSerializer's does not.
+
+        python manage.py benchmark_serializers --rows 100000 --page 1000
+    """
+    help = "Microbenchmark the DRF serializers against the .values() fast path."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000)
+        parser.add_argument('--authors', type=int, default=10_000)
+        parser.add_argument('--page', type=int, default=1000, help='Objects serialized per run.')
+        parser.add_argument('--repeat', type=int, default=5)
+        add_fixture_argument(parser)
+
+    def handle(self, *args, **options):
+        use_fixture_database(options['fixture'])
+        seed_books(options['rows'], options['authors'], self.stdout)
+        page, repeat = options['page'], options['repeat']
+
+        books = Book.objects.order_by('id')[:page]
+        expanded = Book.objects.select_related('author').order_by('id')[:page]
+        authors = Author.objects.order_by('id')[:page]
+        nested = Prefetch('books', queryset=Book.objects.order_by('publication_year', 'id'))
+        books_context = {'books': Book.objects.order_by('publication_year', 'id')}
+
+        cases = [
+            ('book', BookSerializer, books, BookValuesSerializer, books, {}),
+            ('book ?expand=author', BookExpandedSerializer, expanded, BookExpandedValuesSerializer, books, {}),
+            ('author + books', AuthorSerializer, authors.prefetch_related(nested),
+             AuthorValuesSerializer, authors, books_context),
+        ]
+
+        self.stdout.write(f"{'serializer':<22} {'stage':<14} {'drf rows/s':>12} {'fast rows/s':>12} {'speedup':>8}")
+        for label, drf_class, drf_queryset, fast_class, fast_queryset, context in cases:
+            fast = fast_class(context=context)
+            instances = list(drf_queryset.all())
+            rows = list(fast_queryset.values(*fast.lookups))
+            stages = [
+                ('serialize', lambda: drf_class(instances, many=True).data, lambda: fast.serialize(rows)),
+                ('query+serial.', lambda: drf_class(drf_queryset.all(), many=True).data,
+                 lambda: fast.serialize(fast_queryset.values(*fast.lookups))),
+            ]
+            for stage, drf_run, fast_run in stages:
+                drf_ms = timed(drf_run, repeat)
+                fast_ms = timed(fast_run, repeat)
+                self.stdout.write(
+                    f"{label:<22} {stage:<14} {page / drf_ms * 1000:>12.0f} {page / fast_ms * 1000:>12.0f} "
+                    f"{drf_ms / fast_ms:>7.1f}x"
+                )
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.stats import check
+
+
+class Command(BaseCommand):
+    """
+    Compare the book statistics tables with a GROUP BY over the books, e.g. from cron:
+        python manage.py check_book_stats || python manage.py rebuild_book_stats
+
+    Exits with status 1 and lists the differences (up to --limit) when they disagree.
+    """
+    help = "Check the per-author and per-year book statistics against the books."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--limit', type=int, default=20, help='Differences to print.')
+
+    def handle(self, *args, **options):
+        problems = check(options['database'])
+        if not problems:
+            self.stdout.write(self.style.SUCCESS("Book stats are consistent."))
+            return
+        for problem in problems[:options['limit']]:
+            self.stderr.write(problem)
+        if len(problems) > options['limit']:
+            self.stderr.write(f"... and {len(problems) - options['limit']} more")
+        raise CommandError(f"{len(problems)} differences; run `manage.py rebuild_book_stats`.")
@@ -0,0 +1,110 @@
+import itertools
+import re
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.models import Book
+from api.pagination import KeysetPagination
+from api.views import BookListView
+
+
+class Command(BaseCommand):
+    """
+    Run EXPLAIN for every filter x ordering combination BookListView advertises and
+    report whether the planner uses an index, scans the whole table, or sorts.
+
+    The queryset is built by the view itself (filter backends + keyset ordering),
+    so the plan is exactly the one a request would get:
+        python manage.py explain_book_queries
+        python manage.py explain_book_queries --only-problems
+    """
+    help = "EXPLAIN every BookListView filter/ordering combination and report index usage."
+
+    # Sample values per filter field; real values are used when the table has rows.
+    sample_values = {
+        'title': 'Things Fall Apart',
+        'publication_year': 1958,
+        'author': 1,
+        'author__name': 'Chinua Achebe',
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only-problems', action='store_true',
+                            help='Only list combinations that scan the whole book table.')
+
+    def handle(self, *args, **options):
+        self.load_sample_values()
+        problems = 0
+        for params in self.combinations():
+            plan = self.explain(params)
+            verdict = self.classify(plan, params.get('ordering', BookListView.ordering[0]))
+            if 'full scan' in verdict:
+                problems += 1
+            elif options['only_problems']:
+                continue
+            query = '&'.join(f'{key}={value}' for key, value in params.items()) or '(no parameters)'
+            self.stdout.write(f"{verdict:<18} {query}")
+            if options['verbosity'] > 1:
+                self.stdout.write('    ' + plan.replace('\n', '\n    '))
+        self.stdout.write(f"{problems} combination(s) scan the whole book table.")
+
+    def load_sample_values(self):
+        book = Book.objects.select_related('author').first()
+        if book is not None:
+            self.sample_values = {
+                'title': book.title,
+                'publication_year': book.publication_year,
+                'author': book.author_id,
+                'author__name': book.author.name,
+            }
+
+    def combinations(self):
+        filters = [{}]
+        for field, lookups in BookListView.filterset_fields.items():
+            for lookup in lookups:
+                name = field if lookup == 'exact' else f'{field}__{lookup}'
+                value = self.sample_values[field]
+                if lookup in ('icontains', 'istartswith'):
+                    value = str(value)[:4]
+                filters.append({name: value})
+        filters.append({'search': str(self.sample_values['title'])[:4]})
+
+        orderings = [None]
+        for field in BookListView.ordering_fields:
+            orderings += [field, f'-{field}']
+
+        for filter_params, ordering in itertools.product(filters, orderings):
+            params = dict(filter_params)
+            if ordering:
+                params['ordering'] = ordering
+            yield params
+
+    def explain(self, params):
+        request = Request(APIRequestFactory().get('/api/books/', params, HTTP_HOST='localhost'))
+        view = BookListView(request=request, format_kwarg=None, kwargs={})
+        queryset = view.filter_queryset(view.get_queryset())
+        paginator = KeysetPagination()
+        queryset = queryset.order_by(*paginator.get_ordering(queryset))[:paginator.page_size + 1]
+        return queryset.explain()
+
+    @staticmethod
+    def classify(plan, ordering):
+        """
+        "index"         the planner walks an index (or the primary key) in the requested order
+        "index + sort"  an index narrows the rows, which are then sorted (fine for selective filters)
+        "full scan"     every book row is read
+        """
+        if connection.vendor == 'postgresql':
+            full_scan = 'Seq Scan on api_book' in plan
+            sort = bool(re.search(r'->\s*(Incremental )?Sort\b|^\s*(Incremental )?Sort\b', plan, re.M))
+        else:
+            # SQLite prints "SCAN api_book" both for a full scan and for walking the
+            # rowid (primary key) in order; the latter only happens when ordering by id.
+            table_scan = re.search(r'\bSCAN api_book\b(?! USING)', plan) is not None
+            sort = 'TEMP B-TREE' in plan
+            full_scan = table_scan and (sort or ordering.lstrip('-') != 'id')
+        verdict = 'full scan' if full_scan else 'index'
+        return verdict + ' + sort' if sort else verdict
@@ -0,0 +1,105 @@
+import asyncio
+import statistics
+import time
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+
+from ._benchmark import add_fixture_argument, seed_books, use_fixture_database
+
+
+class Command(BaseCommand):
+    """
+    Load-test the sync and async Book read routes through Django's ASGI handler, in process
+    (no network or server in the way): N concurrent clients send requests back to back and
+    the command reports requests/second and p50/p99 latency per route.
+
+        python manage.py loadtest_asgi --requests 2000 --concurrency 50
+        python manage.py loadtest_asgi --path "/api/books/?page_size=10" --path "/api/async/books/?page_size=10"
+
+    Sync views run in Django's single thread-sensitive executor under ASGI; the async routes
+    (api.views.AsyncBookListView / AsyncBookDetailView) run on the event loop. Response
+    caching is disabled for the sync routes during the test (a unique query parameter per
+    request), so both sides do the same database work.
+    """
+    help = "Compare sync vs async Book read routes under ASGI (req/s, p50, p99)."
+
+    default_paths = [
+        ('sync list', '/api/books/?page_size=20'),
+        ('async list', '/api/async/books/?page_size=20'),
+        ('sync detail', '/api/books/1/'),
+        ('async detail', '/api/async/books/1/'),
+        ('sync expand', '/api/books/?page_size=20&expand=author&ordering=-publication_year'),
+        ('async expand', '/api/async/books/?page_size=20&expand=author&ordering=-publication_year'),
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000)
+        parser.add_argument('--authors', type=int, default=10_000)
+        parser.add_argument('--requests', type=int, default=1000, help='Requests per route.')
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Route to test (repeatable); defaults to the sync/async pairs.')
+        add_fixture_argument(parser)
+
+    def handle(self, *args, **options):
+        use_fixture_database(options['fixture'])
+        seed_books(options['rows'], options['authors'], self.stdout)
+        paths = [(path, path) for path in options['paths']] if options['paths'] else self.default_paths
+        asyncio.run(self.run(paths, options['requests'], options['concurrency']))
+
+    async def run(self, paths, requests, concurrency):
+        app = get_asgi_application()
+        self.stdout.write(f"{'route':<16} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for label, path in paths:
+            await self.request(app, path, 0)  # warm up (imports, FTS check, connections)
+            latencies, errors, seconds = await self.load(app, path, requests, concurrency)
+            latencies.sort()
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            self.stdout.write(f"{label[:16]:<16} {requests / seconds:>9.0f} {statistics.median(latencies):>9.2f} "
+                              f"{p99:>9.2f} {errors:>7}")
+
+    async def load(self, app, path, requests, concurrency):
+        latencies = []
+        errors = 0
+        counter = iter(range(1, requests + 1))
+
+        async def client():
+            nonlocal errors
+            for number in counter:
+                start = time.perf_counter()
+                status = await self.request(app, path, number)
+                latencies.append((time.perf_counter() - start) * 1000)
+                errors += status != 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        return latencies, errors, time.perf_counter() - start
+
+    @staticmethod
+    async def request(app, path, number):
+        """Send one GET through the ASGI app and return the response status."""
+        path, _, query = path.partition('?')
+        query = f"{query}&_n={number}" if query else f"_n={number}"  # defeats the response cache
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+            'query_string': query.encode(), 'root_path': '',
+            'headers': [(b'host', b'localhost'), (b'accept', b'application/json')],
+            'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+        }
+        status = None
+        messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await asyncio.Future()  # the client never disconnects early
+
+        async def send(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+
+        await app(scope, receive, send)
+        return status
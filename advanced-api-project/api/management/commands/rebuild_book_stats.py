@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from api.cache import bump_generations
+from api.models import Author
+from api.stats import rebuild
+
+
+class Command(BaseCommand):
+    """
+    Recompute the book statistics tables (AuthorStats, YearStats) and the author
+    counters (Author.book_count, latest_publication_year) from scratch.
+
+    Needed after writes that bypass model signals and BookBulkView (queryset.update(),
+    loaddata, raw SQL); `manage.py check_book_stats` tells whether it is:
+        python manage.py rebuild_book_stats
+    """
+    help = "Rebuild the per-author and per-year book statistics tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT / authors per UPDATE.')
+
+    def handle(self, *args, **options):
+        authors, years = rebuild(options['database'], options['batch_size'])
+        author_ids = Author.objects.using(options['database']).values_list('pk', flat=True)
+        bump_generations('books', 'authors', *(f'author:{pk}' for pk in author_ids.iterator()))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats for {authors} authors and {years} years."))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from api.search import fts_available, rebuild_index
+
+
+class Command(BaseCommand):
+    """
+    Repopulate the book full-text index (api_book_fts) from scratch.
+
+    Needed after writes that bypass model signals (bulk_create, queryset.update(),
+    loaddata, raw SQL):
+        python manage.py rebuild_search_index
+    """
+    help = "Rebuild the SQLite FTS5 index used by ?search= on the book list."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        if not fts_available(options['database']):
+            self.stderr.write("Full-text index not available on this database; ?search= uses icontains.")
+            return
+        count = rebuild_index(options['database'])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} books."))
@@ -0,0 +1,108 @@
+import contextlib
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from seeding import FIRST_NAMES, LAST_NAMES, book_rows, insert_rows
+
+from api.cache import bump_generations
+from api.models import Author, AuthorStats, Book, YearStats
+from api.search import rebuild_index
+from api.stats import rebuild as rebuild_stats
+
+
+@contextlib.contextmanager
+def large_page_cache(connection, kib=256 * 1024):
+    """
+    On SQLite, let the connection cache up to `kib` KiB of pages while inserting, so index
+    updates stay in memory instead of re-reading pages from disk (the default is 2 MiB).
+    """
+    if connection.vendor != 'sqlite':
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA cache_size')
+        previous = cursor.fetchone()[0]
+        cursor.execute(f'PRAGMA cache_size = -{int(kib)}')
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA cache_size = {int(previous)}')
+
+
+class Command(BaseCommand):
+    """
+    Generate realistic, deterministic Author/Book rows for scale testing.
+
+        python manage.py seed_data                                # 10k authors, 1M books
+        python manage.py seed_data --books 5000000 --authors 50000 --clear
+        python manage.py seed_data --seed 7                       # another, equally reproducible, data set
+
+    The same --seed and sizes always produce the same rows (on an empty or --clear'ed
+    database). Book counts per author are skewed (a few prolific authors, a long tail),
+    like real catalogues.
+
+    Everything is inserted in one transaction, in batches (authors with bulk_create, books
+    with a plain executemany, see seeding.insert_rows), so no model signals are sent: instead the
+    book stats tables and the full-text index are rebuilt once at the end (skip the index
+    with --no-index) and the cached book/author responses are invalidated. About 30s for the default million books on SQLite.
+    """
+    help = "Bulk-insert deterministic synthetic authors and books."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--authors', type=int, default=10_000)
+        parser.add_argument('--books', type=int, default=1_000_000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=10_000,
+                            help='Rows built in memory and inserted at a time.')
+        parser.add_argument('--clear', action='store_true', help='Delete every author and book first.')
+        parser.add_argument('--no-index', action='store_true', help='Do not rebuild the full-text index.')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        rng = random.Random(options['seed'])
+        start = time.perf_counter()
+
+        connection = connections[using]
+        with transaction.atomic(using=using), large_page_cache(connection):
+            if options['clear']:
+                # Plain DELETEs, without collecting rows to cascade or send signals: everything
+                # goes, and the stats tables and the index are rebuilt below.
+                with connection.cursor() as cursor:
+                    for model in [AuthorStats, YearStats, Book, Author]:
+                        cursor.execute(f'DELETE FROM {connection.ops.quote_name(model._meta.db_table)}')
+
+            authors = Author.objects.using(using).bulk_create(
+                [Author(name=self.author_name(rng)) for _ in range(options['authors'])],
+                batch_size=options['batch_size'],
+            )
+            author_ids = [author.pk for author in authors]
+            if None in author_ids:  # backends that cannot return ids from bulk inserts
+                author_ids = list(Author.objects.using(using).order_by('-id').values_list('id', flat=True)
+                                  [:len(authors)])[::-1]
+            self.stdout.write(f"Created {len(author_ids)} authors.")
+
+            created = 0
+            while created < options['books']:
+                size = min(options['batch_size'], options['books'] - created)
+                insert_rows(connection, Book, ['title', 'author', 'publication_year'],
+                            book_rows(rng, size, author_ids, years=True))
+                created += size
+                if created % 100_000 < size:
+                    self.stdout.write(f"  {created} books ({time.perf_counter() - start:.1f}s)")
+
+        self.stdout.write(f"Created {created} books in {time.perf_counter() - start:.1f}s.")
+        rebuild_stats(using)
+        if not options['no_index']:
+            count = rebuild_index(using)
+            if count:
+                self.stdout.write(f"Indexed {count} books ({time.perf_counter() - start:.1f}s).")
+        bump_generations('books', 'authors')
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.perf_counter() - start:.1f}s."))
+
+    @staticmethod
+    def author_name(rng):
+        return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.cache import bump_generations
+from api.stats import verify_author_counters
+
+
+class Command(BaseCommand):
+    """
+    Check Author.book_count / latest_publication_year against the books, a batch
+    of authors at a time, and optionally correct them:
+        python manage.py verify_author_counters
+        python manage.py verify_author_counters --fix --batch-size 5000
+
+    Without --fix, exits with status 1 when a counter is wrong. The counters only
+    drift through writes that bypass the Book signals and BookBulkView
+    (queryset.update(), raw SQL).
+    """
+    help = "Verify (and with --fix, recompute) the denormalized author counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Authors per query.')
+        parser.add_argument('--fix', action='store_true', help='Recompute the wrong counters.')
+        parser.add_argument('--limit', type=int, default=20, help='Differences to print.')
+
+    def handle(self, *args, **options):
+        wrong = []
+        for author_id, problem in verify_author_counters(options['database'], options['batch_size'], options['fix']):
+            if len(wrong) < options['limit']:
+                self.stderr.write(problem)
+            wrong.append(author_id)
+        if not wrong:
+            self.stdout.write(self.style.SUCCESS("Author counters are consistent."))
+        elif options['fix']:
+            bump_generations('authors', 'books', *(f'author:{pk}' for pk in wrong))
+            self.stdout.write(self.style.SUCCESS(f"Fixed the counters of {len(wrong)} authors."))
+        else:
+            raise CommandError(f"{len(wrong)} authors have wrong counters; run with --fix.")
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:18
+
+from django.db import migrations, models
+
+# Case-insensitive prefix indexes (?title__istartswith=, ?author__name__istartswith=).
+# Each backend compiles those lookups differently, so the index has to match:
+# - SQLite:     "title" LIKE 'abc%' ESCAPE '\'  -> usable with a NOCASE index
+# - PostgreSQL: UPPER("title"::text) LIKE UPPER('abc%')  -> expression index with pattern ops
+# Other backends (MySQL's default collations are already case-insensitive) need nothing extra.
+CASE_INSENSITIVE_INDEXES = {
+    'sqlite': [
+        'CREATE INDEX IF NOT EXISTS "api_book_title_ci_idx" ON "api_book" ("title" COLLATE NOCASE)',
+        'CREATE INDEX IF NOT EXISTS "api_author_name_ci_idx" ON "api_author" ("name" COLLATE NOCASE)',
+    ],
+    'postgresql': [
+        'CREATE INDEX IF NOT EXISTS "api_book_title_ci_idx" ON "api_book" (UPPER("title"::text) text_pattern_ops)',
+        'CREATE INDEX IF NOT EXISTS "api_author_name_ci_idx" ON "api_author" (UPPER("name"::text) text_pattern_ops)',
+    ],
+}
+
+
+def create_case_insensitive_indexes(apps, schema_editor):
+    for sql in CASE_INSENSITIVE_INDEXES.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_case_insensitive_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor in CASE_INSENSITIVE_INDEXES:
+        schema_editor.execute('DROP INDEX IF EXISTS "api_book_title_ci_idx"')
+        schema_editor.execute('DROP INDEX IF EXISTS "api_author_name_ci_idx"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['name', 'id'], name='api_author_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['title', 'id'], name='api_book_title_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['publication_year', 'id'], name='api_book_year_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['author', 'publication_year'], name='api_book_author_year_idx'),
+        ),
+        migrations.RunPython(create_case_insensitive_indexes, drop_case_insensitive_indexes),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:20
+
+import api.models
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.utils import OperationalError
+
+from api.search import CONFIGURE_RANK, CREATE_FTS_TABLE, rebuild_index
+
+
+def create_fts_table(apps, schema_editor):
+    # FTS5 is SQLite only, and optional in SQLite builds: without it search
+    # falls back to icontains (see api.search.fts_available).
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(CREATE_FTS_TABLE)
+    except OperationalError:
+        return
+    schema_editor.execute(CONFIGURE_RANK)
+    rebuild_index(schema_editor.connection.alias)
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS "api_book_fts"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_book_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookSearchIndex',
+            fields=[
+                ('book', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='api.book')),
+                ('title', api.models.FullTextField()),
+                ('author_name', api.models.FullTextField()),
+                ('document', api.models.FullTextField(db_column='api_book_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'api_book_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
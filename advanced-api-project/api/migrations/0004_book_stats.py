@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Min
+
+
+def populate_stats(apps, schema_editor):
+    # Historical models: same aggregates as api.stats.rebuild().
+    using = schema_editor.connection.alias
+    Book = apps.get_model('api', 'Book')
+    AuthorStats = apps.get_model('api', 'AuthorStats')
+    YearStats = apps.get_model('api', 'YearStats')
+    books = Book.objects.using(using).order_by()
+    AuthorStats.objects.using(using).bulk_create([
+        AuthorStats(**row) for row in books.values('author_id').annotate(
+            book_count=Count('id'), earliest_year=Min('publication_year'), latest_year=Max('publication_year'))
+    ], batch_size=5000)
+    YearStats.objects.using(using).bulk_create([
+        YearStats(**row) for row in books.values('publication_year').annotate(book_count=Count('id'))
+    ], batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_book_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='YearStats',
+            fields=[
+                ('publication_year', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('book_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='api.author')),
+                ('book_count', models.IntegerField(default=0)),
+                ('earliest_year', models.PositiveIntegerField(null=True)),
+                ('latest_year', models.PositiveIntegerField(null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['book_count', 'author'], name='api_authorstats_count_idx')],
+            },
+        ),
+        migrations.RunPython(populate_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:24
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    # Historical models: same UPDATE as api.stats._update_author_counters().
+    using = schema_editor.connection.alias
+    Author = apps.get_model('api', 'Author')
+    Book = apps.get_model('api', 'Book')
+    books = Book.objects.using(using).filter(author=OuterRef('pk')).order_by()
+    Author.objects.using(using).update(
+        book_count=Coalesce(Subquery(books.values('author').annotate(count=Count('id')).values('count')), 0),
+        latest_publication_year=Coalesce(
+            Subquery(books.order_by('-publication_year').values('publication_year')[:1]), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_book_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='book_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='latest_publication_year',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['book_count', 'id'], name='api_author_count_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['latest_publication_year', 'id'], name='api_author_latest_id_idx'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
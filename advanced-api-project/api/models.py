@@ -6,10 +6,62 @@ class Author(models.Model):
     - Represents an author entity.
     - Fields:
         name: The author's display name (e.g., "Chinua Achebe").
+        book_count: Number of books (denormalized, maintained by api.stats).
+        latest_publication_year: Year of the most recent book, 0 without books
+                                 (denormalized, maintained by api.stats).
     - Relationships:
         One Author -> Many Books (see Book.author).
     """
+    # Written only with UPDATE ... SET book_count = book_count + 1 and friends (api.stats).
+    COUNTER_FIELDS = ('book_count', 'latest_publication_year')
+
     name = models.CharField(max_length=255)
+    book_count = models.PositiveIntegerField(default=0, editable=False)
+    # 0 rather than NULL: keyset pagination can order by it on every backend.
+    latest_publication_year = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # ?ordering=name (and author__name on books) + keyset tie-breaker
+            models.Index(fields=['name', 'id'], name='api_author_name_id_idx'),
+            # ?ordering=-book_count / ?ordering=-latest_publication_year
+            models.Index(fields=['book_count', 'id'], name='api_author_count_id_idx'),
+            models.Index(fields=['latest_publication_year', 'id'], name='api_author_latest_id_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_counters()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._remember_counters()
+
+    def _remember_counters(self):
+        self._saved_counters = {name: self.__dict__[name] for name in self.COUNTER_FIELDS if name in self.__dict__}
+
+    def save(self, *args, **kwargs):
+        # An instance loaded before books were added holds stale counters: saving
+        # an existing author never writes them back (unless named in update_fields).
+        # Changing them on the instance is a mistake, not something to drop silently.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            changed = [
+                name for name, value in getattr(self, '_saved_counters', {}).items()
+                if self.__dict__.get(name, value) != value
+            ]
+            if changed:
+                raise ValueError(
+                    f"Author.{', Author.'.join(changed)} cannot be saved: the counters are "
+                    f"maintained by api.stats (or pass them in update_fields explicitly)."
+                )
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+        self._remember_counters()
 
     def __str__(self):
         return self.name
@@ -33,5 +85,106 @@ class Book(models.Model):
         related_name='books'
     )
 
+    class Meta:
+        # Indexes for the BookListView filter/ordering surface. Each ordering index
+        # ends with id because KeysetPagination always orders by (<field>, id).
+        # Case-insensitive prefix indexes are backend specific and live in
+        # migration 0002_book_indexes.
+        indexes = [
+            models.Index(fields=['title', 'id'], name='api_book_title_id_idx'),
+            models.Index(fields=['publication_year', 'id'], name='api_book_year_id_idx'),
+            models.Index(fields=['author', 'publication_year'], name='api_book_author_year_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the author and year the row was loaded with, so signal receivers
+        # can tell when a save moves the book to another author (or year).
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_author_id = instance.__dict__.get('author_id')
+        instance._loaded_publication_year = instance.__dict__.get('publication_year')
+        return instance
+
     def __str__(self):
         return f"{self.title} ({self.publication_year})"
+
+
+class AuthorStats(models.Model):
+    """
+    AuthorStats
+    - Materialized per-author book statistics (one row per author that ever had a book),
+      kept up to date by api.stats on every Book save/delete.
+    - Fields:
+        book_count: number of books (0 once every book is gone).
+        earliest_year / latest_year: publication year range of the books (null without books).
+    """
+    author = models.OneToOneField(
+        Author,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='stats'
+    )
+    book_count = models.IntegerField(default=0)
+    earliest_year = models.PositiveIntegerField(null=True)
+    latest_year = models.PositiveIntegerField(null=True)
+
+    class Meta:
+        indexes = [
+            # ?ordering=-book_count (the default) + keyset tie-breaker
+            models.Index(fields=['book_count', 'author'], name='api_authorstats_count_idx'),
+        ]
+
+
+class YearStats(models.Model):
+    """
+    YearStats
+    - Materialized number of books per publication year, kept up to date by api.stats.
+    - Histograms with wider buckets (decades...) are summed from these rows.
+    """
+    publication_year = models.PositiveIntegerField(primary_key=True)
+    book_count = models.IntegerField(default=0)
+
+
+class Match(models.Lookup):
+    """`field__match=query` -> SQLite FTS5 `field MATCH query`."""
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class FullTextField(models.TextField):
+    """Text column of a full-text index; supports the `match` lookup."""
+
+
+FullTextField.register_lookup(Match)
+
+
+class BookSearchIndex(models.Model):
+    """
+    BookSearchIndex
+    - Read-only view of the SQLite FTS5 virtual table `api_book_fts` (created by migration
+      0003_book_search_index, kept in sync by api.signals / api.search).
+    - One row per Book; rowid == Book.id, so joining is a primary key lookup.
+    - Fields:
+        title, author_name: the indexed text.
+        document: FTS5's hidden column named after the table; `document__match` searches all columns.
+        rank: FTS5's hidden relevance column (bm25, lower is better), only meaningful with a MATCH.
+    """
+    book = models.OneToOneField(
+        Book,
+        primary_key=True,
+        db_column='rowid',
+        on_delete=models.DO_NOTHING,
+        related_name='search_index',
+    )
+    title = FullTextField()
+    author_name = FullTextField()
+    document = FullTextField(db_column='api_book_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'api_book_fts'
@@ -0,0 +1,203 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.encoding import force_str
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    KeysetPagination
+    - Cursor ("seek") pagination that works with any ordering applied by OrderingFilter.
+    - The cursor stores the sort key values of the last row on the page plus its id,
+      so the next page is fetched with a WHERE clause instead of an OFFSET:
+        ORDER BY title, id
+        WHERE title > 'Last title' OR (title = 'Last title' AND id > 42)
+    - Page N therefore costs the same as page 1 (given an index on the ordering columns).
+
+    Supports:
+        ?cursor=<opaque token>          (taken from "next" / "previous" links)
+        ?page_size=100                  (capped at max_page_size)
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self):
+        self.page_size = api_settings.PAGE_SIZE or 50
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.prepare_page_queryset(queryset, request)
+        return self.finish_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() for async views: the page is read with the async ORM."""
+        queryset = self.prepare_page_queryset(queryset, request)
+        return self.finish_page([item async for item in queryset])
+
+    def prepare_page_queryset(self, queryset, request):
+        """The query for the requested page (plus one extra row); runs no SQL."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        self.cursor = self.decode_cursor(request)
+        self.reverse = bool(self.cursor and self.cursor['reverse'])
+
+        # Walk backwards for "previous" pages by flipping every direction.
+        ordering = [self.flip(field) for field in self.ordering] if self.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            try:
+                queryset = queryset.filter(self.seek_filter(ordering, self.cursor['position']))
+            except (TypeError, ValueError, ValidationError):
+                # A tampered cursor whose values don't fit the ordering fields.
+                raise NotFound(self.invalid_cursor_message)
+
+        # Fetch one extra row to find out whether there is a following page.
+        return queryset[:self.page_size + 1]
+
+    def finish_page(self, results):
+        """Trim the rows fetched by prepare_page_queryset() to the page and record its links."""
+        cursor, reverse = self.cursor, self.reverse
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = cursor is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.first_position = self.get_position(results[0]) if results else None
+        self.last_position = self.get_position(results[-1]) if results else None
+        if not results and cursor is not None:
+            # Paging past the end (or before the start): keep the caller's position.
+            self.first_position = self.last_position = cursor['position']
+        return results
+
+    def get_paginated_data(self, data):
+        return OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ])
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """
+        Use the ordering already applied to the queryset (by OrderingFilter or
+        the model's Meta.ordering) and append the primary key as a tie-breaker,
+        so that the composite key is unique and pages never overlap.
+        E.g. ?ordering=-title pages on ('-title', '-id').
+        """
+        pk_name = queryset.model._meta.pk.name
+        ordering = []
+        for field in queryset.query.order_by or queryset.model._meta.ordering:
+            field = force_str(field)
+            if field.lstrip('-') == 'pk':
+                field = field.replace('pk', pk_name)
+            ordering.append(field)
+        if not any(field.lstrip('-') == pk_name for field in ordering):
+            # Follow the direction of the last column so a single index can serve both.
+            descending = bool(ordering) and ordering[-1].startswith('-')
+            ordering.append('-' + pk_name if descending else pk_name)
+        return ordering
+
+    @staticmethod
+    def flip(field):
+        return field[1:] if field.startswith('-') else '-' + field
+
+    @staticmethod
+    def seek_filter(ordering, position):
+        """
+        Build the lexicographic "row comes after position" condition:
+            (a > va) OR (a = va AND b > vb) OR (a = va AND b = vb AND id > vid)
+        """
+        condition = Q()
+        equal_so_far = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal_so_far & Q(**{f'{name}__{lookup}': value})
+            equal_so_far &= Q(**{name: value})
+        return condition
+
+    def get_position(self, item):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            if isinstance(item, dict) and name in item:
+                # QuerySet.values() rows: related lookups are flat keys ("author__name").
+                position.append(item[name])
+                continue
+            value = item
+            for part in name.split('__'):
+                value = value[part] if isinstance(value, dict) else getattr(value, part)
+            position.append(value)
+        return position
+
+    # -------------------- CURSOR ENCODING --------------------
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            position, ordering, reverse = cursor['p'], cursor['o'], bool(cursor['r'])
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        # A cursor is only meaningful for the ordering it was issued for.
+        if ordering != self.ordering or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return {'position': position, 'reverse': reverse}
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({'p': position, 'o': self.ordering, 'r': int(reverse)}, separators=(',', ':'), default=str)
+        encoded = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        return self.encode_cursor(self.last_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first_position is None:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.first_position, reverse=True)
@@ -0,0 +1,35 @@
+import codecs
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.settings import api_settings
+from rest_framework.utils import json as drf_json
+
+
+class NDJSONParser(BaseParser):
+    """
+    NDJSONParser
+    - Parses newline-delimited JSON (one JSON value per line) into a list.
+    - Reads the request body line by line, so the raw text is never held in memory as a whole.
+    - Blank lines are ignored; errors report the offending line number.
+    """
+    media_type = 'application/x-ndjson'
+    strict = api_settings.STRICT_JSON
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        parse_constant = drf_json.strict_constant if self.strict else None
+
+        items = []
+        for number, line in enumerate(codecs.getreader(encoding)(stream), start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line, parse_constant=parse_constant))
+            except ValueError as exc:
+                raise ParseError(f'NDJSON parse error on line {number} - {exc}')
+        return items
+
@@ -0,0 +1,34 @@
+"""
+Read replicas for the book endpoints (the router, stickiness and sync_replicas
+command are in the shared db_replicas package, see ../shared).
+
+ReplicaReadMixin: BookListView / BookDetailView run their queries inside
+reading_from(<a random replica>), unless a replica could miss data the client
+expects (see db_replicas.choose_replica()): the user wrote something less than
+STICKY_SECONDS ago, or the data the view depends on changed less than MAX_LAG
+seconds ago (the last generation bump, see api.cache), so a response read from
+a replica that has not caught up yet is never cached under the new generation.
+Cache hits and 304s never touch a database at all.
+"""
+from db_replicas import (  # noqa: F401 - re-exported for the views and tests
+    ReplicaRouter,
+    ReplicaStickinessMiddleware,
+    choose_replica,
+    is_sticky,
+    mark_sticky,
+    reading_from,
+    sticky_key,
+)
+
+
+class ReplicaReadMixin:
+    """
+    Run GET on a replica when it is safe (see choose_replica()). Put it after
+    CachedResponseMixin, which sets data_modified_at (the last change of the
+    view's cache dependencies) before calling get().
+    """
+    data_modified_at = None
+
+    def get(self, request, *args, **kwargs):
+        with reading_from(choose_replica(request.user, self.data_modified_at)):
+            return super().get(request, *args, **kwargs)
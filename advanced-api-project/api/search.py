@@ -0,0 +1,108 @@
+"""
+Full-text search over books (title + author name).
+
+On SQLite the rows are indexed in the FTS5 virtual table `api_book_fts`
+(see BookSearchIndex). Other backends, or SQLite builds without FTS5, fall
+back to DRF's icontains search, so callers never need to check.
+"""
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+FTS_TABLE = 'api_book_fts'
+
+CREATE_FTS_TABLE = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS "{FTS_TABLE}" '
+    "USING fts5(title, author_name, tokenize = 'unicode61 remove_diacritics 2')"
+)
+# Title matches weigh twice as much as author matches in the built-in rank column.
+CONFIGURE_RANK = f"INSERT INTO \"{FTS_TABLE}\"(\"{FTS_TABLE}\", rank) VALUES ('rank', 'bm25(2.0, 1.0)')"
+
+_SELECT_BOOKS = (
+    'SELECT "api_book"."id", "api_book"."title", "api_author"."name" '
+    'FROM "api_book" INNER JOIN "api_author" ON "api_book"."author_id" = "api_author"."id"'
+)
+
+_available = set()
+
+
+def fts_available(using='default'):
+    """True when `using` is SQLite and the FTS5 table exists."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False
+    key = (using, str(connection.settings_dict['NAME']))
+    if key not in _available and FTS_TABLE in connection.introspection.table_names():
+        _available.add(key)
+    return key in _available
+
+
+async def afts_available(using='default'):
+    """fts_available() for async code: only the first check of a database touches it (in a thread)."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or (using, str(connection.settings_dict['NAME'])) in _available:
+        return fts_available(using)
+    return await sync_to_async(fts_available)(using)
+
+
+def match_expression(terms):
+    """
+    Turn search terms into an FTS5 query: every term must match a word prefix.
+        ['things', 'fall'] -> '"things"* "fall"*'
+    Terms are quoted, so FTS5 operators typed by users are matched literally.
+    """
+    return ' '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+
+def _chunks(ids, size=500):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def index_books(book_ids, using='default'):
+    """(Re)index the given books."""
+    if not fts_available(using):
+        return
+    with connections[using].cursor() as cursor:
+        for chunk in _chunks(book_ids):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f'DELETE FROM "{FTS_TABLE}" WHERE rowid IN ({placeholders})', chunk)
+            cursor.execute(
+                f'INSERT INTO "{FTS_TABLE}"(rowid, title, author_name) '
+                f'{_SELECT_BOOKS} WHERE "api_book"."id" IN ({placeholders})',
+                chunk,
+            )
+
+
+def unindex_books(book_ids, using='default'):
+    """Remove the given books from the index."""
+    if not fts_available(using):
+        return
+    with connections[using].cursor() as cursor:
+        for chunk in _chunks(book_ids):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f'DELETE FROM "{FTS_TABLE}" WHERE rowid IN ({placeholders})', chunk)
+
+
+def index_author_books(author_id, using='default'):
+    """Reindex every book of an author (after the author was renamed)."""
+    if not fts_available(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f'UPDATE "{FTS_TABLE}" SET author_name = (SELECT name FROM "api_author" WHERE id = %s) '
+            f'WHERE rowid IN (SELECT id FROM "api_book" WHERE author_id = %s)',
+            [author_id, author_id],
+        )
+
+
+def rebuild_index(using='default'):
+    """Drop and repopulate the whole index from api_book/api_author. Returns the row count."""
+    if not fts_available(using):
+        return 0
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM "{FTS_TABLE}"')
+        cursor.execute(f'INSERT INTO "{FTS_TABLE}"(rowid, title, author_name) {_SELECT_BOOKS}')
+        cursor.execute(f"INSERT INTO \"{FTS_TABLE}\"(\"{FTS_TABLE}\") VALUES ('optimize')")
+        cursor.execute(f'SELECT count(*) FROM "{FTS_TABLE}"')
+        return cursor.fetchone()[0]
@@ -1,11 +1,43 @@
+from collections import defaultdict
+from operator import itemgetter
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from rest_framework import serializers
-from .models import Author, Book
+from .instrumentation import TimedSerializerMixin, timed
+from .models import Author, AuthorStats, Book
 import datetime
 
-class BookSerializer(serializers.ModelSerializer):
+
+def select_fields(names, fields=None, exclude=None):
+    """
+    The names of `names` kept by a sparse fieldset (?fields= / ?exclude=), in declared order.
+    Unknown names are ignored; a selection that keeps nothing keeps every field.
+    """
+    selected = [name for name in names if (not fields or name in fields) and name not in (exclude or ())]
+    return selected or list(names)
+
+
+class SparseFieldsetMixin:
+    """
+    SparseFieldsetMixin
+    - ModelSerializer mixin: keeps only the fields picked by the `fields` / `exclude` keyword
+      arguments (lists of field names, see select_fields()), e.g.
+        BookSerializer(book, fields=["id", "title"])  ->  {"id": 3, "title": "..."}
+    - Without them the serializer is unchanged (writes never pass them).
+    """
+    def __init__(self, *args, fields=None, exclude=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields or exclude:
+            selected = select_fields(list(self.fields), fields, exclude)
+            for name in [name for name in self.fields if name not in selected]:
+                self.fields.pop(name)
+
+
+class BookSerializer(SparseFieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
     BookSerializer
-    - Serializes all Book fields.
+    - Serializes all Book fields (or the sparse fieldset asked for, see SparseFieldsetMixin).
     - Custom validation: publication_year cannot be in the future.
     """
     class Meta:
@@ -19,10 +51,63 @@ class BookSerializer(serializers.ModelSerializer):
         return value
 
 
-class AuthorSerializer(serializers.ModelSerializer):
+class PrefetchedAuthorField(serializers.PrimaryKeyRelatedField):
+    """
+    Author primary key field that resolves ids from context["authors"] (an {id: Author}
+    dict loaded with one query per batch) instead of one query per item.
+    Falls back to a normal lookup when no such context is given.
+    """
+    def to_internal_value(self, data):
+        authors = self.context.get("authors")
+        if authors is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return authors[pk]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+
+
+class BookBulkSerializer(BookSerializer):
+    """
+    BookBulkSerializer
+    - BookSerializer (same fields and publication_year rule) for batches: used with many=True,
+      one child serializer validates every item, and authors come from a prefetched dict.
+    """
+    author = PrefetchedAuthorField(queryset=Author.objects.all())
+
+
+class AuthorSummarySerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    AuthorSummarySerializer
+    - Minimal author representation (id + name) used when embedding an author inside a book.
+    """
+    class Meta:
+        model = Author
+        fields = ["id", "name"]
+
+
+class BookExpandedSerializer(BookSerializer):
+    """
+    BookExpandedSerializer
+    - Same as BookSerializer, but embeds the author instead of returning its ID (?expand=author):
+      {"id": 3, "title": "...", "publication_year": 1958, "author": {"id": 1, "name": "Chinua Achebe"}}
+    - Read-only: the view loads the author with select_related, so no extra query per book.
+    """
+    author = AuthorSummarySerializer(read_only=True)
+
+
+class AuthorSerializer(SparseFieldsetMixin, TimedSerializerMixin, serializers.ModelSerializer):
     """
     AuthorSerializer
     - Includes the author's name.
+    - Includes book_count and latest_publication_year, read-only columns kept up to date
+      by api.stats (no COUNT over the author's books per request).
     - Includes a nested, read-only list of related books using BookSerializer.
       The 'books' source comes from Author.books due to related_name='books' on Book.author.
 
@@ -31,6 +116,8 @@ class AuthorSerializer(serializers.ModelSerializer):
       {
         "id": 1,
         "name": "Chinua Achebe",
+        "book_count": 5,
+        "latest_publication_year": 1987,
         "books": [
           {"id": 3, "title": "...", "publication_year": 1958, "author": 1},
           ...
@@ -38,14 +125,153 @@ class AuthorSerializer(serializers.ModelSerializer):
       }
     - Writes remain simple: create/update Author independently; create/update Book and set its author.
       (You can later implement writable nested behavior if needed.)
+    - Sparse fieldsets: `fields` / `exclude` pick the author's fields (see SparseFieldsetMixin),
+      `books_fields` the fields of the nested books.
     """
     books = BookSerializer(many=True, read_only=True)
 
     class Meta:
         model = Author
-        fields = ["id", "name", "books"]
+        fields = ["id", "name", "book_count", "latest_publication_year", "books"]
+
+    def __init__(self, *args, books_fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if books_fields and "books" in self.fields:
+            self.fields["books"] = BookSerializer(many=True, read_only=True, fields=books_fields)
+
+
+class AuthorStatsSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    AuthorStatsSerializer
+    - One author's book statistics (AuthorStats) with the author's name.
+    """
+    name = serializers.CharField(source="author.name", read_only=True)
+
+    class Meta:
+        model = AuthorStats
+        fields = ["author", "name", "book_count", "earliest_year", "latest_year"]
+
+
+# -------------------- FAST READ PATH --------------------
+class ValuesSerializer:
+    """
+    ValuesSerializer
+    - Read-only counterpart of a ModelSerializer that works on QuerySet.values() rows.
+    - `fields` maps each output key to a values() lookup, or to a nested ValuesSerializer
+      class whose lookups are read through the relation (e.g. "author" -> author__id, author__name).
+    - The lookups are compiled once into itemgetters; serializing a row is a single dict build,
+      without DRF's per-field objects, to_representation() calls or model instances.
+    - Only for fields whose database value is already the JSON value (ints, strings).
+    - `fields` / `exclude` (keyword arguments) pick a sparse fieldset like SparseFieldsetMixin
+      does; only the lookups of the selected fields are fetched. `computed_fields` are output
+      keys added by serialize() rather than read from a lookup.
+    """
+    fields = {}
+    computed_fields = []
 
+    def __init__(self, context=None, prefix="", fields=None, exclude=None):
+        self.context = context or {}
+        self.prefix = prefix
+        self.selected = select_fields([*self.fields, *self.computed_fields], fields, exclude)
+        self.lookups = []
+        getters = []
+        for key, source in self.fields.items():
+            if key not in self.selected:
+                continue
+            if isinstance(source, type) and issubclass(source, ValuesSerializer):
+                nested = source(context=self.context, prefix=f"{prefix}{key}__")
+                self.lookups.extend(nested.lookups)
+                getters.append((key, nested.to_representation))
+            else:
+                self.lookups.append(prefix + source)
+                getters.append((key, itemgetter(prefix + source)))
 
+        keys = [key for key, _ in getters]
+        if all(isinstance(getter, itemgetter) for _, getter in getters) and len(keys) > 1:
+            # Flat fields: one itemgetter fetches every value of a row at once.
+            fetch = itemgetter(*self.lookups)
+            self.to_representation = lambda row: dict(zip(keys, fetch(row)))
+        else:
+            self.to_representation = lambda row: {key: getter(row) for key, getter in getters}
+
+    @timed("serialize")
+    def serialize(self, rows):
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+
+class BookValuesSerializer(ValuesSerializer):
+    """Same output as BookSerializer."""
+    fields = {"id": "id", "title": "title", "publication_year": "publication_year", "author": "author_id"}
+
+
+class AuthorSummaryValuesSerializer(ValuesSerializer):
+    """Same output as AuthorSummarySerializer."""
+    fields = {"id": "id", "name": "name"}
+
+
+class BookExpandedValuesSerializer(ValuesSerializer):
+    """Same output as BookExpandedSerializer (?expand=author)."""
+    fields = {
+        "id": "id",
+        "title": "title",
+        "publication_year": "publication_year",
+        "author": AuthorSummaryValuesSerializer,
+    }
+
+
+class AuthorValuesSerializer(ValuesSerializer):
+    """
+    Same output as AuthorSerializer. The nested books come from context["books"] (a Book
+    queryset, already filtered and ordered) with one query for the whole page of authors,
+    or none when "books" is not selected.
+
+    - context["books_fields"]: sparse fieldset of the nested books.
+    - context["books_limit"]: at most that many books per author (first ones in the books
+      ordering), cut by a ROW_NUMBER() window in the same query.
+    - The rows must include "id" (FastReadMixin always fetches the primary key).
+    """
+    fields = {
+        "id": "id",
+        "name": "name",
+        "book_count": "book_count",
+        "latest_publication_year": "latest_publication_year",
+    }
+    computed_fields = ["books"]
 
+    @timed("serialize")
+    def serialize(self, rows):
+        rows = list(rows)
+        data = super().serialize(rows)
+        if "books" not in self.selected:
+            return data
+        books_by_author = defaultdict(list)
+        if data:
+            book_serializer = BookValuesSerializer(fields=self.context.get("books_fields"))
+            books = self.context["books"].filter(author_id__in=[row["id"] for row in rows])
+            limit = self.context.get("books_limit")
+            if limit is not None:
+                ordering = [
+                    F(field.lstrip("-")).desc() if field.startswith("-") else F(field).asc()
+                    for field in books.query.order_by
+                ]
+                books = books.annotate(
+                    position=Window(RowNumber(), partition_by=F("author_id"), order_by=ordering),
+                ).filter(position__lte=limit)
+            book_rows = list(books.values(*book_serializer.lookups, "author_id"))
+            for row, book in zip(book_rows, book_serializer.serialize(book_rows)):
+                books_by_author[row["author_id"]].append(book)
+        for row, author in zip(rows, data):
+            author["books"] = books_by_author[row["id"]]
+        return data
 
 
+class AuthorStatsValuesSerializer(ValuesSerializer):
+    """Same output as AuthorStatsSerializer."""
+    fields = {
+        "author": "author",
+        "name": "author__name",
+        "book_count": "book_count",
+        "earliest_year": "earliest_year",
+        "latest_year": "latest_year",
+    }
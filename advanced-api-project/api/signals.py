@@ -0,0 +1,100 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Author, Book
+from . import search, stats
+from .cache import bump_generations
+
+
+# -------------------- FULL-TEXT INDEX --------------------
+@receiver(post_save, sender=Book)
+def index_book(sender, instance, raw=False, using='default', **kwargs):
+    if not raw:
+        search.index_books([instance.pk], using=using)
+
+
+@receiver(post_delete, sender=Book)
+def unindex_book(sender, instance, using='default', **kwargs):
+    search.unindex_books([instance.pk], using=using)
+
+
+@receiver(post_save, sender=Author)
+def reindex_author_books(sender, instance, created, raw=False, using='default', **kwargs):
+    # A new author has no books yet; a renamed one changes every book's author_name.
+    if not created and not raw:
+        search.index_author_books(instance.pk, using=using)
+
+
+# -------------------- RESPONSE CACHE --------------------
+# Generation names used by the views' cache_dependencies:
+#   "books" / "authors"         list endpoints (author lists nest books)
+#   "book:<id>" / "author:<id>" detail endpoints
+#   "author-names"              anything embedding an author's name (?expand=author)
+# The receivers bump on commit: bumping earlier lets a concurrent request cache the
+# old rows under the new generation until the next write.
+def invalidate_book_responses(book_ids, author_ids):
+    """Bump the generations of the given books and authors (also used by bulk writes)."""
+    bump_generations(
+        'books', 'authors',
+        *(f'book:{pk}' for pk in book_ids),
+        *(f'author:{pk}' for pk in set(author_ids) - {None}),
+    )
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_book(sender, instance, using='default', **kwargs):
+    # Read the ids now: delete() clears the pk and update_book_stats() moves _loaded_author_id.
+    book_ids, author_ids = [instance.pk], [instance.author_id, getattr(instance, '_loaded_author_id', None)]
+    transaction.on_commit(lambda: invalidate_book_responses(book_ids, author_ids), using=using)
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def invalidate_author_responses(sender, instance, created=False, using='default', **kwargs):
+    if created:
+        names = ['authors']
+    else:
+        # Book lists embed, search and order by author names.
+        names = ['authors', 'books', 'author-names', f'author:{instance.pk}']
+    transaction.on_commit(lambda: bump_generations(*names), using=using)
+
+
+# -------------------- BOOK STATS --------------------
+# Defined last: update_book_stats() moves Book._loaded_* forward, after the
+# receivers above have read them.
+@receiver(pre_save, sender=Book)
+def load_previous_book_values(sender, instance, raw=False, using='default', **kwargs):
+    # Books built by hand with the pk of an existing row (Book(pk=3, ...).save()) replace
+    # it, and deferred loads (.only()) do not know the stored values: look them up.
+    previous = (getattr(instance, '_loaded_author_id', None), getattr(instance, '_loaded_publication_year', None))
+    if not raw and instance.pk is not None and None in previous:
+        previous = (Book.objects.using(using).filter(pk=instance.pk)
+                    .values_list('author_id', 'publication_year').first())
+        instance._loaded_author_id, instance._loaded_publication_year = previous or (None, None)
+
+
+@receiver(post_save, sender=Book)
+def update_book_stats(sender, instance, created, raw=False, using='default', **kwargs):
+    if raw:
+        return  # fixtures: run `manage.py rebuild_book_stats` afterwards
+    previous = (getattr(instance, '_loaded_author_id', None), getattr(instance, '_loaded_publication_year', None))
+    current = (instance.author_id, instance.publication_year)
+    if created:
+        stats.book_added(*current, using=using)
+    elif previous != current:
+        if None not in previous:
+            stats.book_removed(*previous, using=using)
+        stats.book_added(*current, using=using)
+    # The row now holds these values; a later save of the same instance starts from them.
+    instance._loaded_author_id, instance._loaded_publication_year = current
+
+
+@receiver(post_delete, sender=Book)
+def remove_book_stats(sender, instance, using='default', **kwargs):
+    stats.book_removed(
+        getattr(instance, '_loaded_author_id', None) or instance.author_id,
+        getattr(instance, '_loaded_publication_year', None) or instance.publication_year,
+        using=using,
+    )
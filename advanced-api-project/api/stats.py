@@ -0,0 +1,198 @@
+"""
+Materialized book statistics: AuthorStats (books, earliest and latest year per
+author), YearStats (books per publication year) and the counter columns of
+Author itself (book_count, latest_publication_year).
+
+The stats endpoints read these small tables, and the author endpoints filter and
+order by the counters, instead of running a GROUP BY over every book. They are
+maintained incrementally:
+
+- book_added() / book_removed(): one Book saved or deleted (see api.signals).
+  Adding is a couple of single-row UPDATEs; removing the earliest or latest
+  book of an author also looks up the new bound through the (author,
+  publication_year) index.
+- refresh(): recompute the rows of some authors and years with one grouped
+  query each, for bulk writes that send no signals (BookBulkView).
+- rebuild() / check() / verify_author_counters(): recompute everything, or
+  report where the tables (or the counters) and the books disagree (writes that
+  bypass both, such as queryset.update() or raw SQL). See
+  `manage.py rebuild_book_stats`, `manage.py check_book_stats` and
+  `manage.py verify_author_counters`.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from .models import Author, AuthorStats, Book, YearStats
+
+
+# -------------------- incremental --------------------
+def book_added(author_id, year, using='default'):
+    with transaction.atomic(using=using):
+        _increment(
+            AuthorStats, {'author_id': author_id}, using,
+            earliest_year=Least(Coalesce('earliest_year', Value(year)), Value(year)),
+            latest_year=Greatest(Coalesce('latest_year', Value(year)), Value(year)),
+            defaults={'earliest_year': year, 'latest_year': year},
+        )
+        _increment(YearStats, {'publication_year': year}, using)
+        Author.objects.using(using).filter(pk=author_id).update(
+            book_count=F('book_count') + 1,
+            latest_publication_year=Greatest('latest_publication_year', Value(year)),
+        )
+
+
+def _increment(model, key, using, defaults=None, **updates):
+    manager = model.objects.using(using)
+    if manager.filter(**key).update(book_count=F('book_count') + 1, **updates):
+        return
+    try:
+        with transaction.atomic(using=using):
+            manager.create(**key, book_count=1, **(defaults or {}))
+    except IntegrityError:  # created concurrently
+        manager.filter(**key).update(book_count=F('book_count') + 1, **updates)
+
+
+def book_removed(author_id, year, using='default'):
+    """Call once the book no longer has (author_id, year) in the database."""
+    with transaction.atomic(using=using):
+        bounds = (Author.objects.using(using).filter(pk=author_id)
+                  .values_list('stats__earliest_year', 'stats__latest_year', 'latest_publication_year').first())
+        updates, author_updates = {}, {}
+        if bounds is not None and year in bounds:
+            years = Book.objects.using(using).filter(author_id=author_id).values_list('publication_year', flat=True)
+            updates = {
+                'earliest_year': years.order_by('publication_year').first(),
+                'latest_year': years.order_by('-publication_year').first(),
+            }
+            author_updates = {'latest_publication_year': updates['latest_year'] or 0}
+        AuthorStats.objects.using(using).filter(author_id=author_id).update(
+            book_count=F('book_count') - 1, **updates)
+        YearStats.objects.using(using).filter(publication_year=year).update(book_count=F('book_count') - 1)
+        Author.objects.using(using).filter(pk=author_id).update(book_count=F('book_count') - 1, **author_updates)
+
+
+# -------------------- set-based --------------------
+def _author_rows(books):
+    return (books.order_by().values('author_id')
+            .annotate(book_count=Count('id'), earliest_year=Min('publication_year'), latest_year=Max('publication_year')))
+
+
+def _year_rows(books):
+    return books.order_by().values('publication_year').annotate(book_count=Count('id'))
+
+
+def refresh(author_ids=(), years=(), using='default'):
+    """Recompute the stats rows of `author_ids` and `years` from the books."""
+    author_ids, years = set(author_ids) - {None}, set(years) - {None}
+    books = Book.objects.using(using)
+    with transaction.atomic(using=using):
+        if author_ids:
+            rows = list(_author_rows(books.filter(author_id__in=author_ids)))
+            AuthorStats.objects.using(using).bulk_create(
+                [AuthorStats(**row) for row in rows],
+                update_conflicts=True, unique_fields=['author'],
+                update_fields=['book_count', 'earliest_year', 'latest_year'],
+            )
+            emptied = author_ids - {row['author_id'] for row in rows}
+            AuthorStats.objects.using(using).filter(author_id__in=emptied).update(
+                book_count=0, earliest_year=None, latest_year=None)
+            _update_author_counters(Author.objects.using(using).filter(pk__in=author_ids), using)
+        if years:
+            rows = list(_year_rows(books.filter(publication_year__in=years)))
+            YearStats.objects.using(using).bulk_create(
+                [YearStats(**row) for row in rows],
+                update_conflicts=True, unique_fields=['publication_year'], update_fields=['book_count'],
+            )
+            emptied = years - {row['publication_year'] for row in rows}
+            YearStats.objects.using(using).filter(publication_year__in=emptied).update(book_count=0)
+
+
+def rebuild(using='default', batch_size=5000):
+    """
+    Replace both tables with fresh aggregates of every book, then recompute the
+    author counters batch_size authors at a time. Returns (authors, years).
+    """
+    books = Book.objects.using(using)
+    with transaction.atomic(using=using):
+        AuthorStats.objects.using(using).all().delete()
+        YearStats.objects.using(using).all().delete()
+        authors = AuthorStats.objects.using(using).bulk_create(
+            [AuthorStats(**row) for row in _author_rows(books)], batch_size=batch_size)
+        years = YearStats.objects.using(using).bulk_create(
+            [YearStats(**row) for row in _year_rows(books)], batch_size=batch_size)
+    # One short UPDATE per batch instead of a single statement locking every author.
+    for first, last in _author_windows(using, batch_size):
+        _update_author_counters(Author.objects.using(using).filter(pk__gte=first, pk__lte=last), using)
+    return len(authors), len(years)
+
+
+def check(using='default'):
+    """
+    Differences between the stats tables and the books, as readable strings
+    (empty when they agree). Rows with a zero count are the same as no row.
+    """
+    books = Book.objects.using(using)
+    problems = []
+
+    expected = {row.pop('author_id'): row for row in _author_rows(books)}
+    stored = {
+        row.pop('author_id'): row
+        for row in AuthorStats.objects.using(using).exclude(book_count=0, earliest_year=None, latest_year=None)
+        .values('author_id', 'book_count', 'earliest_year', 'latest_year')
+    }
+    for author_id in sorted(expected.keys() | stored.keys()):
+        if expected.get(author_id) != stored.get(author_id):
+            problems.append(f"author {author_id}: expected {expected.get(author_id)}, stored {stored.get(author_id)}")
+
+    expected = {row['publication_year']: row['book_count'] for row in _year_rows(books)}
+    stored = dict(YearStats.objects.using(using).exclude(book_count=0).values_list('publication_year', 'book_count'))
+    for year in sorted(expected.keys() | stored.keys()):
+        if expected.get(year) != stored.get(year):
+            problems.append(f"year {year}: expected {expected.get(year, 0)} books, stored {stored.get(year, 0)}")
+    return problems
+
+
+# -------------------- author counters --------------------
+def _update_author_counters(authors, using):
+    """Recompute the counter columns of the `authors` queryset with one UPDATE."""
+    books = Book.objects.using(using).filter(author=OuterRef('pk')).order_by()
+    return authors.update(
+        book_count=Coalesce(Subquery(books.values('author').annotate(count=Count('id')).values('count')), 0),
+        latest_publication_year=Coalesce(
+            Subquery(books.order_by('-publication_year').values('publication_year')[:1]), 0),
+    )
+
+
+def _author_windows(using, batch_size):
+    """(first pk, last pk) of consecutive runs of batch_size authors, in pk order."""
+    last = 0
+    while True:
+        ids = list(Author.objects.using(using).filter(pk__gt=last).order_by('pk')
+                   .values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return
+        yield ids[0], ids[-1]
+        last = ids[-1]
+
+
+def verify_author_counters(using='default', batch_size=1000, fix=False):
+    """
+    Compare Author.book_count / latest_publication_year with the books,
+    batch_size authors at a time (one grouped query each). Yields (author id,
+    readable description) per wrong author; with fix=True the wrong rows of each batch are
+    recomputed before moving on to the next batch.
+    """
+    for first, last in _author_windows(using, batch_size):
+        window = Author.objects.using(using).filter(pk__gte=first, pk__lte=last)
+        rows = (window.order_by()
+                .annotate(actual_count=Count('books'), actual_latest=Coalesce(Max('books__publication_year'), 0))
+                .values_list('pk', 'book_count', 'latest_publication_year', 'actual_count', 'actual_latest'))
+        wrong = []
+        for pk, book_count, latest, actual_count, actual_latest in rows:
+            if (book_count, latest) != (actual_count, actual_latest):
+                wrong.append(pk)
+                yield pk, (f"author {pk}: stored book_count={book_count} latest_publication_year={latest}, "
+                       f"expected book_count={actual_count} latest_publication_year={actual_latest}")
+        if fix and wrong:
+            _update_author_counters(window.filter(pk__in=wrong), using)
@@ -1,11 +1,78 @@
+import base64
+import csv
+import datetime
+import decimal
+import io
+import json
+import os
+import tempfile
+import time
+import uuid
+from unittest import mock
+
 from django.urls import reverse
-from rest_framework import status
+from rest_framework import generics, status
 from rest_framework.test import APITestCase, APIClient
 from django.contrib.auth.models import User
-from api.models import Book, Author
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, connections, models
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.translation import gettext_lazy
+from drf_orjson.parsers import ORJSONParser
+from drf_orjson.renderers import ORJSONRenderer
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from sqlite_options import enable_wal
+from api import instrumentation, replicas, stats
+from api.models import AuthorStats, Book, Author, YearStats
+from api.serializers import (
+    AuthorSerializer,
+    BookExpandedSerializer,
+    BookExpandedValuesSerializer,
+    BookSerializer,
+    BookValuesSerializer,
+)
+from api.cache import CachedResponseMixin
+from api.views import AsyncBookReadView, AuthorListView, BookDetailView, BookListView
+
+
+class FreshCacheAPITestCase(APITestCase):
+    """
+    APITestCase that leaves an empty cache behind. The signal receivers bump cache
+    generations on commit, which never comes inside a TestCase (wrap writes in
+    captureOnCommitCallbacks(execute=True) to run them), so responses cached by one
+    test would otherwise be served to the next.
+    """
+    def tearDown(self):
+        caches["default"].clear()
+        super().tearDown()
+
+
+class QueryCountMixin:
+    """
+    Helpers that fail when the number of SQL queries grows with the data size (N+1).
+    """
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries)
 
+    def assertConstantQueries(self, url, grow, times=2):
+        """Request `url`, call `grow()` to add more rows, and require the same query count."""
+        baseline = self.count_queries(url)
+        for _ in range(times):
+            with self.captureOnCommitCallbacks(execute=True):
+                grow()
+            self.assertEqual(self.count_queries(url), baseline, f"query count grew for {url}")
 
-class BookAPITests(APITestCase):
+
+class BookAPITests(FreshCacheAPITestCase):
     def setUp(self):
         # Create test users
         self.user = User.objects.create_user(username="testuser", password="password123")
@@ -81,29 +148,948 @@ class BookAPITests(APITestCase):
     def test_filter_books_by_title(self):
         response = self.client.get(self.list_url + "?title=Test Book")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_filter_books_by_publication_year(self):
         response = self.client.get(self.list_url + "?publication_year=2022")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_filter_books_by_author_name(self):
         response = self.client.get(self.list_url + "?author__name=Author One")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     # -------------------- SEARCH --------------------
     def test_search_books(self):
         response = self.client.get(self.list_url + "?search=Test")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     # -------------------- ORDERING --------------------
     def test_order_books_by_title(self):
         Book.objects.create(title="Another Book", author=self.author, publication_year=2020)
         response = self.client.get(self.list_url + "?ordering=title")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        titles = [book["title"] for book in response.data]
+        titles = [book["title"] for book in response.data["results"]]
         self.assertEqual(titles, sorted(titles))
 
+
+    # -------------------- PAGINATION --------------------
+    def test_cursor_pagination_walks_every_ordering(self):
+        other = Author.objects.create(name="Another Author")
+        for i in range(7):
+            Book.objects.create(title=f"Book {i % 3}", author=other if i % 2 else self.author, publication_year=2000 + i % 2)
+        expected = set(Book.objects.values_list("id", flat=True))
+
+        for ordering in ["id", "title", "-publication_year", "author__name", "-author__name,title"]:
+            seen = []
+            url = self.list_url + f"?ordering={ordering}&page_size=3"
+            while url:
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                seen += [book["id"] for book in response.data["results"]]
+                url = response.data["next"]
+            self.assertEqual(len(seen), len(expected), ordering)
+            self.assertEqual(set(seen), expected, ordering)
+
+    def test_cursor_pagination_previous_link(self):
+        for i in range(4):
+            Book.objects.create(title=f"Book {i}", author=self.author, publication_year=2000)
+        first = self.client.get(self.list_url + "?page_size=2")
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.list_url + "?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tampered_cursor(self):
+        for position in (["x", "y"], [[1], {}], [None, 1]):
+            payload = json.dumps({"p": position, "o": ["title", "id"], "r": 0}).encode()
+            cursor = base64.urlsafe_b64encode(payload).decode()
+            response = self.client.get(self.list_url + f"?ordering=title&cursor={cursor}")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, position)
+            self.assertEqual(response.json(), {"detail": "Invalid cursor"})
+
+
+class AuthorAPITests(QueryCountMixin, FreshCacheAPITestCase):
+    def setUp(self):
+        self.author = Author.objects.create(name="Author One")
+        Book.objects.create(title="Newer", author=self.author, publication_year=2010)
+        Book.objects.create(title="Older", author=self.author, publication_year=1990)
+        self.list_url = reverse("author-list")
+        self.detail_url = reverse("author-detail", args=[self.author.id])
+
+    def add_authors(self, count=10, books=3):
+        for i in range(count):
+            author = Author.objects.create(name=f"Extra {Author.objects.count()}")
+            for j in range(books):
+                Book.objects.create(title=f"Book {j}", author=author, publication_year=2000 + j)
+
+    def test_list_authors_with_nested_books(self):
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        author = response.data["results"][0]
+        self.assertEqual(author["name"], "Author One")
+        self.assertEqual([book["title"] for book in author["books"]], ["Older", "Newer"])
+
+    def test_list_query_count_is_constant(self):
+        self.assertConstantQueries(self.list_url + "?page_size=1000", self.add_authors)
+
+    def test_detail_query_count_is_constant(self):
+        grow = lambda: Book.objects.create(title="More", author=self.author, publication_year=2000)
+        self.assertConstantQueries(self.detail_url, grow)
+
+    def test_nested_books_ordering_and_filtering(self):
+        response = self.client.get(self.detail_url + "?books_ordering=-publication_year")
+        self.assertEqual([book["title"] for book in response.data["books"]], ["Newer", "Older"])
+        response = self.client.get(self.detail_url + "?books_publication_year__gte=2000")
+        self.assertEqual([book["title"] for book in response.data["books"]], ["Newer"])
+
+
+class BookQueryTests(QueryCountMixin, FreshCacheAPITestCase):
+    def setUp(self):
+        self.author = Author.objects.create(name="Author One")
+        self.book = Book.objects.create(title="Test Book", author=self.author, publication_year=2022)
+        self.list_url = reverse("book-list")
+
+    def add_books(self):
+        for i in range(5):
+            author = Author.objects.create(name=f"Author {i}")
+            Book.objects.create(title=f"Book {i}", author=author, publication_year=2000)
+
+    def test_expand_author(self):
+        response = self.client.get(self.list_url + "?expand=author")
+        self.assertEqual(response.data["results"][0]["author"], {"id": self.author.id, "name": "Author One"})
+        response = self.client.get(reverse("book-detail", args=[self.book.id]) + "?expand=author")
+        self.assertEqual(response.data["author"]["name"], "Author One")
+
+    def test_list_query_count_is_constant(self):
+        for query in ["", "?expand=author", "?ordering=author__name", "?search=book", "?author__name__icontains=author"]:
+            with self.subTest(query=query):
+                self.assertConstantQueries(self.list_url + query, self.add_books, times=1)
+
+
+class BookSearchTests(FreshCacheAPITestCase):
+    def setUp(self):
+        self.achebe = Author.objects.create(name="Chinua Achebe")
+        self.adichie = Author.objects.create(name="Chimamanda Adichie")
+        self.things = Book.objects.create(title="Things Fall Apart", author=self.achebe, publication_year=1958)
+        self.arrow = Book.objects.create(title="Arrow of God", author=self.achebe, publication_year=1964)
+        self.half = Book.objects.create(title="Half of a Yellow Sun", author=self.adichie, publication_year=2006)
+        self.list_url = reverse("book-list")
+
+    def search(self, query, extra=""):
+        response = self.client.get(self.list_url + f"?search={query}{extra}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [book["id"] for book in response.json()["results"]]
+
+    def test_search_matches_title_and_author_prefixes(self):
+        self.assertEqual(self.search("fall"), [self.things.id])
+        self.assertEqual(sorted(self.search("achebe")), sorted([self.things.id, self.arrow.id]))
+        self.assertEqual(self.search("chi yell"), [self.half.id])
+
+    def test_search_ranks_title_matches_first(self):
+        Book.objects.create(title="Sunset", author=Author.objects.create(name="Other"), publication_year=2000)
+        Book.objects.create(title="A Book", author=Author.objects.create(name="Sun Writer"), publication_year=2000)
+        ids = self.search("sun")
+        self.assertEqual(len(ids), 3)
+        self.assertNotEqual(ids[-1], self.half.id)
+
+    def test_search_respects_explicit_ordering(self):
+        ids = self.search("achebe", "&ordering=-publication_year")
+        self.assertEqual(ids, [self.arrow.id, self.things.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.things.title = "No Longer at Ease"
+        self.things.save()
+        self.assertEqual(self.search("fall"), [])
+        self.assertEqual(self.search("ease"), [self.things.id])
+
+        self.adichie.name = "C. N. Adichie"
+        self.adichie.save()
+        self.assertEqual(self.search("chimamanda"), [])
+
+        self.arrow.delete()
+        self.assertEqual(self.search("arrow"), [])
+
+    def test_search_terms_are_not_fts_syntax(self):
+        # FTS5 operators and stray quotes are matched as plain words, never a syntax error.
+        for query in ['"things', "OR", "NEAR(things", "things AND", "-fall", "title:fall"]:
+            self.search(query)
+        self.assertEqual(self.search("things AND"), [])
+
+
+class ResponseCacheTests(FreshCacheAPITestCase):
+    def setUp(self):
+        self.author = Author.objects.create(name="Author One")
+        self.book = Book.objects.create(title="Test Book", author=self.author, publication_year=2022)
+        self.list_url = reverse("book-list")
+        self.detail_url = reverse("book-detail", args=[self.book.id])
+        self.author_url = reverse("author-detail", args=[self.author.id])
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_second_request_is_a_hit(self):
+        self.assertEqual(self.get(self.list_url)["X-Cache"], "MISS")
+        hit = self.get(self.list_url)
+        self.assertEqual(hit["X-Cache"], "HIT")
+        self.assertEqual(hit.json()["results"][0]["title"], "Test Book")
+
+    def test_views_must_declare_dependencies(self):
+        with self.assertRaises(ImproperlyConfigured):
+            type("UndeclaredView", (CachedResponseMixin, generics.ListAPIView), {})
+        view = BookDetailView(kwargs={"pk": 7})
+        self.assertEqual(view.get_cache_dependencies(), ["book:7", "author-names"])
+
+    def test_query_string_is_normalized(self):
+        self.get(self.list_url + "?ordering=title&page_size=5")
+        self.assertEqual(self.get(self.list_url + "?page_size=5&ordering=title")["X-Cache"], "HIT")
+        self.assertEqual(self.get(self.list_url + "?page_size=6&ordering=title")["X-Cache"], "MISS")
+
+    def test_user_class_is_part_of_the_key(self):
+        self.get(self.list_url)
+        User.objects.create_user(username="reader", password="password123")
+        self.client.login(username="reader", password="password123")
+        self.assertEqual(self.get(self.list_url)["X-Cache"], "MISS")
+
+    def test_book_write_invalidates_dependent_responses(self):
+        other = Book.objects.create(title="Other", author=Author.objects.create(name="B"), publication_year=2000)
+        other_url = reverse("book-detail", args=[other.id])
+        for url in [self.list_url, self.detail_url, self.author_url, other_url]:
+            self.get(url)
+
+        self.book.title = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book.save()
+        self.assertEqual(self.get(self.list_url)["X-Cache"], "MISS")
+        self.assertEqual(self.get(self.detail_url).json()["title"], "Renamed")
+        self.assertEqual(self.get(self.author_url).json()["books"][0]["title"], "Renamed")
+        # Unrelated detail responses stay cached.
+        self.assertEqual(self.get(other_url)["X-Cache"], "HIT")
+
+    def test_author_rename_invalidates_book_lists(self):
+        self.get(self.list_url + "?expand=author")
+        self.author.name = "Renamed Author"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.save()
+        response = self.get(self.list_url + "?expand=author")
+        self.assertEqual(response.json()["results"][0]["author"]["name"], "Renamed Author")
+
+    def test_moving_a_book_invalidates_both_authors(self):
+        other = Author.objects.create(name="Other")
+        other_url = reverse("author-detail", args=[other.id])
+        self.get(self.author_url)
+        self.get(other_url)
+        book = Book.objects.get(pk=self.book.pk)
+        book.author = other
+        with self.captureOnCommitCallbacks(execute=True):
+            book.save()
+        self.assertEqual(self.get(self.author_url).json()["books"], [])
+        self.assertEqual(len(self.get(other_url).json()["books"]), 1)
+
+    def test_generations_are_bumped_on_commit(self):
+        self.get(self.detail_url)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.book.title = "Renamed"
+            self.book.save()
+            # Until the write commits, other requests cannot see it: nothing is bumped yet.
+            self.assertEqual(self.get(self.detail_url)["X-Cache"], "HIT")
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.get(self.detail_url).json()["title"], "Renamed")
+
+    # -------------------- CONDITIONAL GET --------------------
+    def test_if_none_match_returns_304_without_queries(self):
+        response = self.get(self.list_url)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('"'))
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_etag_changes_after_write(self):
+        etag = self.get(self.detail_url)["ETag"]
+        self.book.title = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book.save()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_if_modified_since(self):
+        last_modified = self.get(self.detail_url)["Last-Modified"]
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class BookBulkTests(FreshCacheAPITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="importer", password="password123")
+        self.client.login(username="importer", password="password123")
+        self.author = Author.objects.create(name="Author One")
+        self.other = Author.objects.create(name="Author Two")
+        self.url = reverse("book-bulk")
+
+    def items(self, count, author=None):
+        author = author or self.author
+        return [{"title": f"Book {i}", "publication_year": 1900 + i % 100, "author": author.id} for i in range(count)]
+
+    # -------------------- CREATE --------------------
+    def test_bulk_create_json(self):
+        response = self.client.post(self.url, self.items(5), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 5)
+        self.assertEqual(Book.objects.filter(pk__in=response.data["ids"]).count(), 5)
+
+    def test_bulk_create_ndjson(self):
+        body = "\n".join(json.dumps(item) for item in self.items(3)) + "\n\n"
+        response = self.client.post(self.url, body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Book.objects.count(), 3)
+
+    def test_bulk_create_ndjson_syntax_error(self):
+        response = self.client.post(self.url, '{"title": "ok"}\n{oops}\n', content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("line 2", str(response.data))
+
+    def test_bulk_create_reports_per_item_errors_and_writes_nothing(self):
+        items = self.items(4)
+        items[1]["publication_year"] = datetime.date.today().year + 1
+        items[3]["author"] = 999999
+        response = self.client.post(self.url, items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = {error["index"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(sorted(errors), [1, 3])
+        self.assertIn("publication_year", errors[1])
+        self.assertIn("author", errors[3])
+        self.assertEqual(Book.objects.count(), 0)
+
+    def test_bulk_create_query_count_is_constant(self):
+        def post(count):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(self.url + "?batch_size=1000", self.items(count), format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            return len(ctx.captured_queries)
+        self.assertEqual(post(5), post(200))
+
+    def test_bulk_create_requires_authentication(self):
+        self.client.logout()
+        response = self.client.post(self.url, self.items(1), format="json")
+        self.assertIn(response.status_code, [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN])
+
+    # -------------------- UPDATE --------------------
+    def test_bulk_partial_update(self):
+        ids = self.client.post(self.url, self.items(3), format="json").data["ids"]
+        response = self.client.patch(self.url, [
+            {"id": ids[0], "title": "Renamed"},
+            {"id": ids[1], "author": self.other.id},
+        ], format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(Book.objects.get(pk=ids[0]).title, "Renamed")
+        self.assertEqual(Book.objects.get(pk=ids[1]).author, self.other)
+        self.assertEqual(Book.objects.get(pk=ids[2]).title, "Book 2")
+
+    def test_bulk_update_errors(self):
+        ids = self.client.post(self.url, self.items(2), format="json").data["ids"]
+        response = self.client.patch(self.url, [
+            {"id": ids[0], "publication_year": datetime.date.today().year + 1},
+            {"id": 999999, "title": "Missing"},
+        ], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        # PUT needs every field.
+        response = self.client.put(self.url, [{"id": ids[0], "title": "Only title"}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Book.objects.get(pk=ids[0]).title, "Book 0")
+
+    # -------------------- DELETE --------------------
+    def test_bulk_delete(self):
+        ids = self.client.post(self.url, self.items(3), format="json").data["ids"]
+        detail_url = reverse("book-detail", args=[ids[0]])
+        self.assertEqual(self.client.get(detail_url).status_code, status.HTTP_200_OK)
+        with mock.patch("django.db.models.query.QuerySet.delete") as collector_delete:
+            response = self.client.delete(self.url, [ids[0], {"id": ids[1]}], format="json")
+        collector_delete.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["deleted"], 2)
+        self.assertEqual(list(Book.objects.values_list("id", flat=True)), [ids[2]])
+        # The cached detail response was invalidated.
+        self.assertEqual(self.client.get(detail_url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_delete_uses_collector_when_books_are_referenced(self):
+        ids = self.client.post(self.url, self.items(2), format="json").data["ids"]
+        cascade = mock.Mock(on_delete=models.CASCADE)
+        with mock.patch.object(Book._meta, "related_objects", [*Book._meta.related_objects, cascade]), \
+                mock.patch("django.db.models.query.QuerySet.delete", return_value=(2, {})) as delete:
+            response = self.client.delete(self.url, ids, format="json")
+        self.assertEqual(response.data["deleted"], 2)
+        delete.assert_called_once_with()
+
+
+class BookExportTests(FreshCacheAPITestCase):
+    def setUp(self):
+        self.achebe = Author.objects.create(name="Chinua Achebe")
+        self.adichie = Author.objects.create(name="Chimamanda Adichie")
+        Book.objects.create(title="Things Fall Apart", author=self.achebe, publication_year=1958)
+        Book.objects.create(title="Arrow of God", author=self.achebe, publication_year=1964)
+        Book.objects.create(title="Half of a Yellow Sun", author=self.adichie, publication_year=2006)
+
+    def export(self, fmt, query=""):
+        response = self.client.get(reverse("book-export", args=[fmt]) + query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_ndjson_export(self):
+        rows = [json.loads(line) for line in self.export("ndjson").splitlines()]
+        self.assertEqual([row["title"] for row in rows], ["Things Fall Apart", "Arrow of God", "Half of a Yellow Sun"])
+        self.assertEqual(set(rows[0]), {"id", "title", "publication_year", "author"})
+
+    def test_csv_export(self):
+        rows = list(csv.reader(io.StringIO(self.export("csv", "?expand=author&ordering=-publication_year"))))
+        self.assertEqual(rows[0], ["id", "title", "publication_year", "author", "author_name"])
+        self.assertEqual(rows[1][1:], ["Half of a Yellow Sun", "2006", str(self.adichie.id), "Chimamanda Adichie"])
+        self.assertEqual(len(rows), 4)
+
+    def test_export_honors_list_filters(self):
+        lines = self.export("ndjson", f"?author={self.achebe.id}&publication_year__gte=1960").splitlines()
+        self.assertEqual([json.loads(line)["title"] for line in lines], ["Arrow of God"])
+        lines = self.export("ndjson", "?search=yellow").splitlines()
+        self.assertEqual([json.loads(line)["title"] for line in lines], ["Half of a Yellow Sun"])
+
+    def test_accept_header_and_unknown_format(self):
+        response = self.client.get(reverse("book-export", args=["csv"]), HTTP_ACCEPT="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(reverse("book-export", args=["xml"]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class FastReadPathTests(QueryCountMixin, FreshCacheAPITestCase):
+    """The .values() read path must produce exactly what the ModelSerializers produce."""
+    def setUp(self):
+        self.achebe = Author.objects.create(name="Chinua Achebe")
+        self.adichie = Author.objects.create(name="Chimamanda Adichie")
+        Author.objects.create(name="No Books Yet")
+        Book.objects.create(title="Things Fall Apart", author=self.achebe, publication_year=1958)
+        Book.objects.create(title="Arrow of God", author=self.achebe, publication_year=1964)
+        self.book = Book.objects.create(title="Half of a Yellow Sun", author=self.adichie, publication_year=2006)
+
+    def get_json(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_book_list_matches_book_serializer(self):
+        expected = BookSerializer(Book.objects.order_by("title", "id"), many=True).data
+        self.assertEqual(self.get_json(reverse("book-list"))["results"], [dict(book) for book in expected])
+
+    def test_expanded_book_matches_expanded_serializer(self):
+        url = reverse("book-detail", args=[self.book.id]) + "?expand=author"
+        self.assertEqual(self.get_json(url), BookExpandedSerializer(self.book).data)
+        results = self.get_json(reverse("book-list") + "?expand=author&ordering=-author__name")["results"]
+        self.assertEqual([book["author"]["name"] for book in results], ["Chinua Achebe"] * 2 + ["Chimamanda Adichie"])
+
+    def test_authors_match_author_serializer(self):
+        url = reverse("author-list") + "?books_ordering=-publication_year"
+        results = self.get_json(url)["results"]
+        self.assertEqual(results[0]["name"], "Chimamanda Adichie")
+        self.assertEqual([book["title"] for book in results[1]["books"]], ["Arrow of God", "Things Fall Apart"])
+        self.assertEqual(results[2]["books"], [])
+        self.assertEqual(
+            self.get_json(reverse("author-detail", args=[self.adichie.id])),
+            AuthorSerializer(Author.objects.get(pk=self.adichie.id)).data,  # fresh counters
+        )
+
+    def test_missing_object_is_404(self):
+        response = self.client.get(reverse("book-detail", args=[999999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_author_list_uses_two_queries(self):
+        self.assertEqual(self.count_queries(reverse("author-list") + "?ordering=id"), 2)
+
+    def test_values_serializers_match_model_serializers(self):
+        books = Book.objects.select_related("author").order_by("id")
+        for values_class, model_class in [
+            (BookValuesSerializer, BookSerializer),
+            (BookExpandedValuesSerializer, BookExpandedSerializer),
+        ]:
+            serializer = values_class()
+            self.assertEqual(
+                serializer.serialize(books.values(*serializer.lookups)),
+                [dict(book) for book in model_class(books, many=True).data],
+                values_class.__name__,
+            )
+
+    def test_fast_path_is_used_for_reads(self):
+        with mock.patch.object(BookValuesSerializer, "serialize", autospec=True, side_effect=BookValuesSerializer.serialize) as serialize:
+            self.get_json(reverse("book-list"))
+            self.get_json(reverse("book-detail", args=[self.book.id]))
+        self.assertEqual(serialize.call_count, 2)
+
+
+
+class SparseFieldsetTests(FreshCacheAPITestCase):
+    def setUp(self):
+        self.achebe = Author.objects.create(name="Chinua Achebe")
+        self.adichie = Author.objects.create(name="Chimamanda Adichie")
+        Book.objects.create(title="Things Fall Apart", author=self.achebe, publication_year=1958)
+        Book.objects.create(title="No Longer at Ease", author=self.achebe, publication_year=1960)
+        Book.objects.create(title="Arrow of God", author=self.achebe, publication_year=1964)
+        self.book = Book.objects.create(title="Purple Hibiscus", author=self.adichie, publication_year=2003)
+
+    def get(self, url):
+        """JSON of GET `url` and the SQL it ran."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json(), [query["sql"] for query in ctx.captured_queries]
+
+    def book_queries(self, queries):
+        return [sql for sql in queries if 'FROM "api_book"' in sql]
+
+    def test_book_fields_trim_output_and_select(self):
+        data, queries = self.get(reverse("book-list") + "?fields=id,title")
+        self.assertEqual(data["results"][0], {"id": Book.objects.get(title="Arrow of God").id, "title": "Arrow of God"})
+        self.assertNotIn("publication_year", self.book_queries(queries)[0])
+        # Paging still works without the ordering column in the output.
+        data, _ = self.get(reverse("book-list") + "?fields=id&page_size=2")
+        data, _ = self.get(data["next"])
+        self.assertEqual(len(data["results"]), 2)
+
+    def test_book_exclude_and_unknown_fields(self):
+        data, _ = self.get(reverse("book-detail", args=[self.book.id]) + "?exclude=author,publication_year")
+        self.assertEqual(data, {"id": self.book.id, "title": "Purple Hibiscus"})
+        data, _ = self.get(reverse("book-detail", args=[self.book.id]) + "?fields=nope")
+        self.assertEqual(set(data), {"id", "title", "publication_year", "author"})
+        data, _ = self.get(reverse("book-detail", args=[self.book.id]) + "?fields=title,author&expand=author")
+        self.assertEqual(data["author"], {"id": self.adichie.id, "name": "Chimamanda Adichie"})
+
+    def test_model_serializer_path_uses_only(self):
+        with mock.patch.object(BookListView, "fast_serializer_classes", {}):
+            data, queries = self.get(reverse("book-list") + "?fields=title&ordering=-publication_year")
+        self.assertEqual(data["results"][0], {"title": "Purple Hibiscus"})
+        self.assertEqual(len(self.book_queries(queries)), 1)  # no deferred column loaded per row
+        self.assertNotIn('"api_book"."author_id"', self.book_queries(queries)[0])
+
+    def test_author_fields_and_nested_books(self):
+        url = reverse("author-list") + "?ordering=id&fields=name,books&books_fields=title&books_limit=2"
+        expected = [
+            {"name": "Chinua Achebe", "books": [{"title": "Things Fall Apart"}, {"title": "No Longer at Ease"}]},
+            {"name": "Chimamanda Adichie", "books": [{"title": "Purple Hibiscus"}]},
+        ]
+        data, queries = self.get(url)
+        self.assertEqual(data["results"], expected)
+        self.assertNotIn("publication_year", self.book_queries(queries)[0].split("FROM")[0])
+        with mock.patch.object(AuthorListView, "fast_serializer_classes", {}):
+            data, _ = self.get(url)
+        self.assertEqual(data["results"], expected)
+
+    def test_author_books_limit_follows_books_ordering(self):
+        url = reverse("author-detail", args=[self.achebe.id]) + "?books_ordering=-publication_year&books_limit=1"
+        data, _ = self.get(url)
+        self.assertEqual([book["title"] for book in data["books"]], ["Arrow of God"])
+
+    def test_excluding_books_skips_their_query(self):
+        data, queries = self.get(reverse("author-list") + "?exclude=books")
+        self.assertNotIn("books", data["results"][0])
+        self.assertEqual(self.book_queries(queries), [])
+
+
+class ORJSONRendererParserTests(FreshCacheAPITestCase):
+    payload = {
+        "title": "Things Fall Apart   é",
+        "published": datetime.datetime(1958, 6, 17, 9, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        "naive": datetime.datetime(1958, 6, 17, 9, 30),
+        "date": datetime.date(1958, 6, 17),
+        "time": datetime.time(9, 30),
+        "price": decimal.Decimal("12.50"),
+        "lazy": gettext_lazy("Books"),
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "nested": [{"ok": True, "none": None, "float": 1.5}, (1, 2), {3: "int key"}],
+        "huge": 2 ** 70,
+    }
+
+    def test_renderer_output_matches_json_renderer(self):
+        for media_type in [None, "application/json; indent=2", "application/json; indent=4"]:
+            self.assertEqual(
+                ORJSONRenderer().render(self.payload, media_type),
+                JSONRenderer().render(self.payload, media_type),
+                media_type,
+            )
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+    def test_parser_matches_json_parser(self):
+        for body in [b'{"title": "caf\xc3\xa9", "year": 1958, "n": [1.5, null, true]}', b'[1, 2, 99999999999999999999999]']:
+            self.assertEqual(
+                ORJSONParser().parse(io.BytesIO(body)),
+                JSONParser().parse(io.BytesIO(body)),
+            )
+        for body in [b'{"title": ', b'{"n": NaN}']:
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
+
+    def test_api_round_trip(self):
+        User.objects.create_user(username="writer", password="password123")
+        self.client.login(username="writer", password="password123")
+        author = Author.objects.create(name="Chinua Achebe")
+        response = self.client.post(
+            reverse("book-create"),
+            data=b'{"title": "Arrow of God", "publication_year": 1964, "author": %d}' % author.id,
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.get(reverse("book-list"))
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.json()["results"][0]["title"], "Arrow of God")
+
+
+class AsyncBookReadTests(FreshCacheAPITestCase):
+    def setUp(self):
+        self.achebe = Author.objects.create(name="Chinua Achebe")
+        self.adichie = Author.objects.create(name="Chimamanda Adichie")
+        for i in range(5):
+            Book.objects.create(title=f"Achebe {i}", author=self.achebe, publication_year=1958 + i)
+        self.book = Book.objects.create(title="Half of a Yellow Sun", author=self.adichie, publication_year=2006)
+
+    async def test_async_list_matches_sync_list(self):
+        for query in ["", "?ordering=-publication_year&page_size=2", "?expand=author&author__name__istartswith=chim",
+                      f"?author={self.achebe.id}&publication_year__gte=1960", "?search=yellow"]:
+            sync = await self.async_client.get(reverse("book-list") + query)
+            response = await self.async_client.get(reverse("async-book-list") + query)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, query)
+            expected = sync.json()
+            for link in ["next", "previous"]:
+                if expected[link]:
+                    expected[link] = expected[link].replace("/api/books/", "/api/async/books/")
+            self.assertEqual(response.json(), expected, query)
+
+    async def test_async_pagination_follows_cursors(self):
+        seen = []
+        url = reverse("async-book-list") + "?page_size=4"
+        while url:
+            data = (await self.async_client.get(url)).json()
+            seen += [book["id"] for book in data["results"]]
+            url = data["next"]
+        self.assertEqual(len(seen), 6)
+
+    async def test_async_detail(self):
+        response = await self.async_client.get(reverse("async-book-detail", args=[self.book.id]) + "?expand=author")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["author"], {"id": self.adichie.id, "name": "Chimamanda Adichie"})
+        response = await self.async_client.get(reverse("async-book-detail", args=[999999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_async_errors_and_methods(self):
+        response = await self.async_client.get(reverse("async-book-list") + "?cursor=garbage")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json(), {"detail": "Invalid cursor"})
+        response = await self.async_client.get(reverse("async-book-list") + "?publication_year=abc")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = await self.async_client.post(reverse("async-book-list"), {})
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_read_views_must_implement_get_data(self):
+        with self.assertRaises(TypeError):
+            AsyncBookReadView()
+
+
+class InstrumentationTests(FreshCacheAPITestCase):
+    def setUp(self):
+        instrumentation.stats.reset()
+        self.author = Author.objects.create(name="Chinua Achebe")
+        for i in range(3):
+            Book.objects.create(title=f"Book {i}", author=self.author, publication_year=1958 + i)
+        self.admin = User.objects.create_superuser("admin", "admin@example.com", "pass1234")
+
+    def timings(self, response):
+        return dict(entry.split(";", 1) for entry in response["Server-Timing"].split(", "))
+
+    def test_server_timing_reports_queries_and_phases(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("book-list") + "?expand=author")
+        timings = self.timings(response)
+        self.assertIn(f'desc="{len(ctx.captured_queries)} queries"', timings["db"])
+        self.assertEqual(set(timings), {"db", "serialize", "render", "total"})
+
+    def test_repeated_queries_are_grouped_by_signature(self):
+        metrics = instrumentation.RequestMetrics()
+        metrics.statements.update({
+            'SELECT * FROM "book" WHERE "id" = %s': 4,
+            'SELECT * FROM "book" WHERE "id" IN (%s, %s)': 1,
+            'SELECT * FROM "book" WHERE "id" IN (%s)': 2,
+            'SELECT * FROM "author"': 1,
+        })
+        self.assertEqual(metrics.repeated_queries(3), {
+            'SELECT * FROM "book" WHERE "id" = %s': 4,
+            'SELECT * FROM "book" WHERE "id" IN (...)': 3,
+        })
+
+    def test_stats_endpoint(self):
+        self.client.get(reverse("book-list"))
+        self.client.get(reverse("book-detail", args=[Book.objects.first().id]))
+        self.client.get(reverse("book-list") + "?ordering=title")
+        url = reverse("instrumentation-stats")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(self.admin)
+        endpoints = {entry["endpoint"]: entry for entry in self.client.get(url + "?order=requests").data["endpoints"]}
+        self.assertEqual(endpoints["GET /api/books/"]["requests"], 2)
+        self.assertEqual(endpoints["GET /api/books/<int:pk>/"]["requests"], 1)
+        self.assertGreater(endpoints["GET /api/books/"]["queries"], 0)
+        self.assertEqual(len(self.client.get(url + "?limit=1").data["endpoints"]), 1)
+
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_204_NO_CONTENT)
+        # Only the DELETE itself, recorded after the reset.
+        self.assertEqual([entry["endpoint"] for entry in instrumentation.stats.snapshot()],
+                         ["DELETE /api/instrumentation-stats/"])
+
+    @override_settings(INSTRUMENTATION={"SAMPLE_RATE": 0})
+    def test_unsampled_requests_are_not_recorded(self):
+        response = self.client.get(reverse("book-list"))
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(instrumentation.stats.snapshot(), [])
+
+    async def test_async_views_are_instrumented(self):
+        response = await self.async_client.get(reverse("async-book-list"))
+        self.assertIn('desc="1 queries"', self.timings(response)["db"])
+
+
+@override_settings(DATABASE_REPLICAS={"ALIASES": ["default"], "MAX_LAG": 0})
+class ReplicaRoutingTests(FreshCacheAPITestCase):
+    # 'default' doubles as the replica: the tests check which alias is chosen.
+    def setUp(self):
+        self.author = Author.objects.create(name="Chinua Achebe")
+        self.book = Book.objects.create(title="Things Fall Apart", author=self.author, publication_year=1958)
+        self.user = User.objects.create_user("writer", password="pass1234")
+        caches["default"].delete(replicas.sticky_key(self.user))  # user ids repeat between tests
+
+    def chosen_aliases(self, url):
+        """Aliases chosen by ReplicaReadMixin while serving GET `url`."""
+        chosen = []
+        choose_replica = replicas.choose_replica
+
+        def choose(*args):
+            chosen.append(choose_replica(*args))
+            return chosen[-1]
+
+        with mock.patch.object(replicas, "choose_replica", side_effect=choose):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        return chosen
+
+    def test_reads_go_to_a_replica(self):
+        self.assertEqual(self.chosen_aliases(reverse("book-list")), ["default"])
+        self.assertEqual(self.chosen_aliases(reverse("book-detail", args=[self.book.id])), ["default"])
+
+    def test_reads_stay_on_the_primary_after_a_write(self):
+        self.client.force_authenticate(self.user)
+        self.client.post(reverse("book-create"), {
+            "title": "Arrow of God", "publication_year": 1964, "author": self.author.id,
+        })
+        self.assertTrue(replicas.is_sticky(self.user))
+        self.assertEqual(self.chosen_aliases(reverse("book-list")), [None])
+        self.client.force_authenticate(None)
+        self.assertEqual(self.chosen_aliases(reverse("book-list")), ["default"])
+
+    @override_settings(DATABASE_REPLICAS={"ALIASES": ["replica1"], "MAX_LAG": 5})
+    def test_recently_changed_data_is_read_from_the_primary(self):
+        self.assertIsNone(replicas.choose_replica(self.user, time.time() - 1))
+        self.assertEqual(replicas.choose_replica(self.user, time.time() - 10), "replica1")
+
+    @override_settings(DATABASE_REPLICAS={"ALIASES": ["replica1"]})
+    def test_router(self):
+        router = replicas.ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Book))
+        with replicas.reading_from("replica1"):
+            self.assertEqual(router.db_for_read(Book), "replica1")
+            self.assertEqual(router.db_for_write(Book), "default")
+        self.assertFalse(router.allow_migrate("replica1", "api"))
+        self.assertIsNone(router.allow_migrate("default", "api"))
+
+
+class BookStatsTests(FreshCacheAPITestCase):
+    def setUp(self):
+        self.achebe = Author.objects.create(name="Chinua Achebe")
+        self.adichie = Author.objects.create(name="Chimamanda Adichie")
+        self.books = [
+            Book.objects.create(title="Things Fall Apart", author=self.achebe, publication_year=1958),
+            Book.objects.create(title="No Longer at Ease", author=self.achebe, publication_year=1960),
+            Book.objects.create(title="Arrow of God", author=self.achebe, publication_year=1964),
+            Book.objects.create(title="Purple Hibiscus", author=self.adichie, publication_year=2003),
+        ]
+
+    def author_stats(self, author):
+        return AuthorStats.objects.values_list("book_count", "earliest_year", "latest_year").get(author=author)
+
+    def test_single_book_writes_keep_stats_consistent(self):
+        self.assertEqual(self.author_stats(self.achebe), (3, 1958, 1964))
+        first = self.books[0]
+        first.publication_year = 1959
+        first.save()
+        self.assertEqual(self.author_stats(self.achebe), (3, 1959, 1964))
+        first.author = self.adichie
+        first.save()
+        self.assertEqual(self.author_stats(self.achebe), (2, 1960, 1964))
+        self.assertEqual(self.author_stats(self.adichie), (2, 1959, 2003))
+        Book.objects.get(pk=self.books[2].pk).delete()
+        self.assertEqual(self.author_stats(self.achebe), (1, 1960, 1960))
+        self.assertEqual(YearStats.objects.get(publication_year=1964).book_count, 0)
+        self.assertEqual(stats.check(), [])
+
+    def test_bulk_writes_keep_stats_consistent(self):
+        user = User.objects.create_user(username="importer", password="password123")
+        self.client.force_authenticate(user)
+        url = reverse("book-bulk")
+        ids = self.client.post(url, [
+            {"title": "Americanah", "publication_year": 2013, "author": self.adichie.id},
+            {"title": "Half of a Yellow Sun", "publication_year": 2006, "author": self.adichie.id},
+        ], format="json").data["ids"]
+        self.assertEqual(self.author_stats(self.adichie), (3, 2003, 2013))
+        self.client.patch(url, [{"id": ids[0], "author": self.achebe.id}], format="json")
+        self.assertEqual(self.author_stats(self.achebe), (4, 1958, 2013))
+        self.assertEqual(Author.objects.get(pk=self.achebe.pk).book_count, 4)
+        self.client.delete(url, [ids[0], self.books[3].id], format="json")
+        self.assertEqual(self.author_stats(self.adichie), (1, 2006, 2006))
+        self.assertEqual(stats.check(), [])
+
+    def test_author_stats_list(self):
+        Author.objects.create(name="No Books Yet")
+        response = self.client.get(reverse("author-stats-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([(row["name"], row["book_count"]) for row in response.data["results"]],
+                         [("Chinua Achebe", 3), ("Chimamanda Adichie", 1)])
+        self.assertEqual(response.data["results"][0]["earliest_year"], 1958)
+        response = self.client.get(reverse("author-stats-list") + "?ordering=-latest_year")
+        self.assertEqual(response.data["results"][0]["author"], self.adichie.id)
+
+    def test_author_stats_detail(self):
+        response = self.client.get(reverse("author-stats-detail", args=[self.adichie.id]))
+        self.assertEqual(response.data["book_count"], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Book.objects.create(title="Americanah", author=self.adichie, publication_year=2013)
+        response = self.client.get(reverse("author-stats-detail", args=[self.adichie.id]))
+        self.assertEqual((response.data["book_count"], response.data["latest_year"]), (2, 2013))
+
+        author = Author.objects.create(name="No Books Yet")
+        response = self.client.get(reverse("author-stats-detail", args=[author.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["book_count"], 0)
+        response = self.client.get(reverse("author-stats-detail", args=[999999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_year_buckets(self):
+        response = self.client.get(reverse("book-year-stats") + "?bucket=10")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total"], 4)
+        self.assertEqual(response.data["results"], [
+            {"start": 1950, "end": 1959, "book_count": 1},
+            {"start": 1960, "end": 1969, "book_count": 2},
+            {"start": 2000, "end": 2009, "book_count": 1},
+        ])
+        response = self.client.get(reverse("book-year-stats") + "?bucket=oops")
+        self.assertEqual(len(response.data["results"]), 4)
+
+    def test_check_and_rebuild(self):
+        Book.objects.filter(author=self.achebe).update(publication_year=1970)  # no signals
+        problems = stats.check()
+        self.assertTrue(any(problem.startswith(f"author {self.achebe.id}:") for problem in problems))
+        self.assertTrue(any(problem.startswith("year 1970:") for problem in problems))
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(stats.rebuild(), (2, 2))
+        # Nothing references the stats tables: delete() empties each with one DELETE.
+        self.assertEqual(sum(query["sql"].startswith("DELETE") for query in ctx.captured_queries), 2)
+        self.assertEqual(stats.check(), [])
+        self.assertEqual(self.author_stats(self.achebe), (3, 1970, 1970))
+
+    # -------------------- AUTHOR COUNTERS --------------------
+    def counters(self, author):
+        return Author.objects.values_list("book_count", "latest_publication_year").get(pk=author.pk)
+
+    def test_author_counters_follow_book_writes(self):
+        self.assertEqual(self.counters(self.achebe), (3, 1964))
+        last = self.books[2]
+        last.author = self.adichie
+        last.save()
+        self.assertEqual(self.counters(self.achebe), (2, 1960))
+        self.assertEqual(self.counters(self.adichie), (2, 2003))
+        Book.objects.filter(author=self.adichie).delete()
+        self.assertEqual(self.counters(self.adichie), (0, 0))
+        # Saving a stale instance does not write its counters back.
+        self.achebe.name = "Chinua Achebe (1930-2013)"
+        self.achebe.save()
+        self.assertEqual(self.counters(self.achebe), (2, 1960))
+
+    def test_changed_counters_are_not_dropped_silently(self):
+        author = Author.objects.get(pk=self.achebe.pk)
+        author.book_count = 99
+        with self.assertRaisesMessage(ValueError, "Author.book_count cannot be saved"):
+            author.save()
+        author.save(update_fields=["book_count"])  # explicitly requested: written
+        self.assertEqual(self.counters(self.achebe), (99, 1964))
+        author.refresh_from_db()
+        author.name = "Chinua Achebe (1930-2013)"
+        author.save()
+        self.assertEqual(Author.objects.get(pk=author.pk).name, "Chinua Achebe (1930-2013)")
+
+    def test_author_list_orders_and_filters_by_counters(self):
+        Author.objects.create(name="No Books Yet")
+        results = self.client.get(reverse("author-list") + "?ordering=-book_count").data["results"]
+        self.assertEqual([author["book_count"] for author in results], [3, 1, 0])
+        results = self.client.get(reverse("author-list") + "?ordering=-latest_publication_year").data["results"]
+        self.assertEqual(results[0]["latest_publication_year"], 2003)
+        results = self.client.get(reverse("author-list") + "?book_count__gte=1").data["results"]
+        self.assertEqual({author["name"] for author in results}, {"Chinua Achebe", "Chimamanda Adichie"})
+
+    def test_verify_author_counters(self):
+        Author.objects.filter(pk=self.achebe.pk).update(book_count=7)
+        Book.objects.filter(author=self.adichie).update(publication_year=2020)  # no signals
+        problems = list(stats.verify_author_counters(batch_size=1))
+        self.assertEqual([author_id for author_id, _ in problems], [self.achebe.id, self.adichie.id])
+        with self.assertRaises(CommandError):
+            call_command("verify_author_counters", stderr=io.StringIO())
+        call_command("verify_author_counters", "--fix", "--batch-size", "1", stdout=io.StringIO(), stderr=io.StringIO())
+        self.assertEqual(self.counters(self.achebe), (3, 1964))
+        self.assertEqual(self.counters(self.adichie), (1, 2020))
+        self.assertEqual(list(stats.verify_author_counters()), [])
+
+
+class SQLiteOptionsTests(SimpleTestCase):
+    databases = {"default"}
+
+    def pragmas(self, wrapper, *names):
+        with wrapper.cursor() as cursor:
+            values = []
+            for name in names:
+                cursor.execute(f"PRAGMA {name}")
+                values.append(cursor.fetchone()[0])
+        return values
+
+    def test_file_connections_are_tuned_and_wal_is_enabled_once(self):
+        # The test database lives in memory: open a file-backed one.
+        with tempfile.TemporaryDirectory() as directory:
+            default = connections["default"]
+            settings_dict = {**default.settings_dict, "NAME": os.path.join(directory, "db.sqlite3")}
+            wrapper = type(default)(settings_dict, alias="sqlite-options")
+            try:
+                self.assertEqual(
+                    self.pragmas(wrapper, "journal_mode", "busy_timeout", "mmap_size", "cache_size", "synchronous"),
+                    ["delete", 20_000, 268435456, -65536, 2],  # connecting leaves the journal alone
+                )
+                self.assertEqual(enable_wal(wrapper), "wal")
+                wrapper.close()
+                self.assertEqual(self.pragmas(wrapper, "journal_mode", "synchronous"), ["wal", 1])  # NORMAL
+            finally:
+                wrapper.close()
+
+    def test_in_memory_test_database_is_not_tuned(self):
+        self.assertTrue(connections["default"].is_in_memory_db())
+        self.assertEqual(self.pragmas(connections["default"], "cache_size"), [-2000])  # SQLite's default
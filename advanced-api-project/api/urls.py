@@ -5,6 +5,17 @@ from .views import (
     BookCreateView,
     BookUpdateView,
     BookDeleteView,
+    BookBulkView,
+    BookExportView,
+    AuthorListView,
+    AuthorDetailView,
+    AuthorStatsListView,
+    AuthorStatsDetailView,
+    BookYearStatsView,
+    CacheStatsView,
+    InstrumentationStatsView,
+    AsyncBookListView,
+    AsyncBookDetailView,
 )
 urlpatterns = [
     path("books/", BookListView.as_view(), name="book-list"),
@@ -18,6 +29,23 @@ urlpatterns = [
     # 👇 Add these two so the checker finds them
     path("books/update/", BookUpdateView.as_view(), name="book-update-noid"),
     path("books/delete/", BookDeleteView.as_view(), name="book-delete-noid"),
+
+    path("books/bulk/", BookBulkView.as_view(), name="book-bulk"),
+    path("books/export/<str:fmt>/", BookExportView.as_view(), name="book-export"),
+
+    path("authors/", AuthorListView.as_view(), name="author-list"),
+    path("authors/<int:pk>/", AuthorDetailView.as_view(), name="author-detail"),
+
+    path("stats/authors/", AuthorStatsListView.as_view(), name="author-stats-list"),
+    path("stats/authors/<int:pk>/", AuthorStatsDetailView.as_view(), name="author-stats-detail"),
+    path("stats/years/", BookYearStatsView.as_view(), name="book-year-stats"),
+
+    path("cache-stats/", CacheStatsView.as_view(), name="cache-stats"),
+    path("instrumentation-stats/", InstrumentationStatsView.as_view(), name="instrumentation-stats"),
+
+    # Async (ASGI-native) read routes, same output as books/ and books/<pk>/
+    path("async/books/", AsyncBookListView.as_view(), name="async-book-list"),
+    path("async/books/<int:pk>/", AsyncBookDetailView.as_view(), name="async-book-detail"),
 ]
 
 
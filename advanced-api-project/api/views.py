@@ -1,43 +1,231 @@
+from abc import ABC, abstractmethod
+
 from django_filters import rest_framework as filters
+from drf_orjson.renderers import ORJSONRenderer
 from rest_framework import generics, permissions, filters as drf_filters
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, render
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
-from .models import Book
-from .serializers import BookSerializer
+from django.db import connections, models, transaction
+from django.db.models import Prefetch
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound, ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+from django.core.cache import caches
+from django.core.exceptions import FieldDoesNotExist
+from . import export, instrumentation, search, stats
+from .cache import RESPONSE_CACHE_ALIAS, CachedResponseMixin
+from .filters import FullTextSearchFilter, RelevanceOrderingFilter
+from .models import Author, AuthorStats, Book, YearStats
+from .parsers import NDJSONParser
+from .replicas import ReplicaReadMixin
+from .serializers import (
+    AuthorSerializer,
+    AuthorStatsSerializer,
+    AuthorStatsValuesSerializer,
+    AuthorValuesSerializer,
+    BookBulkSerializer,
+    BookExpandedSerializer,
+    BookExpandedValuesSerializer,
+    BookSerializer,
+    BookValuesSerializer,
+    select_fields,
+)
+from .signals import invalidate_book_responses
+
+
+class FastReadMixin:
+    """
+    Serves GET list/retrieve requests from QuerySet.values() rows through a ValuesSerializer
+    (see api.serializers) instead of model instances + ModelSerializer.
+
+    - fast_serializer_classes maps a view's regular serializer class to its ValuesSerializer;
+      the fast path is used only when get_serializer_class() returns one of them, so writes,
+      validation and any other serializer keep the regular DRF path.
+    - Filtering, ordering, keyset pagination and permissions work exactly as before.
+    """
+    def get_field_selection(self):
+        """Sparse fieldset keyword arguments for the serializers; see FieldSelectionMixin."""
+        return {}
+
+    def get_fast_serializer(self):
+        if self.request.method not in permissions.SAFE_METHODS:
+            return None
+        # Declared by the queryset mixins, which come after this class in the MRO.
+        fast_class = getattr(self, 'fast_serializer_classes', {}).get(self.get_serializer_class())
+        if fast_class is None:
+            return None
+        return fast_class(context=self.get_serializer_context(), **self.get_field_selection())
+
+    def get_values_queryset(self, queryset, serializer):
+        # Ordering columns and the primary key are fetched too, whatever the fieldset:
+        # the paginator reads the cursor position from them.
+        ordering = [field.lstrip('-') for field in queryset.query.order_by if isinstance(field, str)]
+        extra = [field for field in ordering if field != '?'] + [queryset.model._meta.pk.name]
+        lookups = list(dict.fromkeys(serializer.lookups + extra))
+        return queryset.prefetch_related(None).values(*lookups)
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_fast_serializer()
+        if serializer is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.get_values_queryset(self.filter_queryset(self.get_queryset()), serializer)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        serializer = self.get_fast_serializer()
+        if serializer is None:
+            return super().retrieve(request, *args, **kwargs)
+        queryset = self.get_values_queryset(self.filter_queryset(self.get_queryset()), serializer)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(request, row)
+        return Response(serializer.serialize([row])[0])
+
+
+class FieldSelectionMixin:
+    """
+    Sparse fieldsets for GET requests (mobile clients that only need a few fields):
+        ?fields=id,title        only these fields
+        ?exclude=author         every field except these
+    Comma-separated serializer field names; unknown names are ignored (see
+    api.serializers.select_fields).
+
+    Only the selected columns are read: the fast path fetches just the values() lookups
+    of the selected fields, and the ModelSerializer path loads instances with .only().
+    Put it before FastReadMixin.
+    """
+    def get_field_selection(self):
+        if self.request.method not in permissions.SAFE_METHODS:
+            return {}
+        params = self.request.query_params
+        return {
+            key: [name.strip() for name in params[key].split(',') if name.strip()]
+            for key in ['fields', 'exclude'] if params.get(key)
+        }
+
+    def get_selected_fields(self):
+        return select_fields(self.get_serializer_class().Meta.fields, **self.get_field_selection())
+
+    def get_serializer(self, *args, **kwargs):
+        return super().get_serializer(*args, **{**self.get_field_selection(), **kwargs})
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_field_selection():
+            queryset = queryset.only(*only_columns(queryset, self.get_selected_fields()))
+        return queryset
+
+
+def only_columns(queryset, names):
+    """
+    The .only() arguments that load serializer fields `names` of queryset's model: their
+    concrete model fields, plus the primary key and the ordering columns (which the
+    paginator reads) so no deferred column is fetched row by row later.
+    """
+    opts = queryset.model._meta
+    columns = [opts.pk.name]
+    for name in names:
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist:  # e.g. the reverse relation "books"
+            continue
+        if field.concrete:
+            columns.append(name)
+    for field in queryset.query.order_by:
+        if isinstance(field, str) and field != '?' and field.lstrip('-') not in queryset.query.annotations:
+            columns.append(field.lstrip('-'))
+    return list(dict.fromkeys(columns))
+
+
+class BookQuerysetMixin:
+    """
+    Builds the Book queryset with only the joins the request needs.
+
+    - ?expand=author embeds {"id", "name"} of the author (BookExpandedSerializer).
+    - Expanding, or ordering by author__name, selects the author in the same query
+      (select_related) instead of looking it up once per book.
+    - Filtering/searching on author__name already joins the author table, so they
+      need nothing extra.
+    """
+    expandable_fields = ['author']
+    fast_serializer_classes = {
+        BookSerializer: BookValuesSerializer,
+        BookExpandedSerializer: BookExpandedValuesSerializer,
+    }
+
+    def get_expand(self):
+        expand = self.request.query_params.get('expand', '')
+        return {field for field in expand.split(',') if field in self.expandable_fields}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        ordering = self.request.query_params.get('ordering', '')
+        if 'author' in self.get_expand() or 'author__' in ordering:
+            queryset = queryset.select_related('author')
+        return queryset
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET' and 'author' in self.get_expand():
+            return BookExpandedSerializer
+        return super().get_serializer_class()
 
 
 # List all books or create a new one (read is open, write requires auth)
-class BookListView(generics.ListCreateAPIView):
+class BookListView(CachedResponseMixin, ReplicaReadMixin, FieldSelectionMixin, FastReadMixin, BookQuerysetMixin,
+                   generics.ListCreateAPIView):
     """
     Supports:
     - Filtering:
         ?title=Things Fall Apart
         ?title__icontains=fall
+        ?title__istartswith=things      (indexed prefix match)
         ?publication_year=1958
         ?publication_year__gte=1950&publication_year__lte=1965
         ?author=1                       (by author ID)
         ?author__name=Chinua Achebe     (exact name)
         ?author__name__icontains=achebe (partial name)
-    - Searching (OR across fields):
-        ?search=achebe                  (matches title OR author name)
+        ?author__name__istartswith=chinua (indexed prefix match)
+    - Searching (full-text, see api.filters.FullTextSearchFilter):
+        ?search=achebe                  (matches title OR author name word prefixes)
+        ?search=things fall             (every term must match; ranked by relevance
+                                         unless ?ordering= is given)
     - Ordering:
         ?ordering=title
         ?ordering=-publication_year
         ?ordering=author__name
+    - Expanding (see BookQuerysetMixin):
+        ?expand=author                  (embed author id + name)
+    - Sparse fieldsets (see FieldSelectionMixin):
+        ?fields=id,title
+        ?exclude=author
+    - Pagination (keyset, see api.pagination.KeysetPagination):
+        ?page_size=100
+        ?cursor=<token>                 (follow the "next" / "previous" links)
+    - Caching: GET responses are cached until a book or author changes (see api.cache).
+    - Replicas: uncached GETs read from a replica when one is configured (see api.replicas).
+    - Serialization: GET responses are built from .values() rows (see FastReadMixin).
     """
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     # Enable filtering, searching, ordering
-    filter_backends = [filters.DjangoFilterBackend, drf_filters.SearchFilter, drf_filters.OrderingFilter]
+    filter_backends = [filters.DjangoFilterBackend, FullTextSearchFilter, RelevanceOrderingFilter]
 
     # Filtering options (Step 1)
     filterset_fields = {
-        'title': ['exact', 'icontains'],
+        'title': ['exact', 'icontains', 'istartswith'],
         'publication_year': ['exact', 'gte', 'lte'],
         'author': ['exact'],                # filter by author ID
-        'author__name': ['exact', 'icontains'],  # filter by author name
+        'author__name': ['exact', 'icontains', 'istartswith'],  # filter by author name
     }
 
     # Search options (Step 2)
@@ -47,13 +235,73 @@ class BookListView(generics.ListCreateAPIView):
     ordering_fields = ['id', 'title', 'publication_year', 'author__name']
     ordering = ['title']  # Default ordering
 
+    cache_dependencies = ['books']
+
+
+# Export the whole (filtered) catalog as a streamed file
+class BookExportView(generics.GenericAPIView):
+    """
+    Streams every matching book instead of one page:
+        GET /api/books/export/ndjson/   -> {"id": 1, "title": "...", "publication_year": 1958, "author": 1} per line
+        GET /api/books/export/csv/      -> id,title,publication_year,author
+        ?expand=author                  adds author_name (joined in the same query)
+        ?chunk_size=5000                rows fetched per database round-trip (default 2000, max 10000)
+
+    - Accepts the same filters, ?search= and ?ordering= as BookListView (default ordering: id).
+    - Rows are streamed straight from a database cursor (see api.export), so memory stays
+      constant however large the catalog is. Responses are not cached.
+    """
+    queryset = Book.objects.all()
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = None
+    filter_backends = BookListView.filter_backends
+    filterset_fields = BookListView.filterset_fields
+    search_fields = BookListView.search_fields
+    ordering_fields = BookListView.ordering_fields
+    ordering = ['id']
+
+    fields = ['id', 'title', 'publication_year', 'author_id']
+    columns = ['id', 'title', 'publication_year', 'author']
+    max_chunk_size = 10000
+
+    def get_chunk_size(self):
+        try:
+            chunk_size = int(self.request.query_params['chunk_size'])
+        except (KeyError, ValueError):
+            return export.CHUNK_SIZE
+        return max(1, min(chunk_size, self.max_chunk_size))
+
+    def perform_content_negotiation(self, request, force=False):
+        # The format comes from the URL; an Accept: text/csv header must not end in 406.
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, fmt, *args, **kwargs):
+        if fmt not in export.FORMATS:
+            raise NotFound(f"Unknown export format '{fmt}'. Use one of: {', '.join(export.FORMATS)}.")
+        fields, columns = list(self.fields), list(self.columns)
+        if 'author' in request.query_params.get('expand', '').split(','):
+            fields.append('author__name')
+            columns.append('author_name')
+
+        queryset = self.filter_queryset(self.get_queryset())
+        _, content_type, extension = export.FORMATS[fmt]
+        response = StreamingHttpResponse(
+            export.stream_queryset(queryset, fields, fmt, chunk_size=self.get_chunk_size(), columns=columns),
+            content_type=content_type,
+        )
+        response['Content-Disposition'] = f'attachment; filename="books.{extension}"'
+        return response
+
 
 # Retrieve a single book (read is open, write requires auth)
-class BookDetailView(generics.RetrieveAPIView):
+class BookDetailView(CachedResponseMixin, ReplicaReadMixin, FieldSelectionMixin, FastReadMixin, BookQuerysetMixin,
+                     generics.RetrieveAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
+    cache_dependencies = ['book:{pk}', 'author-names']
+
 
 # Create a book (only logged-in users)
 class BookCreateView(generics.CreateAPIView):
@@ -73,4 +321,477 @@ class BookUpdateView(generics.UpdateAPIView):
 class BookDeleteView(generics.DestroyAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
-    permission_classes = [IsAuthenticated]
\ No newline at end of file
+    permission_classes = [IsAuthenticated]
+
+
+# Create / update / delete many books in one request (only logged-in users)
+class BookBulkView(generics.GenericAPIView):
+    """
+    Accepts a JSON array, or NDJSON (Content-Type: application/x-ndjson, one object per line):
+        POST   [{"title": ..., "publication_year": ..., "author": 1}, ...]   -> create
+        PUT    [{"id": 3, "title": ..., "publication_year": ..., "author": 1}, ...]   -> full update
+        PATCH  [{"id": 3, "title": ...}, ...]                               -> partial update
+        DELETE [3, 4, 5]  (or [{"id": 3}, ...])                             -> delete
+        ?batch_size=500   rows per INSERT/UPDATE statement (default 1000, max 5000)
+
+    - Every item is validated with BookSerializer's rules (including publication_year);
+      authors are loaded with one query for the whole batch.
+    - All-or-nothing: everything is written in one transaction, and if any item is invalid
+      nothing is written and the response lists the errors per item index:
+        {"errors": [{"index": 2, "errors": {"publication_year": ["..."]}}]}
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookBulkSerializer
+    permission_classes = [IsAuthenticated]
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES + [NDJSONParser]
+    pagination_class = None
+
+    default_batch_size = 1000
+    max_batch_size = 5000
+
+    def get_batch_size(self):
+        try:
+            batch_size = int(self.request.query_params['batch_size'])
+        except (KeyError, ValueError):
+            return self.default_batch_size
+        return max(1, min(batch_size, self.max_batch_size))
+
+    def get_items(self):
+        items = self.request.data
+        if not isinstance(items, list):
+            raise ValidationError({'non_field_errors': ['Expected a list of items.']})
+        return items
+
+    def validate_items(self, items, partial=False):
+        author_ids = {str(item.get('author')) for item in items if isinstance(item, dict)}
+        authors = Author.objects.in_bulk([pk for pk in author_ids if pk.isdigit()])
+        serializer = self.get_serializer(data=items, many=True, partial=partial,
+                                         context={**self.get_serializer_context(), 'authors': authors})
+        if not serializer.is_valid():
+            errors = serializer.errors
+            # Newer DRF reports {index: errors}, older DRF a list with one entry per item.
+            pairs = errors.items() if isinstance(errors, dict) else enumerate(errors)
+            return None, [{'index': index, 'errors': item_errors} for index, item_errors in pairs if item_errors]
+        return serializer.validated_data, []
+
+    @staticmethod
+    def error_response(errors):
+        return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    @staticmethod
+    def get_item_id(item):
+        pk = item.get('id') if isinstance(item, dict) else item
+        return pk if isinstance(pk, int) and not isinstance(pk, bool) else None
+
+    def post(self, request, *args, **kwargs):
+        items = self.get_items()
+        validated, errors = self.validate_items(items)
+        if errors:
+            return self.error_response(errors)
+
+        books = [Book(**attrs) for attrs in validated]
+        with transaction.atomic():
+            Book.objects.bulk_create(books, batch_size=self.get_batch_size())
+            # bulk_create sends no signals: sync the search index and caches here.
+            book_ids = [book.pk for book in books]
+            search.index_books(book_ids)
+            stats.refresh({book.author_id for book in books}, {book.publication_year for book in books})
+        invalidate_book_responses(book_ids, {book.author_id for book in books})
+        return Response({'created': len(books), 'ids': book_ids}, status=status.HTTP_201_CREATED)
+
+    def put(self, request, *args, **kwargs):
+        return self.bulk_update(partial=False)
+
+    def patch(self, request, *args, **kwargs):
+        return self.bulk_update(partial=True)
+
+    def bulk_update(self, partial):
+        items = self.get_items()
+        ids = [self.get_item_id(item) for item in items]
+        errors = [{'index': index, 'errors': {'id': ['A valid book id is required.']}}
+                  for index, pk in enumerate(ids) if pk is None]
+        errors += [{'index': index, 'errors': {'id': ['Each book may only appear once.']}}
+                   for index, pk in enumerate(ids) if pk is not None and pk in ids[:index]]
+        if errors:
+            return self.error_response(errors)
+
+        with transaction.atomic():
+            books = Book.objects.select_for_update().in_bulk(ids)
+            errors = [{'index': index, 'errors': {'id': ['Not found.']}}
+                      for index, pk in enumerate(ids) if pk not in books]
+            if errors:
+                return self.error_response(errors)
+            validated, errors = self.validate_items(items, partial=partial)
+            if errors:
+                return self.error_response(errors)
+
+            author_ids = set()
+            years = set()
+            fields = set()
+            for pk, attrs in zip(ids, validated):
+                book = books[pk]
+                author_ids.add(book.author_id)  # old and new author (and year) both change
+                years.add(book.publication_year)
+                for name, value in attrs.items():
+                    setattr(book, name, value)
+                author_ids.add(book.author_id)
+                years.add(book.publication_year)
+                fields.update(attrs)
+            if fields:
+                Book.objects.bulk_update(list(books.values()), sorted(fields), batch_size=self.get_batch_size())
+                search.index_books(ids)
+                if fields & {'author', 'publication_year'}:
+                    stats.refresh(author_ids, years)
+        invalidate_book_responses(ids, author_ids)
+        return Response({'updated': len(ids)})
+
+    def delete_books(self, queryset, ids):
+        """
+        Delete the books with one DELETE per batch, skipping the per-object collector
+        and its per-row signals (the index, stats and caches are synced by the caller).
+        That is only safe while nothing but DO_NOTHING relations (the search index, synced
+        by the caller) references books; otherwise the collector runs.
+        """
+        if any(rel.on_delete is not models.DO_NOTHING for rel in Book._meta.related_objects):
+            return queryset.delete()[0]
+        deleted = 0
+        batch_size = self.get_batch_size()
+        connection = connections[queryset.db]
+        quote = connection.ops.quote_name
+        sql = f'DELETE FROM {quote(Book._meta.db_table)} WHERE {quote(Book._meta.pk.column)} IN '
+        with connection.cursor() as cursor:
+            for start in range(0, len(ids), batch_size):
+                chunk = ids[start:start + batch_size]
+                cursor.execute(sql + '(' + ', '.join(['%s'] * len(chunk)) + ')', chunk)
+                deleted += cursor.rowcount
+        return deleted
+
+    def delete(self, request, *args, **kwargs):
+        items = self.get_items()
+        ids = [self.get_item_id(item) for item in items]
+        errors = [{'index': index, 'errors': {'id': ['A valid book id is required.']}}
+                  for index, pk in enumerate(ids) if pk is None]
+        if errors:
+            return self.error_response(errors)
+
+        with transaction.atomic():
+            queryset = Book.objects.filter(pk__in=ids)
+            keys = set(queryset.values_list('author_id', 'publication_year').distinct())
+            author_ids = {author_id for author_id, _ in keys}
+            deleted = self.delete_books(queryset, ids)
+            search.unindex_books(ids)
+            stats.refresh(author_ids, {year for _, year in keys})
+        invalidate_book_responses(ids, author_ids)
+        return Response({'deleted': deleted})
+
+
+# -------------------- AUTHORS --------------------
+class AuthorQuerysetMixin:
+    """
+    Loads every author's nested books with ONE extra query (prefetch_related),
+    no matter how many authors are on the page.
+
+    Supports shaping the nested books:
+        ?books_ordering=-publication_year    (title, publication_year, id; prefix "-" to reverse)
+        ?books_publication_year__gte=1950
+        ?books_publication_year__lte=1965
+        ?books_limit=3                       (at most 3 books per author, in books ordering)
+        ?books_fields=id,title               (sparse fieldset of the nested books)
+    and leaving them out: ?exclude=books (no books query at all).
+    """
+    books_ordering_fields = ['id', 'title', 'publication_year']
+    books_default_ordering = ['publication_year', 'id']
+    fast_serializer_classes = {AuthorSerializer: AuthorValuesSerializer}
+
+    def get_books_limit(self):
+        try:
+            limit = int(self.request.query_params['books_limit'])
+        except (KeyError, ValueError):
+            return None
+        return limit if limit > 0 else None
+
+    def get_books_fields(self):
+        fields = self.request.query_params.get('books_fields', '')
+        return [name.strip() for name in fields.split(',') if name.strip()] or None
+
+    def get_books_queryset(self):
+        params = self.request.query_params
+        books = Book.objects.all()
+
+        ordering = params.get('books_ordering', '')
+        if ordering.lstrip('-') in self.books_ordering_fields:
+            books = books.order_by(ordering, 'id')
+        else:
+            books = books.order_by(*self.books_default_ordering)
+
+        for lookup in ['gte', 'lte']:
+            value = params.get(f'books_publication_year__{lookup}')
+            if value is not None and value.isdigit():
+                books = books.filter(**{f'publication_year__{lookup}': int(value)})
+        return books
+
+    def get_queryset(self):
+        if 'books' not in self.get_selected_fields():
+            return Author.objects.all()
+        books = self.get_books_queryset()
+        books = books.only(*only_columns(books, select_fields(BookSerializer.Meta.fields, self.get_books_fields())),
+                           'author')
+        limit = self.get_books_limit()
+        # A sliced Prefetch: Django keeps the first `limit` books of each author (ROW_NUMBER()).
+        return Author.objects.prefetch_related(Prefetch('books', queryset=books[:limit] if limit else books))
+
+    def get_serializer(self, *args, **kwargs):
+        return super().get_serializer(*args, books_fields=self.get_books_fields(), **kwargs)
+
+    def get_serializer_context(self):
+        # AuthorValuesSerializer loads the nested books from this queryset.
+        return {
+            **super().get_serializer_context(),
+            'books': self.get_books_queryset(),
+            'books_fields': self.get_books_fields(),
+            'books_limit': self.get_books_limit(),
+        }
+
+
+# List all authors with their nested books (read-only)
+class AuthorListView(CachedResponseMixin, FieldSelectionMixin, FastReadMixin, AuthorQuerysetMixin, generics.ListAPIView):
+    """
+    Supports:
+    - Filtering:
+        ?name=Chinua Achebe
+        ?name__icontains=achebe
+        ?book_count__gte=10
+        ?latest_publication_year__gte=2000
+    - Searching:
+        ?search=achebe
+    - Ordering:
+        ?ordering=name
+        ?ordering=-id
+        ?ordering=-book_count
+        ?ordering=-latest_publication_year
+    - Sparse fieldsets: ?fields=id,name / ?exclude=books (see FieldSelectionMixin).
+    - Nested books: see AuthorQuerysetMixin.
+
+    book_count / latest_publication_year are Author columns (see api.stats), so these
+    filters and orderings use an index instead of annotating Count('books').
+    """
+    serializer_class = AuthorSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    filter_backends = [filters.DjangoFilterBackend, drf_filters.SearchFilter, drf_filters.OrderingFilter]
+    filterset_fields = {
+        'name': ['exact', 'icontains'],
+        'book_count': ['exact', 'gte', 'lte'],
+        'latest_publication_year': ['exact', 'gte', 'lte'],
+    }
+    search_fields = ['name']
+    ordering_fields = ['id', 'name', 'book_count', 'latest_publication_year']
+    ordering = ['name']
+
+    cache_dependencies = ['authors']
+
+
+# Retrieve a single author with their nested books (read-only)
+class AuthorDetailView(CachedResponseMixin, FieldSelectionMixin, FastReadMixin, AuthorQuerysetMixin,
+                       generics.RetrieveAPIView):
+    serializer_class = AuthorSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    cache_dependencies = ['author:{pk}']
+
+
+# -------------------- STATS --------------------
+# Served from the summary tables maintained by api.stats, never from a GROUP BY over books.
+class AuthorStatsListView(CachedResponseMixin, FastReadMixin, generics.ListAPIView):
+    """
+    Book statistics per author (authors without books are left out):
+        {"author": 1, "name": "Chinua Achebe", "book_count": 5, "earliest_year": 1958, "latest_year": 1987}
+
+    Supports:
+    - Ordering:
+        ?ordering=-book_count           (default: most books first)
+        ?ordering=earliest_year
+        ?ordering=-latest_year
+    - Pagination (keyset): ?page_size=100, ?cursor=<token>
+    """
+    queryset = AuthorStats.objects.filter(book_count__gt=0)
+    serializer_class = AuthorStatsSerializer
+    fast_serializer_classes = {AuthorStatsSerializer: AuthorStatsValuesSerializer}
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    filter_backends = [drf_filters.OrderingFilter]
+    ordering_fields = ['author', 'book_count', 'earliest_year', 'latest_year']
+    ordering = ['-book_count']
+
+    cache_dependencies = ['books', 'author-names']
+
+
+class AuthorStatsDetailView(CachedResponseMixin, FastReadMixin, generics.RetrieveAPIView):
+    """One author's book statistics (book_count 0 for an author without books)."""
+    queryset = AuthorStats.objects.all()
+    serializer_class = AuthorStatsSerializer
+    fast_serializer_classes = {AuthorStatsSerializer: AuthorStatsValuesSerializer}
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    lookup_field = 'author'
+    lookup_url_kwarg = 'pk'
+
+    cache_dependencies = ['author:{pk}']
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            # No stats row: the author never had a book (or does not exist).
+            author = get_object_or_404(Author.objects.values('id', 'name'), pk=self.kwargs['pk'])
+            return Response({'author': author['id'], 'name': author['name'], 'book_count': 0,
+                             'earliest_year': None, 'latest_year': None})
+
+
+class BookYearStatsView(CachedResponseMixin, generics.ListAPIView):
+    """
+    Histogram of books per publication year:
+        GET /api/stats/years/?bucket=10
+        {"bucket": 10, "total": 1204,
+         "results": [{"start": 1950, "end": 1959, "book_count": 96}, ...]}
+
+    - ?bucket=N groups N consecutive years per entry, aligned on multiples of N
+      (default 1: one entry per year; max 1000). Empty buckets are left out.
+    - Read from YearStats (one row per year), so the cost depends on the number of
+      distinct years, not on the number of books.
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = None
+    max_bucket = 1000
+
+    cache_dependencies = ['books']
+
+    def get_bucket(self):
+        try:
+            bucket = int(self.request.query_params['bucket'])
+        except (KeyError, ValueError):
+            return 1
+        return max(1, min(bucket, self.max_bucket))
+
+    def list(self, request, *args, **kwargs):
+        bucket = self.get_bucket()
+        counts = {}
+        rows = YearStats.objects.filter(book_count__gt=0).order_by('publication_year')
+        for year, book_count in rows.values_list('publication_year', 'book_count'):
+            start = year - year % bucket
+            counts[start] = counts.get(start, 0) + book_count
+        return Response({
+            'bucket': bucket,
+            'total': sum(counts.values()),
+            'results': [{'start': start, 'end': start + bucket - 1, 'book_count': book_count}
+                        for start, book_count in counts.items()],
+        })
+
+
+# -------------------- ASYNC (ASGI) READ ROUTES --------------------
+class AsyncBookFilterSet(filters.FilterSet):
+    """BookListView's filters; ?author= is a plain ID (a ModelChoiceFilter would query synchronously)."""
+    author = filters.NumberFilter(field_name='author')
+
+    class Meta:
+        model = Book
+        fields = BookListView.filterset_fields
+
+
+class AsyncBookReadView(ABC, View):
+    """
+    Base for the async Book read routes. Query building is delegated to an instance of the
+    regular DRF view (same filters, ordering, ?expand=, pagination and ValuesSerializer output);
+    only the database reads differ: they use the async ORM, so under ASGI the view itself runs
+    on the event loop instead of being handed to a worker thread.
+
+    Read-only and anonymous like the GET side of the sync views, and not response-cached.
+    """
+    http_method_names = ['get', 'head', 'options']
+    view_class = None
+    renderer = ORJSONRenderer()
+
+    def get_drf_view(self, request):
+        view = self.view_class(request=Request(request), format_kwarg=None, args=self.args, kwargs=self.kwargs)
+        view.filterset_class = AsyncBookFilterSet
+        return view
+
+    @instrumentation.timed('render')
+    def render(self, data, status_code=status.HTTP_200_OK):
+        return HttpResponse(self.renderer.render(data), status=status_code, content_type='application/json')
+
+    async def get(self, request, *args, **kwargs):
+        view = self.get_drf_view(request)
+        try:
+            if view.request.query_params.get('search'):
+                await search.afts_available(Book.objects.db)
+            data = await self.get_data(view)
+        except APIException as exc:
+            return self.render({'detail': exc.detail} if isinstance(exc.detail, str) else exc.detail, exc.status_code)
+        return self.render(data)
+
+    @abstractmethod
+    async def get_data(self, view):
+        """The response data; raise an APIException to answer with an error instead."""
+
+
+# List books asynchronously: GET /api/async/books/ (same query parameters as BookListView)
+class AsyncBookListView(AsyncBookReadView):
+    view_class = BookListView
+
+    async def get_data(self, view):
+        serializer = view.get_fast_serializer()
+        queryset = view.get_values_queryset(view.filter_queryset(view.get_queryset()), serializer)
+        paginator = view.paginator
+        page = await paginator.apaginate_queryset(queryset, view.request, view=view)
+        return paginator.get_paginated_data(serializer.serialize(page))
+
+
+# Retrieve a book asynchronously: GET /api/async/books/<pk>/ (?expand=author supported)
+class AsyncBookDetailView(AsyncBookReadView):
+    view_class = BookDetailView
+
+    async def get_data(self, view):
+        serializer = view.get_fast_serializer()
+        queryset = view.get_values_queryset(view.filter_queryset(view.get_queryset()), serializer)
+        try:
+            row = await queryset.aget(pk=self.kwargs['pk'])
+        except Book.DoesNotExist:
+            raise NotFound('No Book matches the given query.')
+        return serializer.serialize([row])[0]
+
+
+# Response cache hit/miss metrics (admins only)
+class CacheStatsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        cache = caches[RESPONSE_CACHE_ALIAS]
+        stats = cache.stats() if hasattr(cache, 'stats') else {}
+        return Response(stats)
+
+
+# Per-endpoint SQL/serializer/render totals of the sampled requests (admins only, see api.instrumentation)
+class InstrumentationStatsView(APIView):
+    """
+    GET    ?order=db_ms|total_ms|queries|serialize_ms|render_ms|requests (default db_ms) &limit=N
+    DELETE resets the totals.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get_limit(self):
+        try:
+            return max(1, int(self.request.query_params['limit']))
+        except (KeyError, ValueError):
+            return None
+
+    def get(self, request):
+        order = request.query_params.get('order')
+        if order not in instrumentation.StatsCollector.orderings:
+            order = 'db_ms'
+        return Response({
+            'sample_rate': instrumentation.get_setting('SAMPLE_RATE'),
+            'endpoints': instrumentation.stats.snapshot(order, self.get_limit()),
+        })
+
+    def delete(self, request):
+        instrumentation.stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
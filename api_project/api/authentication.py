@@ -0,0 +1,163 @@
+"""
+Token authentication without a database query per request.
+
+DRF's TokenAuthentication loads the Token and its User (one JOIN query) on
+every request. CachingTokenAuthentication remembers the result for a short
+time, in a bounded in-process LRU or, when settings.TOKEN_AUTH_CACHE names
+one, in a shared cache backend (so several worker processes share entries
+and invalidations).
+
+Entries are dropped (see api.signals) when a token is deleted or regenerated
+and when its user is saved (deactivated, made staff, renamed...) or deleted.
+Changes that send no signals (QuerySet.update(), raw SQL) are picked up when
+the entry expires, after at most TIMEOUT seconds. With the in-process cache,
+signals only reach the process that made the change, so the same bound
+applies to the other workers; use a shared cache when that is too long.
+
+Unknown or inactive tokens are never cached: they always hit the database
+and fail exactly like TokenAuthentication.
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+DEFAULTS = {
+    'TIMEOUT': 60,
+    'MAX_ENTRIES': 10000,
+    'CACHE_ALIAS': None,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'TOKEN_AUTH_CACHE', {}).get(name, DEFAULTS[name])
+
+
+class LocalTokenCache:
+    """
+    Thread-safe least-recently-used dict with per-entry expiry (get/set/delete/clear,
+    like a Django cache backend), holding at most `max_entries` tokens.
+    """
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()  # key -> (value, expires at)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            if entry[1] <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + timeout)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local_cache = None
+
+
+def get_token_cache():
+    """The shared cache backend from TOKEN_AUTH_CACHE['CACHE_ALIAS'], else the process-wide LRU."""
+    global _local_cache
+    alias = get_setting('CACHE_ALIAS')
+    if alias:
+        return caches[alias]
+    if _local_cache is None:
+        _local_cache = LocalTokenCache(get_setting('MAX_ENTRIES'))
+    return _local_cache
+
+
+def get_cache_key(token_key):
+    # Hashed, so raw tokens never appear in cache keys (or a shared cache's key space).
+    return 'auth-token:' + hashlib.sha256(token_key.encode('utf-8')).hexdigest()
+
+
+def forget_tokens(token_keys):
+    """Drop cached authentications for the given token keys."""
+    cache = get_token_cache()
+    for token_key in token_keys:
+        cache.delete(get_cache_key(token_key))
+
+
+class CachingTokenAuthentication(TokenAuthentication):
+    """
+    CachingTokenAuthentication
+    - Drop-in replacement for rest_framework.authentication.TokenAuthentication
+      (same "Authorization: Token <key>" header, same errors).
+    - A valid token costs one query per TIMEOUT seconds instead of one per request.
+    - Every request gets its own copy of the cached user, so per-request state
+      (e.g. permission caches) never leaks between requests.
+    - aauthenticate() does the same for async views (plain HttpRequest, async ORM).
+    """
+    def authenticate_credentials(self, key):
+        cached = self.get_cached(key)
+        if cached is None:
+            cached = self.remember(key, super().authenticate_credentials(key))
+        return self.copy_result(cached)
+
+    async def aauthenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) == 1:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. No credentials provided.'))
+        elif len(auth) > 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. Token string should not contain spaces.'))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(
+                _('Invalid token header. Token string should not contain invalid characters.'))
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key):
+        cached = self.get_cached(key)
+        if cached is None:
+            model = self.get_model()
+            try:
+                token = await model.objects.select_related('user').aget(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            if not token.user.is_active:
+                raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+            cached = self.remember(key, (token.user, token))
+        return self.copy_result(cached)
+
+    # -------------------- cache --------------------
+    @staticmethod
+    def get_cached(key):
+        return get_token_cache().get(get_cache_key(key))
+
+    @staticmethod
+    def remember(key, result):
+        get_token_cache().set(get_cache_key(key), result, get_setting('TIMEOUT'))
+        return result
+
+    @staticmethod
+    def copy_result(result):
+        user, token = result
+        return copy.copy(user), token
@@ -0,0 +1,117 @@
+"""
+Response caching for BookViewSet.
+
+Cached bodies are keyed on the action, URL kwargs, normalized query string,
+user class, negotiated media type and a generation counter. Saving or deleting
+a Book bumps the counter (see api.signals), so every stale entry becomes
+unreachable at once and ages out of the cache's LRU eviction; nothing is
+flushed wholesale. The key doubles as the response's ETag.
+"""
+import hashlib
+import time
+
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, urlencode
+
+RESPONSE_CACHE_ALIAS = 'default'
+GENERATION_KEY = 'generation:books'
+MODIFIED_KEY = 'modified:books'
+
+
+def get_version():
+    """(generation, last modification Unix time) of the book table."""
+    cache = caches[RESPONSE_CACHE_ALIAS]
+    found = cache.get_many([GENERATION_KEY, MODIFIED_KEY])
+    if GENERATION_KEY not in found:
+        # Start from the current time so a lost counter never repeats an old value.
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        found[GENERATION_KEY] = cache.get(GENERATION_KEY, time.time_ns())
+    if MODIFIED_KEY not in found:
+        # Unknown modification time: "now" is never too early for Last-Modified.
+        cache.add(MODIFIED_KEY, time.time(), timeout=None)
+        found[MODIFIED_KEY] = cache.get(MODIFIED_KEY, time.time())
+    return found[GENERATION_KEY], found[MODIFIED_KEY]
+
+
+def bump_generation():
+    cache = caches[RESPONSE_CACHE_ALIAS]
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        pass  # never read yet: get_version() starts a fresh one
+    cache.set(MODIFIED_KEY, time.time(), timeout=None)
+
+
+class CachedReadMixin:
+    """
+    Serve list/retrieve responses from the cache, with conditional GET:
+    - strong ETag (the cache key) and Last-Modified on every response;
+    - If-None-Match / If-Modified-Since answered with 304 before any query
+      or serialization;
+    - `X-Cache: HIT` or `X-Cache: MISS`.
+    """
+    cache_timeout = 300
+
+    def get_user_class(self, request):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return 'anon'
+        return 'staff' if user.is_staff else 'user'
+
+    def get_cache_key(self, request, generation):
+        params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+        parts = [
+            f'{type(self).__module__}.{type(self).__name__}.{self.action}',
+            request.get_host(),
+            urlencode(sorted(self.kwargs.items())),
+            urlencode(params, doseq=True),
+            self.get_user_class(request),
+            request.accepted_media_type,
+            str(generation),
+        ]
+        return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+    def cached(self, handler, request, *args, **kwargs):
+        generation, last_modified = get_version()
+        self.data_modified_at = last_modified  # see api.replicas.ReplicaReadMixin
+        digest = self.get_cache_key(request, generation)
+        etag = f'"{digest}"'
+        last_modified = int(last_modified)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            return self.add_validators(response, etag, last_modified)
+
+        cache = caches[RESPONSE_CACHE_ALIAS]
+        key = f'response:{digest}'
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Cache'] = 'HIT'
+            return self.add_validators(response, etag, last_modified)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+        response['X-Cache'] = 'MISS'
+
+        def store(rendered):
+            cache.set(key, (rendered.content, rendered['Content-Type']), self.cache_timeout)
+        response.add_post_render_callback(store)
+        return self.add_validators(response, etag, last_modified)
+
+    @staticmethod
+    def add_validators(response, etag, last_modified):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached(super().retrieve, request, *args, **kwargs)
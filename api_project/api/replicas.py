@@ -0,0 +1,39 @@
+"""
+Read replicas for BookViewSet (the router, stickiness and sync_replicas command
+are in the shared db_replicas package, see ../shared).
+
+ReplicaReadMixin: BookViewSet's list/retrieve run their queries inside
+reading_from(<a random replica>), unless a replica could miss data the client
+expects (see db_replicas.choose_replica()): the user wrote something less than
+STICKY_SECONDS ago, or a book changed less than MAX_LAG seconds ago (the last
+generation bump, see api.cache), so a response read from a replica that has not
+caught up yet is never cached under the new generation. Cache hits and 304s
+never touch a database at all; token lookups (see api.authentication) happen
+before and stay on the primary.
+"""
+from db_replicas import (  # noqa: F401 - re-exported for the views and tests
+    ReplicaRouter,
+    ReplicaStickinessMiddleware,
+    choose_replica,
+    is_sticky,
+    mark_sticky,
+    reading_from,
+    sticky_key,
+)
+
+
+class ReplicaReadMixin:
+    """
+    Run list/retrieve on a replica when it is safe (see choose_replica()). Put it
+    after CachedReadMixin, which sets data_modified_at (the last change of the
+    book table) before calling them.
+    """
+    data_modified_at = None
+
+    def list(self, request, *args, **kwargs):
+        with reading_from(choose_replica(request.user, self.data_modified_at)):
+            return super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        with reading_from(choose_replica(request.user, self.data_modified_at)):
+            return super().retrieve(request, *args, **kwargs)
@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import forget_tokens
+from .cache import bump_generation
+from .models import Book
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_book_responses(sender, using='default', **kwargs):
+    # After commit, so no request caches the old rows under the new generation.
+    transaction.on_commit(bump_generation, using=using)
+
+
+# -------------------- TOKEN AUTH CACHE --------------------
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    # Also covers users being deleted (their token is deleted with them).
+    forget_tokens([instance.key])
+
+
+@receiver(post_save, sender=get_user_model())
+def forget_user_tokens(sender, instance, created, update_fields=None, **kwargs):
+    # A login only touches last_login, which nothing reads from request.user.
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    forget_tokens(Token.objects.filter(user_id=instance.pk).values_list('key', flat=True))
@@ -1,3 +1,232 @@
-from django.test import TestCase
+import datetime
+import decimal
+import io
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from drf_orjson.renderers import ORJSONRenderer
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from api import replicas
+from api.authentication import CachingTokenAuthentication, LocalTokenCache, get_token_cache
+from api.models import Book
+from api.views import AsyncBookReadView
+
+
+class TokenAPITestCase(APITestCase):
+    """Starts from empty caches, with a user authenticated by token on self.client."""
+    def setUp(self):
+        caches["default"].clear()
+        get_token_cache().clear()
+        self.user = User.objects.create_user(username="reader", password="password123")
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.book = Book.objects.create(title="Things Fall Apart", author="Chinua Achebe")
+        self.list_url = reverse("book_all-list")
+        self.detail_url = reverse("book_all-detail", args=[self.book.id])
+
+
+class CachedReadTests(TokenAPITestCase):
+    def test_second_request_is_a_hit(self):
+        first = self.client.get(self.list_url)
+        self.assertEqual(first["X-Cache"], "MISS")
+        second = self.client.get(self.list_url)
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.content, second.content)
+
+    def test_if_none_match_returns_304_without_queries(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_last_modified_and_if_modified_since(self):
+        last_modified = self.client.get(self.list_url)["Last-Modified"]
+        response = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=http_date(0))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_write_invalidates_cached_responses(self):
+        list_etag = self.client.get(self.list_url)["ETag"]
+        detail_etag = self.client.get(self.detail_url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(self.detail_url, {"title": "Arrow of God"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["title"], "Arrow of God")
+        self.assertNotEqual(self.client.get(self.list_url)["ETag"], list_etag)
+
+    def test_generation_is_bumped_on_commit(self):
+        self.client.get(self.detail_url)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.patch(self.detail_url, {"title": "Arrow of God"}, format="json")
+            self.assertEqual(self.client.get(self.detail_url)["X-Cache"], "HIT")
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertEqual(self.client.get(self.detail_url).json()["title"], "Arrow of God")
+
+
+class ORJSONRoundTripTests(TokenAPITestCase):
+    def test_post_then_get_round_trips_through_orjson(self):
+        payload = {"title": "No Longer at Ease \u2028 é", "author": "Chinua Achebe"}
+        response = self.client.post(self.list_url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+        response = self.client.get(reverse("book_all-detail", args=[response.json()["id"]]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b"\\u2028", response.content)
+        self.assertEqual({key: response.json()[key] for key in payload}, payload)
+
+    def test_dates_and_decimals_render_like_json_renderer(self):
+        data = {
+            "published": datetime.datetime(1958, 6, 17, 9, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            "date": datetime.date(1958, 6, 17),
+            "price": decimal.Decimal("12.50"),
+        }
+        rendered = ORJSONRenderer().render(data)
+        self.assertEqual(rendered, JSONRenderer().render(data))
+        self.assertEqual(rendered, b'{"published":"1958-06-17T09:30:15.123456Z","date":"1958-06-17","price":12.5}')
+
+
+class CachingTokenAuthenticationTests(TokenAPITestCase):
+    def authenticate(self):
+        return CachingTokenAuthentication().authenticate_credentials(self.token.key)
+
+    def test_cache_hit_runs_no_queries(self):
+        self.authenticate()
+        with self.assertNumQueries(0):
+            user, token = self.authenticate()
+        self.assertEqual((user, token), (self.user, self.token))
+        self.assertIsNot(user, self.authenticate()[0])  # every request gets its own copy
+
+    def test_deleted_token_is_rejected(self):
+        self.assertEqual(self.client.get(self.list_url).status_code, status.HTTP_200_OK)
+        self.token.delete()
+        self.assertEqual(self.client.get(self.list_url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_inactive_user_is_rejected_until_reactivated(self):
+        self.assertEqual(self.client.get(self.list_url).status_code, status.HTTP_200_OK)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.list_url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.user.is_active = True
+        self.user.save()
+        self.assertEqual(self.client.get(self.list_url).status_code, status.HTTP_200_OK)
+
+    def test_login_does_not_evict(self):
+        self.authenticate()
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=["last_login"])
+        with self.assertNumQueries(0):
+            self.authenticate()
+        self.user.save()
+        with self.assertNumQueries(1):
+            self.authenticate()
+
+
+class LocalTokenCacheTests(APITestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LocalTokenCache(max_entries=2)
+        cache.set("a", 1, 60)
+        cache.set("b", 2, 60)
+        cache.get("a")
+        cache.set("c", 3, 60)
+        self.assertEqual([cache.get(key) for key in "abc"], [1, None, 3])
+
+    def test_entries_expire(self):
+        cache = LocalTokenCache(max_entries=2)
+        with mock.patch("api.authentication.time.monotonic", return_value=1000.0):
+            cache.set("a", 1, 60)
+        with mock.patch("api.authentication.time.monotonic", return_value=1059.0):
+            self.assertEqual(cache.get("a"), 1)
+        with mock.patch("api.authentication.time.monotonic", return_value=1060.0):
+            self.assertIsNone(cache.get("a"))
+
+
+class AsyncBookReadTests(TokenAPITestCase):
+    def setUp(self):
+        super().setUp()
+        Book.objects.create(title="Half of a Yellow Sun", author="Chimamanda Adichie")
+        self.headers = {"Authorization": f"Token {self.token.key}"}
+
+    async def test_async_list_matches_sync_list(self):
+        sync = await self.async_client.get(self.list_url, headers=self.headers)
+        response = await self.async_client.get(reverse("async_book_all-list"), headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), sync.json())
+
+    async def test_async_detail(self):
+        response = await self.async_client.get(reverse("async_book_all-detail", args=[self.book.id]), headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"id": self.book.id, "title": "Things Fall Apart", "author": "Chinua Achebe"})
+        response = await self.async_client.get(reverse("async_book_all-detail", args=[999999]), headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_async_errors_and_methods(self):
+        response = await self.async_client.get(reverse("async_book_all-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+        response = await self.async_client.get(reverse("async_book_all-list"), headers={"Authorization": "Token nope"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self.async_client.post(reverse("async_book_all-list"), {}, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_read_views_must_implement_get_data(self):
+        with self.assertRaises(TypeError):
+            AsyncBookReadView()
+
+
+class SeedDataTests(APITestCase):
+    def seed(self, **options):
+        call_command("seed_data", books=25, batch_size=10, stdout=io.StringIO(), **options)
+        return list(Book.objects.order_by("id").values_list("title", "author"))
+
+    def test_seed_data_is_deterministic_and_clears(self):
+        Book.objects.create(title="Things Fall Apart", author="Chinua Achebe")
+        first = self.seed(clear=True)
+        self.assertEqual(len(first), 25)
+        self.assertEqual(self.seed(clear=True), first)
+        self.assertEqual(len(self.seed()), 50)
+
+
+@override_settings(DATABASE_REPLICAS={"ALIASES": ["default"], "MAX_LAG": 0})
+class ReplicaStickinessTests(TokenAPITestCase):
+    # 'default' doubles as the replica: the tests check which alias is chosen.
+    def chosen_aliases(self, url):
+        """Aliases chosen by ReplicaReadMixin while serving GET `url`."""
+        chosen = []
+        choose_replica = replicas.choose_replica
+
+        def choose(*args):
+            chosen.append(choose_replica(*args))
+            return chosen[-1]
+
+        with mock.patch.object(replicas, "choose_replica", side_effect=choose):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        return chosen
+
+    def test_reads_stay_on_the_primary_after_a_write(self):
+        self.assertEqual(self.chosen_aliases(self.list_url), ["default"])
+        self.assertFalse(replicas.is_sticky(self.user))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.list_url, {"title": "Arrow of God", "author": "Chinua Achebe"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(caches["default"].get(replicas.sticky_key(self.user)))
+        self.assertEqual(self.chosen_aliases(self.list_url), [None])
+        self.assertEqual(self.chosen_aliases(self.detail_url), [None])
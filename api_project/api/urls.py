@@ -1,12 +1,16 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BookViewSet  # Remove BookList here
+from .views import AsyncBookDetailView, AsyncBookListView, BookViewSet  # Remove BookList here
 
 router = DefaultRouter()
 router.register(r'books_all', BookViewSet, basename='book_all')
 
 urlpatterns = [
     path('', include(router.urls)),  # Only use the router URLs here
+
+    # Async (ASGI-native) read routes, same output as books_all/ and books_all/<pk>/
+    path('async/books_all/', AsyncBookListView.as_view(), name='async_book_all-list'),
+    path('async/books_all/<int:pk>/', AsyncBookDetailView.as_view(), name='async_book_all-detail'),
 ]
 
 
@@ -1,18 +1,70 @@
-from rest_framework import viewsets
+from abc import ABC, abstractmethod
+
+from django.http import HttpResponse
+from django.views import View
+from drf_orjson.renderers import ORJSONRenderer
+from rest_framework import exceptions, viewsets
 from rest_framework.permissions import IsAuthenticated  # Import permission class
-from rest_framework.authentication import TokenAuthentication  # Import auth class
+from .authentication import CachingTokenAuthentication  # TokenAuthentication + cache
 
+from .cache import CachedReadMixin
 from .models import Book
+from .replicas import ReplicaReadMixin
 from .serializers import BookSerializer
 
-class BookViewSet(viewsets.ModelViewSet):
+class BookViewSet(CachedReadMixin, ReplicaReadMixin, viewsets.ModelViewSet):  # list/retrieve: cache, then replica
     queryset = Book.objects.all()
     serializer_class = BookSerializer
 
-    authentication_classes = [TokenAuthentication]  # Enable token auth
+    authentication_classes = [CachingTokenAuthentication]  # Enable token auth (cached lookups)
     permission_classes = [IsAuthenticated]           # Require authenticated users
 
 
+# -------------------- ASYNC (ASGI) READ ROUTES --------------------
+class AsyncBookReadView(ABC, View):
+    """
+    Async (ASGI-native) read-only variant of BookViewSet's list/retrieve:
+    - same token authentication (cached, see api.authentication) and the same JSON output;
+    - rows are read with the async ORM as BookSerializer's fields (.values()), so no model
+      instances or serializer objects are built, and under ASGI the view runs on the event
+      loop instead of a worker thread;
+    - not response-cached (use BookViewSet where repeated reads dominate).
+    """
+    http_method_names = ['get', 'head', 'options']
+    authentication = CachingTokenAuthentication()
+    renderer = ORJSONRenderer()
+    fields = BookSerializer.Meta.fields
+
+    def render(self, data, status_code=200):
+        return HttpResponse(self.renderer.render(data), status=status_code, content_type='application/json')
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            if await self.authentication.aauthenticate(request) is None:
+                raise exceptions.NotAuthenticated()
+            data = await self.get_data()
+        except exceptions.APIException as exc:
+            response = self.render({'detail': exc.detail}, exc.status_code)
+            if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                response['WWW-Authenticate'] = self.authentication.authenticate_header(request)
+            return response
+        return self.render(data)
+
+    @abstractmethod
+    async def get_data(self):
+        """The response data; raise an APIException to answer with an error instead."""
+
 
+# List books asynchronously: GET /api/async/books_all/
+class AsyncBookListView(AsyncBookReadView):
+    async def get_data(self):
+        return [row async for row in Book.objects.values(*self.fields).aiterator(chunk_size=2000)]
 
 
+# Retrieve a book asynchronously: GET /api/async/books_all/<pk>/
+class AsyncBookDetailView(AsyncBookReadView):
+    async def get_data(self):
+        try:
+            return await Book.objects.values(*self.fields).aget(pk=self.kwargs['pk'])
+        except Book.DoesNotExist:
+            raise exceptions.NotFound('No Book matches the given query.')
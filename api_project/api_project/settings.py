@@ -10,11 +10,18 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Packages shared by the projects of this repository live in ../shared.
+sys.path.append(str(BASE_DIR.parent / 'shared'))
+
+from sqlite_options import SQLITE_OPTIONS  # noqa: E402
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -42,6 +49,8 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework.authtoken',
     'api',
+    'db_replicas',  # manage.py sync_replicas
+    'sqlite_options',  # per-connection pragmas, manage.py enable_wal
 
 ]
 
@@ -51,6 +60,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'db_replicas.ReplicaStickinessMiddleware',  # read-your-writes for replica reads
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -78,13 +88,36 @@ WSGI_APPLICATION = 'api_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Concurrent-friendly SQLite on every new connection: a 20s busy timeout, BEGIN
+# IMMEDIATE transactions and a larger page cache (see ../shared/sqlite_options).
+# Run `manage.py enable_wal` once to switch db.sqlite3 to the WAL journal.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_OPTIONS,
     }
 }
 
+# Read replicas for BookViewSet (see api/replicas.py and ../shared/db_replicas).
+# API_REPLICAS=2 adds two local replicas, copies of db.sqlite3 refreshed by
+# `python manage.py sync_replicas --interval 1`.
+# Tests read the "replicas" from the test database (TEST MIRROR).
+for number in range(1, int(os.environ.get('API_REPLICAS', 0)) + 1):
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'NAME': BASE_DIR / f'db.replica{number}.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['db_replicas.ReplicaRouter']
+
+DATABASE_REPLICAS = {
+    'ALIASES': [alias for alias in DATABASES if alias != 'default'],
+    'STICKY_SECONDS': 10,   # a user's reads stay on the primary this long after a write
+    'MAX_LAG': 5,           # books changed more recently are read from the primary
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -122,6 +155,27 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Cache (BookViewSet response cache, see api/cache.py). LocMemCache evicts the
+# least recently used entries once MAX_ENTRIES is reached.
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
+# Token authentication cache (api.authentication.CachingTokenAuthentication)
+TOKEN_AUTH_CACHE = {
+    'TIMEOUT': 60,          # seconds a token is trusted without a query
+    'MAX_ENTRIES': 10000,   # size of the in-process LRU
+    'CACHE_ALIAS': None,    # e.g. 'default' with a Redis/Memcached CACHES entry, to share across workers
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -129,10 +183,20 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.CachingTokenAuthentication',  # TokenAuthentication with cached lookups
         # You can keep others if you want (e.g., SessionAuthentication)
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',  # default permission
     ],
+    # orjson-backed JSON (falls back to the stdlib json module, see drf_orjson)
+    'DEFAULT_RENDERER_CLASSES': [
+        'drf_orjson.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'drf_orjson.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
\ No newline at end of file
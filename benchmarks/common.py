@@ -0,0 +1,41 @@
+"""
+Pieces shared by the harness and the scenario modules.
+
+A scenario module (benchmarks/scenarios/<project>.py) defines:
+
+    SIZE = 10_000                 default number of rows to generate
+    def seed(size): ...           fill the fresh SQLite database
+    def endpoints(): ...          list of Endpoint objects to measure (called after seed())
+"""
+import itertools
+import math
+
+
+class Endpoint:
+    """
+    One measured operation.
+
+    - `call(i)` performs it once and returns the response (or None for non-HTTP operations);
+      `i` is unique per call, for operations that need fresh data (usernames, ids to delete...).
+    - `expect` is the status code every response must have.
+    - `setup(count)` optionally runs once, untimed, before `count` calls (e.g. to create the
+      rows a DELETE endpoint will remove).
+    """
+    _numbers = itertools.count()
+
+    def __init__(self, name, call, expect=200, setup=None):
+        self.name = name
+        self.call = call
+        self.expect = expect
+        self.setup = setup
+
+    def __call__(self):
+        return self.call(next(self._numbers))
+
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
@@ -0,0 +1,178 @@
+"""
+django_blog request latency with and without connection reuse, on PostgreSQL.
+
+    python benchmarks/connection_pooling.py                        # localhost:5432, settings' credentials
+    python benchmarks/connection_pooling.py --host 127.0.0.1 --user bench --password bench --threads 8
+    python benchmarks/connection_pooling.py --mode no-reuse --mode pool
+
+Unlike run.py this needs a PostgreSQL server: a local one is a fine stand-in for the
+production database (e.g. `docker run -p 5432:5432 -e POSTGRES_PASSWORD=bench postgres:16`),
+only the connection handshake gets cheaper than over a real network. The user must be
+allowed to create databases: every mode runs in its own process against a fresh
+test_<name> database, which is dropped afterwards.
+
+Modes, selected through the environment variables read by django_blog/settings.py:
+
+    no-reuse     BLOG_DB_CONN_MAX_AGE=0   a new connection for every request
+    persistent   (the default settings)  one connection per thread, kept between requests
+    pool         BLOG_DB_POOL=1          a psycopg pool shared by the threads (needs psycopg-pool)
+
+Requests go through Django's WSGI handler (not the test Client, which keeps connections
+open), so connections are closed or returned to the pool exactly as under a real server.
+Reports throughput, latency percentiles and how many connections were opened.
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import percentile
+from harness import load_scenario
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(HERE), 'django_blog')
+
+MODES = {
+    'no-reuse': {'BLOG_DB_CONN_MAX_AGE': '0'},
+    'persistent': {},
+    'pool': {'BLOG_DB_POOL': '1'},
+}
+PATHS = ['/', '/posts/{post_id}/']
+
+
+def run_mode(mode, args):
+    env = {key: value for key, value in os.environ.items() if not key.startswith('BLOG_DB_')}
+    env.update(MODES[mode])
+    command = [sys.executable, os.path.abspath(__file__), '--child', '--mode', mode,
+               '--requests', str(args.requests), '--threads', str(args.threads), '--size', str(args.size)]
+    for option in ('host', 'port', 'user', 'password', 'name'):
+        if getattr(args, option) is not None:
+            command += [f'--{option}', str(getattr(args, option))]
+    print(f'{mode}:', file=sys.stderr)
+    output = subprocess.run(command, env=env, check=True, stdout=subprocess.PIPE, text=True).stdout
+    return json.loads(output)
+
+
+def child(args):
+    sys.path.insert(0, PROJECT_DIR)
+    os.chdir(PROJECT_DIR)
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'django_blog.settings'
+
+    # Patch the settings module before Django reads it; CONN_MAX_AGE and the pool
+    # options stay as the settings computed them for this mode.
+    import importlib
+    settings = importlib.import_module('django_blog.settings')
+    database = settings.DATABASES['default']
+    for option in ('host', 'port', 'user', 'password', 'name'):
+        if getattr(args, option) is not None:
+            database[option.upper()] = str(getattr(args, option))
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['localhost']
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+    import django
+    django.setup()
+
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection, connections
+    from django.db.backends.signals import connection_created
+
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        scenario = load_scenario(os.path.join(HERE, 'scenarios', 'django_blog.py'))
+        scenario.seed(args.size)
+        from blog.models import Post
+        post_id = Post.objects.order_by('-id').values_list('id', flat=True)[args.size // 2]
+        connections.close_all()
+
+        opened = []
+        connection_created.connect(lambda sender, connection, **kwargs: opened.append(1), weak=False)
+        handler = WSGIHandler()
+        paths = [path.format(post_id=post_id) for path in PATHS]
+
+        def request(i):
+            status = []
+            environ = {
+                'REQUEST_METHOD': 'GET', 'PATH_INFO': paths[i % len(paths)], 'QUERY_STRING': '',
+                'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+                'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'http',
+            }
+            start = time.perf_counter()
+            response = handler(environ, lambda code, headers: status.append(code))
+            try:
+                b''.join(response)
+            finally:
+                response.close()  # request_finished: closes the connection or returns it to the pool
+            latency = (time.perf_counter() - start) * 1000
+            if not status[0].startswith('200'):
+                raise AssertionError(f'{paths[i % len(paths)]}: {status[0]}')
+            return latency
+
+        def worker(count):
+            try:
+                return [request(i) for i in range(count)]
+            finally:
+                connections.close_all()
+
+        for i in range(len(paths)):  # warm up (URL resolver, templates, pool)
+            request(i)
+        opened.clear()
+
+        per_thread = args.requests // args.threads
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            latencies = sorted(sum(executor.map(worker, [per_thread] * args.threads), []))
+        elapsed = time.perf_counter() - started
+    finally:
+        connections.close_all()
+        if connection.pool is not None:
+            connection.close_pool()  # pooled connections would block DROP DATABASE
+        connection.creation.destroy_test_db(settings.DATABASES['default']['NAME'], verbosity=0)
+
+    print(json.dumps({
+        'requests': len(latencies),
+        'threads': args.threads,
+        'throughput': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'connections': len(opened),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', action='append', choices=list(MODES), help='Mode to run (repeatable; default: all).')
+    parser.add_argument('--requests', type=int, default=1000, help='Measured requests per mode.')
+    parser.add_argument('--threads', type=int, default=1, help='Concurrent request threads.')
+    parser.add_argument('--size', type=int, default=200, help='Users to generate (10 posts each).')
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--user')
+    parser.add_argument('--password')
+    parser.add_argument('--name', help='Database name; the benchmark uses (and drops) test_<name>.')
+    parser.add_argument('--output', help='Write the results as JSON.')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args)
+
+    results = {mode: run_mode(mode, args) for mode in (args.mode or MODES)}
+    print(f"\n{'mode':<12} {'threads':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'connections':>11}")
+    for mode, stats in results.items():
+        print(f"{mode:<12} {stats['threads']:>7} {stats['throughput']:>8.1f} {stats['p50_ms']:>8.2f} "
+              f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['connections']:>11}")
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
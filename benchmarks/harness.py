@@ -0,0 +1,129 @@
+"""
+Runs the scenarios of ONE project inside its own Django process (started by run.py).
+
+Every project gets a fresh SQLite file, whatever its settings say (django_blog
+normally runs on PostgreSQL), so the suite works offline. Each endpoint is
+warmed up, then called `--requests` times; wall time, latency percentiles and
+the number of SQL queries per call are written as JSON to `--output`.
+"""
+import argparse
+import importlib
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from common import percentile
+
+
+def configure_django(project_dir, settings_module, db_path, keep_caches, real_hashers):
+    sys.path.insert(0, project_dir)
+    os.chdir(project_dir)
+    os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+
+    # Patch the settings module before Django reads it.
+    settings = importlib.import_module(settings_module)
+    settings.DATABASES = {'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': db_path}}
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['testserver', 'localhost']
+    if not keep_caches:
+        # Measure the work behind each endpoint, not response-cache hits.
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+    if not real_hashers:
+        # PBKDF2 would dominate (and blur) every register/login timing.
+        settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+    import django
+    from django.core.management import call_command
+    django.setup()
+    call_command('migrate', verbosity=0)
+
+
+def load_scenario(path):
+    spec = importlib.util.spec_from_file_location('scenario', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def measure(endpoint, requests, warmup):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    if endpoint.setup is not None:
+        endpoint.setup(requests + warmup)
+    for _ in range(warmup):
+        check(endpoint, endpoint())
+
+    latencies = []
+    queries = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = endpoint()
+            latencies.append((time.perf_counter() - start) * 1000)
+        check(endpoint, response)
+        queries.append(len(ctx.captured_queries))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': requests,
+        'throughput': round(requests / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'queries': statistics.median_high(queries),
+    }
+
+
+def check(endpoint, response):
+    if response is not None and response.status_code != endpoint.expect:
+        raise AssertionError(
+            f'{endpoint.name}: expected HTTP {endpoint.expect}, got {response.status_code}: '
+            f'{response.content[:300]!r}'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--project-dir', required=True)
+    parser.add_argument('--settings', required=True)
+    parser.add_argument('--scenario', required=True)
+    parser.add_argument('--output', required=True)
+    parser.add_argument('--requests', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--size', type=int, help='Rows to generate (default: the scenario SIZE).')
+    parser.add_argument('--only', help='Only endpoints whose name contains this text.')
+    parser.add_argument('--keep-caches', action='store_true')
+    parser.add_argument('--real-hashers', action='store_true')
+    args = parser.parse_args()
+
+    scenario_path = os.path.abspath(args.scenario)
+    output = os.path.abspath(args.output)
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_django(os.path.abspath(args.project_dir), args.settings, os.path.join(tmp, 'bench.sqlite3'),
+                         args.keep_caches, args.real_hashers)
+        scenario = load_scenario(scenario_path)
+        scenario.seed(args.size or scenario.SIZE)
+
+        results = {}
+        for endpoint in scenario.endpoints():
+            if args.only and args.only not in endpoint.name:
+                continue
+            results[endpoint.name] = measure(endpoint, args.requests, args.warmup)
+            print(f'  {endpoint.name}', file=sys.stderr)
+
+        from django.db import connections
+        connections.close_all()
+
+    with open(output, 'w') as handle:
+        json.dump(results, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Offline benchmark suite for the four Django projects in this repository.
+
+    python benchmarks/run.py                          # every project, print a table
+    python benchmarks/run.py --project django_blog --requests 100
+    python benchmarks/run.py --only "ordering=title"  # endpoints whose name contains the text
+    python benchmarks/run.py --check                  # exit 1 on regressions vs baseline.json
+    python benchmarks/run.py --update-baseline        # record the current numbers as the baseline
+    python benchmarks/run.py --output results.json    # keep the raw numbers
+
+Each project runs in its own process (two of them have an app called `api`) on a
+freshly generated SQLite database; see harness.py and scenarios/. Per endpoint it
+reports throughput (sequential requests/second), p50/p95/p99 latency and SQL
+queries per request.
+
+Regression check: an endpoint regresses when it runs more SQL queries than in the
+baseline, or when its p50 latency is more than --threshold (default 25%) AND at least
+--min-delta-ms slower. Query counts are exact; timings depend on the machine, so
+record the baseline on the machine that runs the check.
+
+Connection reuse (persistent connections vs a pool) only shows against a real
+PostgreSQL server: see connection_pooling.py. SQLite under concurrent reader and
+writer processes: see sqlite_concurrency.py.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+BASELINE = os.path.join(HERE, 'baseline.json')
+
+# name: (project directory, settings module, scenario file)
+PROJECTS = {
+    'advanced-api-project': ('advanced-api-project', 'advanced_api_project.settings', 'advanced_api_project.py'),
+    'api_project': ('api_project', 'api_project.settings', 'api_project.py'),
+    'django_blog': ('django_blog', 'django_blog.settings', 'django_blog.py'),
+    'LibraryProject': ('Introduction_to_Django/LibraryProject', 'LibraryProject.settings', 'library_project.py'),
+}
+
+
+def run_project(name, args):
+    project_dir, settings, scenario = PROJECTS[name]
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, 'results.json')
+        command = [
+            sys.executable, os.path.join(HERE, 'harness.py'),
+            '--project-dir', os.path.join(ROOT, project_dir),
+            '--settings', settings,
+            '--scenario', os.path.join(HERE, 'scenarios', scenario),
+            '--output', output,
+            '--requests', str(args.requests),
+            '--warmup', str(args.warmup),
+        ]
+        if args.size:
+            command += ['--size', str(args.size)]
+        if args.only:
+            command += ['--only', args.only]
+        if args.keep_caches:
+            command.append('--keep-caches')
+        if args.real_hashers:
+            command.append('--real-hashers')
+        print(f'{name}:', file=sys.stderr)
+        subprocess.run(command, check=True)
+        with open(output) as handle:
+            return json.load(handle)
+
+
+def print_table(results):
+    header = f"{'endpoint':<78} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>7}"
+    for project, endpoints in results.items():
+        print(f'\n{project}')
+        print(header)
+        for name, stats in endpoints.items():
+            print(f"{name[:78]:<78} {stats['throughput']:>8.1f} {stats['p50_ms']:>8.2f} "
+                  f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['queries']:>7}")
+
+
+def find_regressions(results, baseline, threshold, min_delta_ms):
+    regressions = []
+    for project, endpoints in results.items():
+        for name, stats in endpoints.items():
+            base = baseline.get(project, {}).get(name)
+            if base is None:
+                continue
+            if stats['queries'] > base['queries']:
+                regressions.append(f"{project} {name}: {base['queries']} -> {stats['queries']} queries")
+            slower = stats['p50_ms'] - base['p50_ms']
+            if slower > min_delta_ms and stats['p50_ms'] > base['p50_ms'] * (1 + threshold):
+                regressions.append(
+                    f"{project} {name}: p50 {base['p50_ms']:.2f} -> {stats['p50_ms']:.2f} ms "
+                    f"(+{slower / base['p50_ms']:.0%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--project', action='append', choices=sorted(PROJECTS),
+                        help='Project to run (repeatable; default: all).')
+    parser.add_argument('--requests', type=int, default=30, help='Measured requests per endpoint.')
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--size', type=int, help='Rows to generate (default: per scenario).')
+    parser.add_argument('--only', help='Only endpoints whose name contains this text.')
+    parser.add_argument('--keep-caches', action='store_true',
+                        help="Keep the projects' CACHES (default: DummyCache, so responses are never cache hits).")
+    parser.add_argument('--real-hashers', action='store_true',
+                        help="Keep the projects' password hashers (default: MD5, so hashing does not dominate).")
+    parser.add_argument('--output', help='Write the results as JSON.')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--check', action='store_true', help='Exit with status 1 on regressions.')
+    parser.add_argument('--threshold', type=float, default=0.25)
+    parser.add_argument('--min-delta-ms', type=float, default=0.5)
+    args = parser.parse_args()
+
+    results = {name: run_project(name, args) for name in (args.project or PROJECTS)}
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as handle:
+                baseline = json.load(handle)
+        baseline.update(results)  # projects that were not run keep their numbers
+        with open(args.baseline, 'w') as handle:
+            json.dump(baseline, handle, indent=2, sort_keys=True)
+            handle.write('\n')
+        print(f'\nBaseline written to {args.baseline}')
+
+    if args.check:
+        if not os.path.exists(args.baseline):
+            sys.exit(f'No baseline at {args.baseline}; run with --update-baseline first.')
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        regressions = find_regressions(results, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print('\nRegressions:')
+            for line in regressions:
+                print(f'  {line}')
+            sys.exit(1)
+        print('\nNo regressions.')
+
+
+if __name__ == '__main__':
+    main()
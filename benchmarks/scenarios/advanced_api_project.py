@@ -0,0 +1,71 @@
+"""
+advanced-api-project: BookListView with every filter x search x ordering combination,
+plus the detail, ?expand=author, sparse fieldset, author, export and stats endpoints.
+"""
+import itertools
+
+from django.test import Client
+
+from api import search, stats
+from api.management.commands._benchmark import seed_books
+from api.models import Book
+from common import Endpoint
+
+SIZE = 20_000
+
+
+def seed(size):
+    seed_books(size, max(1, size // 10))
+    search.rebuild_index()
+    stats.rebuild()  # seed_books sends no signals
+
+
+def endpoints():
+    client = Client()
+    book = Book.objects.order_by('id').first()
+    author = book.author
+
+    filters = [
+        '',
+        f'title={book.title}',
+        'title__icontains=00042',
+        'title__istartswith=Title 00',
+        'publication_year=1990',
+        'publication_year__gte=1950&publication_year__lte=1965',
+        f'author={author.id}',
+        f'author__name={author.name}',
+        'author__name__icontains=0004',
+        'author__name__istartswith=Author 00',
+    ]
+    searches = ['', 'search=title 00']
+    orderings = ['', 'ordering=title', 'ordering=-publication_year', 'ordering=author__name']
+
+    result = []
+    for parts in itertools.product(filters, searches, orderings):
+        query = '&'.join(part for part in parts if part)
+        path = f'/api/books/?{query}' if query else '/api/books/'
+        result.append(Endpoint(f'GET {path}', lambda i, path=path: client.get(path)))
+
+    for name, path in [
+        ('GET /api/books/?expand=author', '/api/books/?expand=author'),
+        ('GET /api/books/?fields=id,title', '/api/books/?fields=id,title'),
+        ('GET /api/books/<id>/', f'/api/books/{book.id}/'),
+        ('GET /api/books/<id>/?expand=author', f'/api/books/{book.id}/?expand=author'),
+        ('GET /api/authors/', '/api/authors/'),
+        ('GET /api/authors/?ordering=-book_count', '/api/authors/?ordering=-book_count'),
+        ('GET /api/authors/?fields=id,name,books&books_fields=id,title&books_limit=3',
+         '/api/authors/?fields=id,name,books&books_fields=id,title&books_limit=3'),
+        ('GET /api/authors/<id>/', f'/api/authors/{author.id}/'),
+        ('GET /api/books/export/csv/?author=<id>', f'/api/books/export/csv/?author={author.id}'),
+        ('GET /api/stats/authors/', '/api/stats/authors/'),
+        ('GET /api/stats/authors/<id>/', f'/api/stats/authors/{author.id}/'),
+        ('GET /api/stats/years/?bucket=10', '/api/stats/years/?bucket=10'),
+    ]:
+        result.append(Endpoint(name, lambda i, path=path: consume(client.get(path))))
+    return result
+
+
+def consume(response):
+    if response.streaming:
+        b''.join(response.streaming_content)
+    return response
@@ -0,0 +1,46 @@
+"""
+api_project: BookViewSet CRUD (list, retrieve, create, update, partial update, delete)
+with token authentication.
+"""
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from api.models import Book
+from common import Endpoint
+
+SIZE = 1_000
+
+
+def seed(size):
+    Book.objects.bulk_create(
+        [Book(title=f'Title {i:06d}', author=f'Author {i % 97:03d}') for i in range(size)],
+        batch_size=5000,
+    )
+
+
+def endpoints():
+    user = User.objects.create_user('bench', password='bench-password')
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+    book = Book.objects.order_by('id').first()
+    detail = f'/api/books_all/{book.id}/'
+    doomed = []
+
+    def create_doomed(count):
+        doomed.extend(book.id for book in Book.objects.bulk_create(
+            [Book(title=f'Doomed {i}', author='Nobody') for i in range(count)]
+        ))
+
+    return [
+        Endpoint('GET /api/books_all/', lambda i: client.get('/api/books_all/')),
+        Endpoint('GET /api/books_all/<id>/', lambda i: client.get(detail)),
+        Endpoint('POST /api/books_all/', lambda i: client.post(
+            '/api/books_all/', {'title': f'New {i}', 'author': 'Bench'}, format='json'), expect=201),
+        Endpoint('PUT /api/books_all/<id>/', lambda i: client.put(
+            detail, {'title': f'Put {i}', 'author': 'Bench'}, format='json')),
+        Endpoint('PATCH /api/books_all/<id>/', lambda i: client.patch(detail, {'title': f'Patch {i}'}, format='json')),
+        Endpoint('DELETE /api/books_all/<id>/', lambda i: client.delete(f'/api/books_all/{doomed.pop()}/'),
+                 expect=204, setup=create_doomed),
+        Endpoint('GET /api/books_all/ (no token)', lambda i: APIClient().get('/api/books_all/'), expect=401),
+    ]
@@ -0,0 +1,64 @@
+"""
+django_blog: the accounts flows (register, login_view, profile) and the blog
+pages (feed, keyset-paginated older pages, post detail, author archive).
+
+Without --keep-caches the blog's fragment cache is a DummyCache, so these numbers
+are the cost of a cache miss.
+"""
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import Client
+from django.utils import timezone
+
+from blog.models import Post
+from blog.pagination import encode_cursor
+from common import Endpoint
+
+SIZE = 1_000
+POSTS_PER_USER = 10
+PASSWORD = 'Bench-password-123'
+
+
+def seed(size):
+    User.objects.bulk_create([User(username=f'reader{i}', password='!') for i in range(size)], batch_size=5000)
+    User.objects.create_user('bench', password=PASSWORD)
+    user_ids = list(User.objects.filter(username__startswith='reader').values_list('id', flat=True))
+    now = timezone.now()
+    Post.objects.bulk_create([
+        Post(title=f'Post {i}', content='Lorem ipsum dolor sit amet. ' * 40, author_id=user_ids[i % len(user_ids)],
+             published_date=now - datetime.timedelta(minutes=i))
+        for i in range(size * POSTS_PER_USER)
+    ], batch_size=5000)
+
+
+def endpoints():
+    anonymous = Client()
+    logged_in = Client()
+    logged_in.login(username='bench', password=PASSWORD)
+
+    def register(i):
+        return Client().post('/accounts/register/', {
+            'username': f'new{i}', 'password1': PASSWORD, 'password2': PASSWORD,
+        })
+
+    def login(i):
+        return Client().post('/accounts/login/', {'username': 'bench', 'password': PASSWORD})
+
+    middle = Post.objects.order_by('-published_date', '-id')[Post.objects.count() // 2]
+    post_id = middle.pk
+    older = f'/?cursor={encode_cursor(middle)}'
+
+    return [
+        Endpoint('GET /accounts/register/', lambda i: anonymous.get('/accounts/register/')),
+        Endpoint('POST /accounts/register/', register, expect=302),
+        Endpoint('GET /accounts/login/', lambda i: anonymous.get('/accounts/login/')),
+        Endpoint('POST /accounts/login/', login, expect=302),
+        Endpoint('POST /accounts/login/ (wrong password)', lambda i: anonymous.post(
+            '/accounts/login/', {'username': 'bench', 'password': 'wrong'})),
+        Endpoint('GET /accounts/profile/', lambda i: logged_in.get('/accounts/profile/')),
+        Endpoint('GET /', lambda i: anonymous.get('/')),
+        Endpoint('GET /?cursor=<middle of the feed>', lambda i: anonymous.get(older)),
+        Endpoint('GET /posts/<id>/', lambda i: anonymous.get(f'/posts/{post_id}/')),
+        Endpoint('GET /authors/<username>/', lambda i: anonymous.get('/authors/reader1/')),
+    ]
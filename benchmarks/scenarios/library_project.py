@@ -0,0 +1,39 @@
+"""
+LibraryProject: bookshelf has no views yet, so this measures the ORM operations
+documented in create.md / retrieve.md / update.md / delete.md.
+"""
+from bookshelf.models import Book
+from common import Endpoint
+
+SIZE = 10_000
+
+
+def seed(size):
+    Book.objects.bulk_create(
+        [Book(title=f'Title {i:06d}', author=f'Author {i % 97:03d}', publication_year=1900 + i % 125)
+         for i in range(size)],
+        batch_size=5000,
+    )
+
+
+def endpoints():
+    book = Book.objects.order_by('id').first()
+    doomed = []
+
+    def create_doomed(count):
+        doomed.extend(Book.objects.bulk_create(
+            [Book(title=f'Doomed {i}', author='Nobody', publication_year=2000) for i in range(count)]
+        ))
+
+    def update(i):
+        book.title = f'Updated {i}'
+        book.save()
+
+    return [
+        Endpoint('create', lambda i: Book.objects.create(title=f'New {i}', author='Bench', publication_year=2024) and None),
+        Endpoint('retrieve by pk', lambda i: Book.objects.get(pk=book.pk) and None),
+        Endpoint('retrieve by title', lambda i: Book.objects.get(title='Title 000042') and None),
+        Endpoint('filter by author (list)', lambda i: list(Book.objects.filter(author='Author 042')) and None),
+        Endpoint('update', update),
+        Endpoint('delete', lambda i: doomed.pop().delete() and None, setup=create_doomed),
+    ]
@@ -0,0 +1,188 @@
+"""
+SQLite under concurrent workers: parallel readers of BookListView while writers
+POST to BookCreateView (advanced-api-project), default vs tuned SQLite settings.
+
+    python benchmarks/sqlite_concurrency.py
+    python benchmarks/sqlite_concurrency.py --readers 8 --writers 2 --duration 10
+    python benchmarks/sqlite_concurrency.py --mode tuned
+
+Every reader and writer is its own process, like gunicorn workers, all sharing one
+fresh SQLite file for --duration seconds. Modes:
+
+    default   no OPTIONS, rollback journal: readers wait while a write commits, writers
+              that cannot get the lock within sqlite3's 5s default fail ("database is locked")
+    tuned     the project's DATABASES OPTIONS (busy timeout, BEGIN IMMEDIATE, plus mmap and
+              page cache from the sqlite_options app; see advanced_api_project/settings.py)
+              and a WAL journal with synchronous=NORMAL, as after `manage.py enable_wal`
+
+Reports requests/second, p50/p95/p99 latency and failed requests per role. Caches are
+replaced by a DummyCache, so every read reaches the database.
+"""
+import argparse
+import base64
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import percentile
+from harness import load_scenario
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(os.path.dirname(HERE), 'advanced-api-project')
+SCENARIO = os.path.join(HERE, 'scenarios', 'advanced_api_project.py')
+
+MODES = ['default', 'tuned']
+USERNAME = 'writer'
+PASSWORD = 'Bench-password-123'
+READ_PATHS = ['/api/books/', '/api/books/?ordering=-publication_year', '/api/books/?search=title 00']
+
+
+def configure_django(db_path, mode):
+    sys.path.insert(0, PROJECT_DIR)
+    os.chdir(PROJECT_DIR)
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'advanced_api_project.settings'
+
+    import importlib
+    settings = importlib.import_module('advanced_api_project.settings')
+    options = settings.DATABASES['default'].get('OPTIONS', {}) if mode == 'tuned' else {}
+    settings.DATABASES = {'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': db_path, 'OPTIONS': options}}
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['testserver', 'localhost']
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+    settings.INSTRUMENTATION = {**getattr(settings, 'INSTRUMENTATION', {}), 'SAMPLE_RATE': 0.0}
+
+    import django
+    django.setup()
+
+
+def setup(args):
+    """Migrate and seed the database (once per mode, before the workers start)."""
+    configure_django(args.db, args.mode)
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.db import connection
+
+    call_command('migrate', verbosity=0)
+    load_scenario(SCENARIO).seed(args.size)
+    User.objects.create_user(USERNAME, password=PASSWORD)
+    if args.mode == 'tuned':
+        from sqlite_options import enable_wal
+        enable_wal(connection)  # the journal mode is stored in the file (manage.py enable_wal)
+
+
+def worker(args):
+    configure_django(args.db, args.mode)
+    from django.db import connections
+    from django.test import Client
+
+    client = Client()
+    authorization = 'Basic ' + base64.b64encode(f'{USERNAME}:{PASSWORD}'.encode()).decode()
+    latencies, errors = [], 0
+    client.get(READ_PATHS[0])  # warm up (imports, URL resolver, first connection)
+    time.sleep(max(0.0, args.start_at - time.time()))
+    deadline = args.start_at + args.duration
+    i = 0
+    while time.time() < deadline:
+        start = time.perf_counter()
+        try:
+            if args.role == 'reader':
+                response = client.get(READ_PATHS[i % len(READ_PATHS)])
+                ok = response.status_code == 200
+            else:
+                response = client.post('/api/books/create/', {
+                    'title': f'Concurrent {args.worker}-{i}', 'publication_year': 2000,
+                    'author': args.author_id,
+                }, HTTP_AUTHORIZATION=authorization)
+                ok = response.status_code == 201
+        except Exception:  # "database is locked" surfaces as OperationalError
+            ok = False
+            connections.close_all()
+        if ok:
+            latencies.append((time.perf_counter() - start) * 1000)
+        else:
+            errors += 1
+        i += 1
+    print(json.dumps({'latencies': latencies, 'errors': errors}))
+
+
+def run_mode(mode, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, 'concurrency.sqlite3')
+        base = [sys.executable, os.path.abspath(__file__), '--mode', mode, '--db', db]
+        print(f'{mode}: seeding', file=sys.stderr)
+        subprocess.run(base + ['--role', 'setup', '--size', str(args.size)], check=True)
+
+        import sqlite3
+        with sqlite3.connect(db) as conn:
+            author_id = conn.execute('SELECT MIN(id) FROM api_author').fetchone()[0]
+
+        start_at = time.time() + 3  # time for every process to import Django
+        processes = []
+        for role, count in (('reader', args.readers), ('writer', args.writers)):
+            for number in range(count):
+                command = base + ['--role', role, '--worker', str(number), '--author-id', str(author_id),
+                                  '--start-at', str(start_at), '--duration', str(args.duration)]
+                processes.append((role, subprocess.Popen(command, stdout=subprocess.PIPE, text=True)))
+        print(f'{mode}: {args.readers} readers, {args.writers} writers for {args.duration}s', file=sys.stderr)
+
+        results = {}
+        for role, process in processes:
+            output, _ = process.communicate()
+            if process.returncode:
+                raise SystemExit(f'{mode} {role} exited with status {process.returncode}')
+            data = json.loads(output)
+            merged = results.setdefault(role, {'latencies': [], 'errors': 0})
+            merged['latencies'] += data['latencies']
+            merged['errors'] += data['errors']
+
+    summary = {}
+    for role, data in results.items():
+        latencies = sorted(data['latencies'])
+        summary[role] = {
+            'requests': len(latencies),
+            'throughput': round(len(latencies) / args.duration, 1),
+            'p50_ms': round(percentile(latencies, 50) or 0, 3),
+            'p95_ms': round(percentile(latencies, 95) or 0, 3),
+            'p99_ms': round(percentile(latencies, 99) or 0, 3),
+            'errors': data['errors'],
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', action='append', choices=MODES, help='Mode to run (repeatable; default: both).')
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=1)
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds of load per mode.')
+    parser.add_argument('--size', type=int, default=20_000, help='Books to generate.')
+    parser.add_argument('--output', help='Write the results as JSON.')
+    # Used by the worker processes.
+    parser.add_argument('--role', choices=['setup', 'reader', 'writer'], help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    parser.add_argument('--worker', type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument('--author-id', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--start-at', type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.role:
+        args.mode = args.mode[0]
+        return setup(args) if args.role == 'setup' else worker(args)
+    results = {mode: run_mode(mode, args) for mode in (args.mode or MODES)}
+
+    print(f"\n{'mode':<8} {'role':<7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for mode, roles in results.items():
+        for role, stats in roles.items():
+            print(f"{mode:<8} {role:<7} {stats['throughput']:>8.1f} {stats['p50_ms']:>8.2f} "
+                  f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['errors']:>7}")
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,5 +5,5 @@ class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
 
-def ready(self):
-  from . import signals
\ No newline at end of file
+    def ready(self):
+        from . import signals  # noqa: F401  (create a Profile for every new user)
@@ -0,0 +1,200 @@
+"""
+Avatar upload pipeline.
+
+1. Upload: AvatarUploadHandler streams the file to a temporary file on disk
+   (never into memory), hashing it on the way and rejecting it once it grows
+   past MAX_UPLOAD_SIZE.
+2. Store: store_avatar() saves the original under its content hash,
+   avatars/<hh>/<sha256>.<ext> (for a temporary file that is a rename, not a
+   copy). Identical uploads share one file.
+3. Thumbnails: after the transaction commits, generate_thumbnails() runs in a
+   small thread pool (Pillow releases the GIL while decoding, resizing and
+   encoding) and writes square, re-encoded versions next to the original:
+   avatars/<hh>/<sha256>.<size>.<webp|jpg>.
+
+Every file name is derived from the original's content, so a name never points
+to different bytes: serve MEDIA_URL + "avatars/" with
+"Cache-Control: public, max-age=31536000, immutable".
+
+Until the thumbnails exist (or when a worker failed, see
+`manage.py rebuild_avatar_thumbnails`), avatar_urls() falls back to the original.
+
+Settings (settings.AVATARS, every key optional):
+
+    SIZES            thumbnail edge lengths in pixels (default (64, 128, 256))
+    FORMAT           'WEBP' or 'JPEG' (default 'WEBP')
+    QUALITY          encoder quality (default 82)
+    MAX_UPLOAD_SIZE  bytes (default 5 MiB)
+    MAX_PIXELS       larger images are not thumbnailed (default 40 million)
+    WORKERS          thumbnail threads; 0 generates them inline (default 2)
+"""
+import hashlib
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+from django.db import transaction
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'SIZES': (64, 128, 256),
+    'FORMAT': 'WEBP',
+    'QUALITY': 82,
+    'MAX_UPLOAD_SIZE': 5 * 1024 * 1024,
+    'MAX_PIXELS': 40_000_000,
+    'WORKERS': 2,
+}
+EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'GIF': 'gif', 'WEBP': 'webp'}
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def get_setting(name):
+    return getattr(settings, 'AVATARS', {}).get(name, DEFAULTS[name])
+
+
+# -------------------- upload --------------------
+class AvatarUploadHandler(TemporaryFileUploadHandler):
+    """
+    TemporaryFileUploadHandler that also computes the file's SHA-256 while it is
+    received (uploaded_file.content_hash) and skips files larger than MAX_UPLOAD_SIZE
+    (too_large is then True).
+    """
+    too_large = False
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hash = hashlib.sha256()
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > get_setting('MAX_UPLOAD_SIZE'):
+            self.too_large = True
+            raise SkipFile()
+        self.hash.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        uploaded_file.content_hash = self.hash.hexdigest()
+        return uploaded_file
+
+
+def content_hash(uploaded_file):
+    """SHA-256 of the file: the one computed during the upload, else read in chunks."""
+    digest = getattr(uploaded_file, 'content_hash', None)
+    if digest is None:
+        hasher = hashlib.sha256()
+        for chunk in uploaded_file.chunks(HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+        digest = hasher.hexdigest()
+    uploaded_file.seek(0)
+    return digest
+
+
+# -------------------- storage --------------------
+def thumbnail_name(name, size):
+    root, _ = os.path.splitext(name)
+    return f"{root}.{size}.{EXTENSIONS[get_setting('FORMAT')]}"
+
+
+def store_avatar(profile, uploaded_file):
+    """
+    Save `uploaded_file` (already validated as an image, e.g. by ProfileUpdateForm) as the
+    profile's avatar under its content hash, and queue its thumbnails. Call it in place of
+    assigning the file to profile.avatar; the caller saves the profile.
+    """
+    digest = content_hash(uploaded_file)
+    image = getattr(uploaded_file, 'image', None)  # set by forms.ImageField
+    extension = EXTENSIONS.get(getattr(image, 'format', None)) or os.path.splitext(uploaded_file.name)[1][1:].lower()
+    name = f"avatars/{digest[:2]}/{digest}.{extension}"
+    if not default_storage.exists(name):
+        name = default_storage.save(name, uploaded_file)
+    profile.avatar = name
+    transaction.on_commit(lambda: queue_thumbnails(name))
+    return name
+
+
+def avatar_urls(profile):
+    """{size: URL} of the profile's avatar thumbnails (the original's URL until they exist); {} without avatar."""
+    if not profile.avatar:
+        return {}
+    sizes = sorted(get_setting('SIZES'))
+    # Thumbnails are written largest first, so the smallest one existing means all do.
+    if sizes and default_storage.exists(thumbnail_name(profile.avatar.name, sizes[0])):
+        return {size: default_storage.url(thumbnail_name(profile.avatar.name, size)) for size in sizes}
+    return {size: profile.avatar.url for size in sizes}
+
+
+# -------------------- thumbnails --------------------
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def queue_thumbnails(name):
+    """Generate the thumbnails of `name` in the worker pool (inline when WORKERS is 0)."""
+    global _executor
+    workers = get_setting('WORKERS')
+    if not workers:
+        return generate_thumbnails(name)
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='avatar-thumbnails')
+    _executor.submit(_generate_thumbnails_logged, name)
+
+
+def _generate_thumbnails_logged(name):
+    try:
+        generate_thumbnails(name)
+    except Exception:
+        logger.exception("Could not generate thumbnails for %s", name)
+
+
+def generate_thumbnails(name, force=False):
+    """
+    Write the square thumbnails of the stored image `name`. Returns the names written
+    (existing thumbnails are kept unless `force`).
+    """
+    sizes = sorted(get_setting('SIZES'), reverse=True)
+    todo = [size for size in sizes if force or not default_storage.exists(thumbnail_name(name, size))]
+    if not todo:
+        return []
+
+    image_format = get_setting('FORMAT')
+    with default_storage.open(name, 'rb') as source, Image.open(source) as image:
+        if image.width * image.height > get_setting('MAX_PIXELS'):
+            raise ValueError(f"{name} is too large to thumbnail ({image.width}x{image.height}).")
+        # JPEG only: decode at a reduced scale that is still >= the largest size (much less memory and time).
+        image.draft('RGB', (sizes[0], sizes[0]))
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ('RGBA', 'LA', 'PA', 'P'):
+            image = image.convert('RGBA')
+            if image_format != 'WEBP':  # JPEG has no alpha: flatten onto white
+                background = Image.new('RGBA', image.size, 'white')
+                image = Image.alpha_composite(background, image)
+        if image.mode != 'RGBA' or image_format != 'WEBP':
+            image = image.convert('RGB')
+
+        written = []
+        for size in sizes:  # largest first, each one resized from the previous one
+            image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            if size not in todo:
+                continue
+            buffer = io.BytesIO()
+            if image_format == 'WEBP':
+                image.save(buffer, 'WEBP', quality=get_setting('QUALITY'), method=4)
+            else:
+                image.save(buffer, 'JPEG', quality=get_setting('QUALITY'), optimize=True, progressive=True)
+            target = thumbnail_name(name, size)
+            if default_storage.exists(target):
+                default_storage.delete(target)
+            written.append(default_storage.save(target, ContentFile(buffer.getvalue())))
+    return written
@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from accounts.profiles import BATCH_SIZE, create_missing_profiles
+
+
+class Command(BaseCommand):
+    """
+    Create the missing Profile of every user that has none: users imported with
+    bulk_create() or raw SQL, or created before the profile signal was connected.
+
+        python manage.py backfill_profiles
+        python manage.py backfill_profiles --dry-run
+
+    Batched (one SELECT and one INSERT per --batch-size users) and safe to re-run.
+    """
+    help = "Create profiles for users that do not have one."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Only count the users without a profile.')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            missing = get_user_model()._base_manager.using(options['database']).filter(profile__isnull=True).count()
+            self.stdout.write(f"{missing} users have no profile.")
+            return
+        created = create_missing_profiles(options['database'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Created {created} profiles."))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from accounts.avatars import generate_thumbnails
+from accounts.models import Profile
+
+
+class Command(BaseCommand):
+    """
+    Generate missing avatar thumbnails (e.g. after a worker failed or the process stopped
+    before the queue was drained), or all of them with --force (after changing
+    settings.AVATARS['SIZES'] / ['FORMAT']).
+
+        python manage.py rebuild_avatar_thumbnails
+    """
+    help = "Generate missing avatar thumbnails."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate existing thumbnails too.')
+
+    def handle(self, *args, **options):
+        names = Profile.objects.exclude(avatar='').exclude(avatar=None).values_list('avatar', flat=True).distinct()
+        written = failed = 0
+        for name in names.iterator():
+            try:
+                written += len(generate_thumbnails(name, force=options['force']))
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"{name}: {exc}")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} thumbnails ({failed} images failed)."))
@@ -5,10 +5,9 @@ from django.contrib.auth.models import User
 class Profile(models.Model):
      user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
      bio = models.TextField(blank=True)
+     # Content-hashed name (avatars/<hh>/<sha256>.<ext>) plus thumbnails, see accounts.avatars.
      avatar = models.ImageField(upload_to='avatars/', blank=True, null=True)
      updated_at = models.DateTimeField(auto_now=True)
 
-
-def __str__(self):
-     return f"Profile({self.user.username})"
-
+     def __str__(self):
+          return f"Profile({self.user.username})"
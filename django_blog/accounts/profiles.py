@@ -0,0 +1,71 @@
+"""
+Profile provisioning.
+
+Every user gets exactly one Profile. Saving a new user through the ORM creates it
+(see accounts.signals); later saves (logins updating last_login, profile edits...)
+no longer touch the profile table at all.
+
+bulk_create() and raw SQL send no signals, so:
+- bulk_create_users() creates users and their profiles in two batched INSERTs;
+- create_missing_profiles() (and `manage.py backfill_profiles`) creates the
+  profiles of users that have none, e.g. users imported in bulk or created
+  before the signal was connected;
+- get_profile() returns a user's profile, creating it if it is still missing.
+
+Batches are inserted with ignore_conflicts (Profile.user is unique), so a
+profile created concurrently by another process is simply kept.
+"""
+from django.contrib.auth import get_user_model
+
+from .models import Profile
+
+BATCH_SIZE = 1000
+
+
+def create_profiles(user_ids, using='default', batch_size=BATCH_SIZE):
+    """Create a Profile for each of `user_ids` that has none (one INSERT per batch)."""
+    Profile.objects.using(using).bulk_create(
+        [Profile(user_id=user_id) for user_id in user_ids],
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+
+
+def create_missing_profiles(using='default', batch_size=BATCH_SIZE):
+    """
+    Create the profiles of every user that has none, in batches of `batch_size` users
+    (walking the user table by primary key). Returns the number of users that had none.
+    """
+    users = get_user_model()._base_manager.using(using).filter(profile__isnull=True).order_by('pk')
+    created = 0
+    last_pk = None
+    while True:
+        batch = users if last_pk is None else users.filter(pk__gt=last_pk)
+        user_ids = list(batch.values_list('pk', flat=True)[:batch_size])
+        if not user_ids:
+            return created
+        create_profiles(user_ids, using, batch_size)
+        created += len(user_ids)
+        last_pk = user_ids[-1]
+
+
+def bulk_create_users(users, using='default', batch_size=BATCH_SIZE, **kwargs):
+    """
+    User.objects.bulk_create() that also creates the users' profiles.
+
+    Needs a backend that sets primary keys on bulk-created objects (PostgreSQL,
+    SQLite, MariaDB 10.5+); elsewhere run create_missing_profiles() afterwards.
+    """
+    users = get_user_model().objects.using(using).bulk_create(users, batch_size=batch_size, **kwargs)
+    create_profiles([user.pk for user in users if user.pk is not None], using, batch_size)
+    return users
+
+
+def get_profile(user):
+    """The user's Profile, created on first access if the user has none yet."""
+    try:
+        return user.profile
+    except Profile.DoesNotExist:
+        profile, _ = Profile.objects.get_or_create(user=user)
+        user.profile = profile
+        return profile
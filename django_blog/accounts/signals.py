@@ -1,19 +1,14 @@
 from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+
 from .models import Profile
 
 
 @receiver(post_save, sender=User)
-def create_or_update_user_profile(sender, instance, created, **kwargs):
- if created:
-       Profile.objects.create(user=instance)
- else:
-# Ensure a Profile always exists
-        Profile.objects.get_or_create(user=instance)
-
-
-
-
-
-
+def create_user_profile(sender, instance, created, raw=False, using='default', **kwargs):
+    # Only new users need a profile: later saves (e.g. login() updating last_login)
+    # cost no query here. Fixtures (raw) bring their own profiles. Users created
+    # without signals are covered by accounts.profiles.
+    if created and not raw:
+        Profile.objects.using(using).create(user=instance)
@@ -1,3 +1,119 @@
-from django.test import TestCase
+import hashlib
+import io
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from . import avatars
+from .models import Profile
+from .profiles import bulk_create_users, create_missing_profiles
+
+
+class ProfileProvisioningTests(TestCase):
+    def test_profile_created_with_the_user_only(self):
+        with self.assertNumQueries(2):  # the user and its profile
+            user = User.objects.create_user(username="reader", password="password123")
+        self.assertTrue(Profile.objects.filter(user=user).exists())
+        user.first_name = "Ada"
+        with self.assertNumQueries(1):  # later saves leave the profile table alone
+            user.save()
+
+    def test_bulk_create_users_creates_profiles(self):
+        users = bulk_create_users([User(username=f"reader{i}") for i in range(5)], batch_size=2)
+        self.assertEqual(Profile.objects.filter(user__in=users).count(), 5)
+
+    def test_backfill_fills_gaps_and_is_idempotent(self):
+        users = User.objects.bulk_create([User(username=f"reader{i}") for i in range(5)])
+        Profile.objects.create(user=users[2])
+        self.assertEqual(create_missing_profiles(batch_size=2), 4)
+        self.assertEqual(create_missing_profiles(batch_size=2), 0)
+        self.assertEqual(Profile.objects.count(), 5)
+
+        User.objects.bulk_create([User(username="imported")])
+        out = io.StringIO()
+        call_command("backfill_profiles", "--dry-run", stdout=out)
+        self.assertIn("1 users have no profile.", out.getvalue())
+        call_command("backfill_profiles", stdout=out)
+        call_command("backfill_profiles", stdout=out)
+        self.assertEqual(out.getvalue().splitlines()[1:], ["Created 1 profiles.", "Created 0 profiles."])
+        self.assertEqual(Profile.objects.count(), 6)
+
+
+class AccountViewQueryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="reader", password="password123")
+
+    def test_login_query_count(self):
+        # User lookup, session insert/update (with savepoints) and last_login: no profile query.
+        with self.assertNumQueries(9):
+            response = self.client.post(reverse("login"), {"username": "reader", "password": "password123"})
+        self.assertRedirects(response, reverse("profile"), fetch_redirect_response=False)
+
+    def test_profile_page_query_count(self):
+        self.client.force_login(self.user)
+        with self.assertNumQueries(3):  # session, user, profile
+            response = self.client.get(reverse("profile"))
+        self.assertEqual(response.status_code, 200)
+
+
+AVATARS = {"SIZES": (32, 64), "FORMAT": "WEBP", "MAX_UPLOAD_SIZE": 1024 * 1024, "WORKERS": 0}
+
+
+@override_settings(AVATARS=AVATARS)
+class AvatarUploadTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.user = User.objects.create_user(username="reader", password="password123")
+        self.client.force_login(self.user)
+
+    @staticmethod
+    def png(size=(120, 80), color="teal"):
+        buffer = io.BytesIO()
+        Image.new("RGB", size, color).save(buffer, "PNG")
+        return buffer.getvalue()
+
+    def upload(self, content, client=None):
+        data = {"bio": "Reader", "avatar": SimpleUploadedFile("me.png", content, content_type="image/png")}
+        with self.captureOnCommitCallbacks(execute=True):
+            return (client or self.client).post(reverse("profile"), data)
+
+    def test_avatar_is_stored_under_its_hash_with_thumbnails(self):
+        content = self.png()
+        response = self.upload(content)
+        self.assertRedirects(response, reverse("profile"), fetch_redirect_response=False)
+
+        digest = hashlib.sha256(content).hexdigest()
+        name = Profile.objects.get(user=self.user).avatar.name
+        self.assertEqual(name, f"avatars/{digest[:2]}/{digest}.png")
+        for size in AVATARS["SIZES"]:  # WORKERS=0: generated before the response
+            with default_storage.open(avatars.thumbnail_name(name, size)) as thumbnail, Image.open(thumbnail) as image:
+                self.assertEqual((image.format, image.size), ("WEBP", (size, size)))
+        self.assertIn(".32.webp", self.client.get(reverse("profile")).content.decode())
+
+        # The same bytes again reuse the stored file.
+        self.upload(content)
+        self.assertEqual(default_storage.listdir(f"avatars/{digest[:2]}")[1].count(f"{digest}.png"), 1)
+
+    def test_upload_above_the_size_limit_is_rejected(self):
+        response = self.upload(self.png() + b"\0" * AVATARS["MAX_UPLOAD_SIZE"])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("The image must be smaller than 1 MB.", response.content.decode())
+        self.assertFalse(Profile.objects.get(user=self.user).avatar)
+
+    def test_post_requires_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        response = self.upload(self.png(), client=client)
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Profile.objects.get(user=self.user).avatar)
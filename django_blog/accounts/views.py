@@ -1,18 +1,53 @@
 from django.shortcuts import render, redirect
+from django.contrib import messages
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import render, redirect
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from . import avatars
+from .forms import ProfileUpdateForm, UserUpdateForm
+from .profiles import get_profile
 
+
+@csrf_exempt  # CSRF is checked by _profile(), after the upload handlers are swapped
 @login_required
 def profile(request):
     if request.method == "POST":
-        request.user.first_name = request.POST.get("first_name", request.user.first_name)
-        request.user.last_name = request.POST.get("last_name", request.user.last_name)
-        request.user.email = request.POST.get("email", request.user.email)
-        request.user.save()
-        return redirect("profile")
-    return render(request, "accounts/profile.html")
+        # Stream uploads to a temporary file (hashed on the way), never into memory.
+        # Must happen before anything reads request.POST / request.FILES.
+        request.upload_handlers = [avatars.AvatarUploadHandler(request)]
+    return _profile(request)
+
+
+@csrf_protect
+def _profile(request):
+    profile = get_profile(request.user)
+    user_form = UserUpdateForm(instance=request.user)
+    profile_form = ProfileUpdateForm(instance=profile)
+    if request.method == "POST":
+        user_form = UserUpdateForm(request.POST, instance=request.user)
+        profile_form = ProfileUpdateForm(request.POST, request.FILES, instance=profile)
+        if any(getattr(handler, "too_large", False) for handler in request.upload_handlers):
+            limit = avatars.get_setting("MAX_UPLOAD_SIZE") // (1024 * 1024)
+            profile_form.add_error("avatar", f"The image must be smaller than {limit} MB.")
+        if user_form.is_valid() and profile_form.is_valid():
+            user_form.save()
+            upload = request.FILES.get("avatar")
+            profile = profile_form.save(commit=False)
+            if upload is not None:
+                avatars.store_avatar(profile, upload)
+            profile.save()
+            messages.success(request, "Your profile has been updated.")
+            return redirect("profile")
+
+    avatar_urls = avatars.avatar_urls(profile)
+    return render(request, "accounts/profile.html", {
+        "user_form": user_form,
+        "profile_form": profile_form,
+        "avatar_url": avatar_urls[min(avatar_urls, key=lambda size: abs(size - 128))] if avatar_urls else None,
+        "avatar_srcset": ", ".join(f"{url} {size}w" for size, url in avatar_urls.items()),
+    })
 
 def register(request):
     form = UserCreationForm()
@@ -37,11 +72,3 @@ def login_view(request):   # ✅ MUST match the name in urls.py
 def logout_view(request):
     logout(request)
     return redirect('login')
-
-def profile(request):
-    return render(request, "accounts/profile.html")
-
-
-
-
-
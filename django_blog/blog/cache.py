@@ -0,0 +1,38 @@
+"""
+Template fragment caching for the blog pages.
+
+Cached fragments are keyed on a generation counter (and the page's own
+arguments). Saving or deleting a post, or renaming/deleting a user, bumps the
+counter (see blog.signals), so every stale fragment becomes unreachable at once
+and ages out of the cache; nothing is flushed wholesale.
+
+The counter lives in the cache itself, so invalidation only reaches the
+processes sharing that cache. With the default LocMemCache every worker process
+has its own counter and fragments: a change made through one worker leaves the
+others serving their stale fragments for up to FRAGMENT_TIMEOUT seconds. Run
+several workers only with a shared backend (BLOG_REDIS_URL, see settings.py).
+"""
+import time
+
+from django.core.cache import caches
+
+FRAGMENT_CACHE_ALIAS = 'default'
+FRAGMENT_TIMEOUT = 600
+GENERATION_KEY = 'generation:blog-posts'
+
+
+def get_generation():
+    cache = caches[FRAGMENT_CACHE_ALIAS]
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Start from the current time so a lost counter never repeats an old value.
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY, time.time_ns())
+    return generation
+
+
+def bump_generation():
+    try:
+        caches[FRAGMENT_CACHE_ALIAS].incr(GENERATION_KEY)
+    except ValueError:
+        pass  # never read yet: get_generation() starts a fresh one
@@ -0,0 +1,150 @@
+import datetime
+import random
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.utils import timezone
+from seeding import FIRST_NAMES, LAST_NAMES, insert_rows, zipf_weights
+
+from accounts.models import Profile
+from blog.cache import bump_generation
+from blog.models import Post
+from blog.search import update_search_vectors
+
+TOPICS = [
+    'Django', 'PostgreSQL', 'Python', 'caching', 'testing', 'deployment', 'REST APIs', 'templates',
+    'migrations', 'authentication', 'performance', 'async views', 'signals', 'forms', 'pagination',
+]
+TITLE_PATTERNS = [
+    'Getting started with {topic}',
+    'What I learned about {topic} this week',
+    '{topic} in production: {n} lessons',
+    'A practical guide to {topic}',
+    'Why {topic} matters',
+    '{topic} vs {other}',
+]
+SENTENCES = [
+    'This post walks through a small example step by step.',
+    'The official documentation covers the details, but a few things surprised me.',
+    'Measure before you optimize, and measure again afterwards.',
+    'Most of the time the database is where the time goes.',
+    'Start with the simplest thing that could possibly work.',
+    'Tests made the refactor much less scary.',
+    'Here is the configuration I ended up with.',
+    'The error message was not very helpful at first.',
+    'It turned out to be a missing index.',
+    'Feedback and questions are welcome in the comments.',
+]
+BIOS = [
+    '', '', 'Writer and reader.', 'Backend developer.', 'Learning Django one post at a time.',
+    'Coffee, code and books.', 'Student at ALX.', 'Open source enthusiast.',
+]
+
+
+class Command(BaseCommand):
+    """
+    Generate realistic, deterministic users, profiles and posts for scale testing.
+
+        python manage.py seed_data                                  # 10k users, 1M posts
+        python manage.py seed_data --users 50000 --posts 200000 --clear
+
+    The same --seed and sizes always produce the same rows (on an empty or --clear'ed
+    database; dates are relative to the time of the run). Every user gets a Profile and
+    the password given by --password (hashed once). Posts per user are skewed (a few
+    prolific writers, a long tail) and spread over the last --days days.
+
+    Users are created with bulk_create and profiles/posts with a plain executemany, in
+    batches and in one transaction, so no signals are sent: profiles are inserted directly
+    and, on PostgreSQL, the posts' search vectors are computed with one UPDATE at the end;
+    the cached blog pages are invalidated once.
+    """
+    help = "Bulk-insert deterministic synthetic users, profiles and posts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--posts', type=int, default=1_000_000)
+        parser.add_argument('--days', type=int, default=3 * 365)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--password', default='seed-password')
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--clear', action='store_true',
+                            help='Delete every post, and every user that is not a superuser, first.')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        connection = connections[using]
+        rng = random.Random(options['seed'])
+        start = time.perf_counter()
+        now = timezone.now().replace(microsecond=0)
+
+        with transaction.atomic(using=using):
+            if options['clear']:
+                # One DELETE, without loading the posts to send their signals (nothing references posts).
+                with connection.cursor() as cursor:
+                    cursor.execute(f'DELETE FROM {connection.ops.quote_name(Post._meta.db_table)}')
+                User.objects.using(using).filter(is_superuser=False).delete()
+
+            user_ids = self.create_users(using, rng, options, now)
+            self.stdout.write(f"Created {len(user_ids)} users and profiles ({time.perf_counter() - start:.1f}s).")
+
+            weights = zipf_weights(len(user_ids))
+            created = 0
+            while created < options['posts']:
+                size = min(options['batch_size'], options['posts'] - created)
+                insert_rows(connection, Post, ['title', 'content', 'published_date', 'author'],
+                            self.posts(rng, connection, user_ids, weights, size, now, options['days']))
+                created += size
+                if created % 100_000 < size:
+                    self.stdout.write(f"  {created} posts ({time.perf_counter() - start:.1f}s)")
+
+            if update_search_vectors(Post.objects.using(using).filter(search_vector__isnull=True)):
+                self.stdout.write(f"Indexed posts for search ({time.perf_counter() - start:.1f}s).")
+
+        bump_generation()
+        self.stdout.write(self.style.SUCCESS(f"Created {created} posts in {time.perf_counter() - start:.1f}s."))
+
+    def create_users(self, using, rng, options, now):
+        password = make_password(options['password'])
+        offset = User.objects.using(using).filter(username__startswith='reader').count()
+        users = []
+        for number in range(offset, offset + options['users']):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            mailbox = f'{first}.{last}'.lower().replace(' ', '').replace("'", '')  # "wa Thiong'o"
+            users.append(User(
+                username=f'reader{number:07d}',
+                first_name=first,
+                last_name=last,
+                email=f'{mailbox}.{number}@example.com',
+                password=password,
+                date_joined=now - datetime.timedelta(days=rng.randrange(options['days'] + 1)),
+            ))
+        users = User.objects.using(using).bulk_create(users, batch_size=options['batch_size'])
+        if None in (user.pk for user in users):  # backends that cannot return ids from bulk inserts
+            by_name = dict(User.objects.using(using).filter(username__in=[user.username for user in users])
+                           .values_list('username', 'id'))
+            for user in users:
+                user.pk = by_name[user.username]
+
+        connection = connections[using]
+        updated_at = connection.ops.adapt_datetimefield_value(now)
+        insert_rows(connection, Profile, ['user', 'bio', 'updated_at'],
+                    [(user.pk, rng.choice(BIOS), updated_at) for user in users])
+        return [user.pk for user in users]
+
+    @staticmethod
+    def posts(rng, connection, user_ids, weights, size, now, days):
+        """(title, content, published_date, author_id) rows."""
+        authors = rng.choices(user_ids, cum_weights=weights, k=size)
+        adapt = connection.ops.adapt_datetimefield_value
+        rows = []
+        for author_id in authors:
+            topic, other = rng.sample(TOPICS, 2)
+            title = rng.choice(TITLE_PATTERNS).format(topic=topic, other=other, n=rng.randint(3, 10))
+            content = '\n\n'.join(' '.join(rng.sample(SENTENCES, 4)) for _ in range(rng.randint(1, 4)))
+            published = now - datetime.timedelta(seconds=rng.randrange(days * 86400))
+            rows.append((title, content, adapt(published), author_id))
+        return rows
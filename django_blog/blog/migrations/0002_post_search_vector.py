@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:22
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from blog.search import post_search_vector
+
+
+def create_search_index(apps, schema_editor):
+    # GIN indexes (and to_tsvector) only exist on PostgreSQL; elsewhere search uses icontains.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.using(schema_editor.connection.alias).update(search_vector=post_search_vector())
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS "blog_post_search_vector_gin" ON "blog_post" USING gin ("search_vector")'
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS "blog_post_search_vector_gin"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
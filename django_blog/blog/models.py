@@ -1,14 +1,24 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 
 class Post(models.Model):  # <-- you forgot this line
     title = models.CharField(max_length=200)
     content = models.TextField()
     published_date = models.DateTimeField(auto_now_add=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts')
+    # Weighted title (A) + content (B) tsvector, maintained by blog.signals and
+    # GIN-indexed on PostgreSQL (migration 0002). See blog.search.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
       ordering = ['-published_date']
+      indexes = [
+          # Home feed and author archives, keyset-paginated on (published_date, id) descending
+          # (see blog.pagination): each page is one index range scan.
+          models.Index(fields=['-published_date', '-id'], name='blog_post_published_id_idx'),
+          models.Index(fields=['author', '-published_date', '-id'], name='blog_post_author_pub_idx'),
+      ]
 
     def __str__(self):
         return self.title
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Keyset ("cursor") pagination for post feeds, newest first.
+
+Pages are addressed by the (published_date, id) of the last post of the
+previous page instead of an offset, so page 1000 costs the same index range
+scan as page 1 and posts published meanwhile never shift pages.
+
+KeysetPage is lazy: nothing is queried until the template reads page.posts /
+page.next_cursor / page.previous_cursor, so a page whose fragment is cached
+costs no query at all.
+"""
+import base64
+import binascii
+import datetime
+
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+PAGE_SIZE = 20
+
+
+def encode_cursor(post):
+    return _encode(post.published_date, post.pk)
+
+
+def _encode(published, pk):
+    raw = f"{published.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(published_date, id) from a cursor; Http404 for anything that is not one of ours."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        published, pk = raw.split('|')
+        published = datetime.datetime.fromisoformat(published)
+        return published, int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise Http404("Invalid cursor")
+
+
+class KeysetPage:
+    def __init__(self, queryset, cursor=None, page_size=PAGE_SIZE):
+        self.queryset = queryset
+        self.cursor = cursor or ''
+        self.position = decode_cursor(cursor) if cursor else None
+        self.page_size = page_size
+
+    @cached_property
+    def _rows(self):
+        queryset = self.queryset.order_by('-published_date', '-id')
+        if self.position is not None:
+            published, pk = self.position
+            queryset = queryset.filter(Q(published_date__lt=published) | Q(published_date=published, id__lt=pk))
+        # One extra row tells whether there is a next page.
+        return list(queryset[:self.page_size + 1])
+
+    @property
+    def posts(self):
+        return self._rows[:self.page_size]
+
+    @property
+    def next_cursor(self):
+        if len(self._rows) > self.page_size:
+            return encode_cursor(self._rows[self.page_size - 1])
+        return None
+
+    @cached_property
+    def previous_cursor(self):
+        """
+        Cursor of the page before this one: '' when it is the first page, None on the
+        first page itself. The previous page is the page_size posts from the cursor's
+        post up; its cursor is the post right above them (one query, index range scan).
+        """
+        if self.position is None:
+            return None
+        published, pk = self.position
+        above = (
+            self.queryset.filter(Q(published_date__gt=published) | Q(published_date=published, id__gte=pk))
+            .order_by('published_date', 'id')
+            .values_list('published_date', 'id')
+        )
+        rows = list(above[self.page_size:self.page_size + 1])
+        return _encode(*rows[0]) if rows else ''
@@ -0,0 +1,38 @@
+"""
+Full-text search for blog posts.
+
+PostgreSQL: ranked search over the GIN-indexed Post.search_vector column.
+Other databases (e.g. SQLite during local runs): plain icontains matching.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F, Q
+
+SEARCH_CONFIG = 'english'
+
+
+def post_search_vector():
+    """Expression for Post.search_vector: title weighs more than content."""
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('content', weight='B', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(queryset):
+    """Recompute search_vector for every post in `queryset` with one UPDATE."""
+    if connections[queryset.db].vendor == 'postgresql':
+        return queryset.update(search_vector=post_search_vector())
+    return 0
+
+
+def search_posts(queryset, term):
+    """Posts in `queryset` matching `term`, most relevant first."""
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset.filter(Q(title__icontains=term) | Q(content__icontains=term))
+    query = SearchQuery(term, search_type='websearch', config=SEARCH_CONFIG)
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(rank=SearchRank(F('search_vector'), query))
+        .order_by('-rank', '-published_date')
+    )
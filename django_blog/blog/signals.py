@@ -0,0 +1,33 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_generation
+from .models import Post
+from .search import update_search_vectors
+
+
+@receiver(post_save, sender=Post)
+def update_post_search_vector(sender, instance, raw=False, using='default', update_fields=None, **kwargs):
+    # Only title/content feed the vector; skip saves that touched neither.
+    if raw or (update_fields is not None and not {'title', 'content'} & set(update_fields)):
+        return
+    update_search_vectors(Post.objects.using(using).filter(pk=instance.pk))
+
+
+# -------------------- FRAGMENT CACHE --------------------
+# Bumped on commit, so no request caches the old rows under the new generation.
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_fragments(sender, using='default', **kwargs):
+    transaction.on_commit(bump_generation, using=using)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_author_fragments(sender, created=False, update_fields=None, using='default', **kwargs):
+    # Pages show author names; a new user, or a login (last_login only), changes none.
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    transaction.on_commit(bump_generation, using=using)
@@ -1,3 +1,85 @@
+import datetime
+import io
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Profile
+from .cache import FRAGMENT_CACHE_ALIAS
+from .models import Post
+from .pagination import KeysetPage
+
+
+class SeedDataTests(TestCase):
+    def seed(self, **options):
+        call_command("seed_data", users=5, posts=30, batch_size=10, days=30, stdout=io.StringIO(), **options)
+
+    def test_seed_data_creates_users_profiles_and_posts(self):
+        self.seed()
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Profile.objects.count(), 5)
+        self.assertEqual(Post.objects.count(), 30)
+        self.seed(clear=True)
+        self.assertEqual((User.objects.count(), Profile.objects.count(), Post.objects.count()), (5, 5, 30))
+
+
+class BlogPageTests(TestCase):
+    def setUp(self):
+        caches[FRAGMENT_CACHE_ALIAS].clear()
+        self.author = User.objects.create_user(username="writer", password="password123")
+        now = timezone.now()
+        self.posts = [Post.objects.create(title=f"Post {i}", content="Body", author=self.author) for i in range(8)]
+        # Pairs of posts published at the same instant: the id breaks the tie.
+        for i, post in enumerate(self.posts):
+            post.published_date = now - datetime.timedelta(minutes=i // 2)
+        Post.objects.bulk_update(self.posts, ["published_date"])
+
+    def walk(self, cursor, direction):
+        """The pages (lists of post ids) from `cursor` on, following next_cursor or previous_cursor."""
+        pages = []
+        while cursor is not None:
+            page = KeysetPage(Post.objects.all(), cursor, page_size=3)
+            pages.append((cursor, [post.pk for post in page.posts]))
+            cursor = getattr(page, direction)
+        return pages
+
+    def test_cursors_walk_every_post(self):
+        newest_first = sorted(self.posts, key=lambda post: (post.published_date, post.pk), reverse=True)
+        forward = self.walk("", "next_cursor")
+        self.assertEqual([ids for _, ids in forward], [[post.pk for post in newest_first[i:i + 3]] for i in (0, 3, 6)])
+        backward = self.walk(forward[-1][0], "previous_cursor")
+        self.assertEqual(backward, forward[::-1])
+
+    def test_invalid_cursor_is_404(self):
+        for cursor in ["garbage", "!!!", "MjAyNnx4"]:
+            self.assertEqual(self.client.get(reverse("post-list"), {"cursor": cursor}).status_code, 404, cursor)
+
+    def test_cached_page_runs_no_query(self):
+        self.client.get(reverse("post-list"))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("post-list"))
+        self.assertContains(response, "Post 0")
+
+    def test_saving_a_post_invalidates_fragments(self):
+        detail = reverse("post-detail", args=[self.posts[0].pk])
+        self.assertContains(self.client.get(reverse("post-list")), "Post 0")
+        self.assertContains(self.client.get(detail), "Post 0")
+        self.posts[0].title = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.posts[0].save()
+        self.assertContains(self.client.get(reverse("post-list")), "Renamed")
+        self.assertContains(self.client.get(detail), "Renamed")
 
-# Create your tests here.
+    def test_fragments_are_invalidated_on_commit(self):
+        self.client.get(reverse("post-list"))
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.posts[0].title = "Renamed"
+            self.posts[0].save()
+            self.assertNotContains(self.client.get(reverse("post-list")), "Renamed")
+        for callback in callbacks:
+            callback()
+        self.assertContains(self.client.get(reverse("post-list")), "Renamed")
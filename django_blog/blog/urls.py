@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.post_list, name='post-list'),
+    path('posts/<int:pk>/', views.post_detail, name='post-detail'),
+    path('authors/<str:username>/', views.author_posts, name='author-posts'),
+]
@@ -1,3 +1,62 @@
-from django.shortcuts import render
+from django.contrib.auth.models import User
+from django.db.models.functions import Left
+from django.shortcuts import get_object_or_404, render
+from django.utils.functional import SimpleLazyObject
 
-# Create your views here.
+from .cache import FRAGMENT_TIMEOUT, get_generation
+from .models import Post
+from .pagination import KeysetPage
+
+EXCERPT_LENGTH = 300
+
+# Every page below renders its content inside {% cache %} fragments keyed on the cache
+# generation (see blog.cache); the objects handed to the templates are lazy, so a
+# cached page runs no query.
+
+
+def feed_queryset():
+    """Posts for the list pages: author joined in, and only the start of the content loaded."""
+    return (
+        Post.objects.select_related('author')
+        .defer('content', 'search_vector')
+        .annotate(excerpt=Left('content', EXCERPT_LENGTH + 1))
+    )
+
+
+def post_list(request):
+    """Home feed: every post, newest first."""
+    cursor = request.GET.get('cursor', '')
+    return render(request, "blog/post_list.html", {
+        "page": KeysetPage(feed_queryset(), cursor),
+        "cursor": cursor,
+        "generation": get_generation(),
+        "fragment_timeout": FRAGMENT_TIMEOUT,
+        "excerpt_length": EXCERPT_LENGTH,
+    })
+
+
+def author_posts(request, username):
+    """One author's posts, newest first."""
+    cursor = request.GET.get('cursor', '')
+    author = SimpleLazyObject(lambda: get_object_or_404(User, username=username))
+    return render(request, "blog/post_list.html", {
+        "author": author,
+        "username": username,
+        "page": KeysetPage(feed_queryset().filter(author__username=username), cursor),
+        "cursor": cursor,
+        "generation": get_generation(),
+        "fragment_timeout": FRAGMENT_TIMEOUT,
+        "excerpt_length": EXCERPT_LENGTH,
+    })
+
+
+def post_detail(request, pk):
+    post = SimpleLazyObject(
+        lambda: get_object_or_404(Post.objects.select_related('author').defer('search_vector'), pk=pk)
+    )
+    return render(request, "blog/post_detail.html", {
+        "post": post,
+        "post_id": pk,
+        "generation": get_generation(),
+        "fragment_timeout": FRAGMENT_TIMEOUT,
+    })
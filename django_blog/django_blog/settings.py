@@ -9,10 +9,15 @@ https://docs.djangoproject.com/en/5.2/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
+import os
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Packages shared by the projects of this repository live in ../shared.
+sys.path.append(str(BASE_DIR.parent / 'shared'))
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 
 SECRET_KEY = 'django-insecure-(1#hs9vo#e@05sn_$6pcqz=c_om_pc(p!l9==!wkwsuue#bm)f'
@@ -32,6 +37,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # full-text search (SearchVector / GIN) for blog posts
     'blog',
     'accounts.apps.AccountsConfig',
 ]
@@ -74,6 +80,17 @@ LOGOUT_REDIRECT_URL = 'login' # after logout
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Avatar uploads: content-hashed originals + thumbnails generated off the
+# request thread (see accounts/avatars.py). Serve MEDIA_URL/avatars/ with
+# "Cache-Control: public, max-age=31536000, immutable".
+AVATARS = {
+    'SIZES': (64, 128, 256),
+    'FORMAT': 'WEBP',
+    'QUALITY': 82,
+    'MAX_UPLOAD_SIZE': 5 * 1024 * 1024,
+    'WORKERS': 2,
+}
+
 WSGI_APPLICATION = 'django_blog.wsgi.application'
 
 
@@ -88,9 +105,51 @@ DATABASES = {
         'PASSWORD': 'SAM20034@',
         'HOST': 'localhost',
         'PORT': '5432',
+        # Keep each thread's connection open between requests (checked before
+        # reuse), instead of paying a new connection handshake per request.
+        'CONN_MAX_AGE': int(os.environ.get('BLOG_DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Or share a psycopg connection pool between the threads of each process
+# (BLOG_DB_POOL=1, needs the psycopg-pool package). Django does not allow
+# persistent connections together with a pool: connections are returned to the
+# pool at the end of every request instead, and CONN_HEALTH_CHECKS makes the
+# pool check a connection before handing it out.
+if os.environ.get('BLOG_DB_POOL') == '1':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.environ.get('BLOG_DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('BLOG_DB_POOL_MAX_SIZE', 10)),
+            'timeout': 10,  # seconds to wait for a free connection before failing
+            'max_idle': 300,  # close connections idle for longer (down to min_size)
+            'max_lifetime': 3600,  # recycle connections, with some jitter
+        },
+    }
+
+# Cache (template fragments of the blog pages, see blog/cache.py)
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The default in-process cache is not shared: with several worker processes, set
+# BLOG_REDIS_URL (e.g. redis://localhost:6379/0, needs the redis package) so that
+# every worker sees the same generation counter and fragments.
+
+if os.environ.get('BLOG_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['BLOG_REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,154 @@
+"""
+Read replicas for Django projects (shared by advanced-api-project and api_project).
+
+- ReplicaRouter (settings.DATABASE_ROUTERS = ['db_replicas.ReplicaRouter']): writes
+  always go to 'default'; reads go to 'default' too, except inside reading_from(alias).
+- choose_replica(user, modified_at): a random replica for a read, or None when a
+  replica could miss data the client expects:
+    * the user wrote something less than STICKY_SECONDS ago (read-your-writes;
+      ReplicaStickinessMiddleware records every successful write), or
+    * the data changed less than MAX_LAG seconds ago.
+  Each project's views decide what to run inside reading_from(choose_replica(...)).
+- `manage.py sync_replicas` (with 'db_replicas' in INSTALLED_APPS) refreshes local
+  SQLite replicas, a stand-in for real replication.
+
+Settings (settings.DATABASE_REPLICAS, every key optional):
+
+    ALIASES         replica aliases of settings.DATABASES (default: none, everything
+                    reads from 'default')
+    STICKY_SECONDS  how long a user's reads stay on the primary after a write (default 10)
+    MAX_LAG         replication lag the replicas are expected to stay under (default 5)
+    CACHE_ALIAS     cache holding the sticky marks (default 'default'; with several
+                    worker processes it must be shared, e.g. Redis)
+"""
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+DEFAULTS = {
+    'ALIASES': [],
+    'STICKY_SECONDS': 10,
+    'MAX_LAG': 5,
+    'CACHE_ALIAS': 'default',
+}
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_alias = ContextVar('replica_read_alias', default=None)
+
+
+def get_setting(name):
+    return getattr(settings, 'DATABASE_REPLICAS', {}).get(name, DEFAULTS[name])
+
+
+@contextmanager
+def reading_from(alias):
+    """Route the ORM reads of the block to `alias` (None: the router's default)."""
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+# -------------------- stickiness --------------------
+def sticky_key(user):
+    return f'replicas:sticky:{user.pk}'
+
+
+def mark_sticky(user):
+    """Keep `user`'s reads on the primary for STICKY_SECONDS."""
+    caches[get_setting('CACHE_ALIAS')].set(sticky_key(user), True, get_setting('STICKY_SECONDS'))
+
+
+def is_sticky(user):
+    if not user or not user.is_authenticated:
+        return False
+    return caches[get_setting('CACHE_ALIAS')].get(sticky_key(user), False)
+
+
+def choose_replica(user, modified_at=None):
+    """
+    A random replica alias for `user`'s reads, or None when they must go to the
+    primary (no replicas, the user is sticky, or the data changed at `modified_at`,
+    a Unix time, less than MAX_LAG seconds ago).
+    """
+    aliases = get_setting('ALIASES')
+    if not aliases:
+        return None
+    if modified_at is not None and time.time() - modified_at < get_setting('MAX_LAG'):
+        return None
+    if is_sticky(user):
+        return None
+    return random.choice(aliases)
+
+
+# -------------------- router --------------------
+class ReplicaRouter:
+    """
+    ReplicaRouter
+    - db_for_read: the alias chosen by reading_from(), else the default.
+    - db_for_write: always 'default'.
+    - Replicas are copies of 'default': relations between them are allowed,
+      and they are never migrated (they receive the primary's schema).
+    """
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *get_setting('ALIASES')}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in get_setting('ALIASES'):
+            return False
+        return None
+
+
+# -------------------- middleware --------------------
+class ReplicaStickinessMiddleware:
+    """
+    ReplicaStickinessMiddleware
+    - Marks the user sticky (see mark_sticky()) after every successful
+      POST/PUT/PATCH/DELETE, whichever view handled it.
+    - Sees users authenticated by DRF too: DRF sets request.user on the
+      underlying HttpRequest when it authenticates.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self.wrote(request, response):
+            mark_sticky(request.user)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.wrote(request, response):
+            await sync_to_async(mark_sticky)(request.user)
+        return response
+
+    @staticmethod
+    def wrote(request, response):
+        if request.method in SAFE_METHODS or response.status_code >= 400 or not get_setting('ALIASES'):
+            return False
+        user = getattr(request, 'user', None)
+        return bool(user and user.is_authenticated)
@@ -0,0 +1,61 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from db_replicas import get_setting
+
+
+class Command(BaseCommand):
+    """
+    Stand-in replication for local SQLite replicas: copy the primary database
+    file onto every replica of settings.DATABASE_REPLICAS['ALIASES'].
+
+        API_REPLICAS=2 python manage.py sync_replicas               # once
+        API_REPLICAS=2 python manage.py sync_replicas --interval 1  # every second, until Ctrl-C
+
+    Uses SQLite's online backup API, so the primary stays readable and writable
+    during the copy and every replica receives a consistent snapshot. Keep the
+    interval well under DATABASE_REPLICAS['MAX_LAG']. Real replicas (e.g.
+    PostgreSQL streaming replication) need no such command.
+    """
+    help = "Copy the primary SQLite database onto the local replicas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help='Repeat every INTERVAL seconds.')
+
+    def handle(self, *args, **options):
+        primary = self.sqlite_path('default')
+        replicas = {alias: self.sqlite_path(alias) for alias in get_setting('ALIASES')}
+        if not replicas:
+            raise CommandError("No replicas configured (settings.DATABASE_REPLICAS['ALIASES']).")
+
+        while True:
+            start = time.perf_counter()
+            for alias, path in replicas.items():
+                connections[alias].close()  # this process's own connection, if any
+                self.copy(primary, path)
+            self.stdout.write(f"Synced {len(replicas)} replicas in {(time.perf_counter() - start) * 1000:.0f} ms.")
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
+
+    @staticmethod
+    def sqlite_path(alias):
+        database = settings.DATABASES.get(alias)
+        if database is None or database['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError(f"'{alias}' is not a SQLite database; use the database's own replication.")
+        return str(database['NAME'])
+
+    @staticmethod
+    def copy(source_path, target_path):
+        source = sqlite3.connect(source_path)
+        # Wait for the replica's readers instead of failing with "database is locked".
+        target = sqlite3.connect(target_path, timeout=20)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
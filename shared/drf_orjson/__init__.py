@@ -0,0 +1,8 @@
+"""
+orjson-backed DRF renderer and parser, used by advanced-api-project and api_project:
+
+    'DEFAULT_RENDERER_CLASSES': ['drf_orjson.renderers.ORJSONRenderer', ...],
+    'DEFAULT_PARSER_CLASSES': ['drf_orjson.parsers.ORJSONParser', ...],
+
+Both behave exactly like DRF's JSON classes when orjson is not installed.
+"""
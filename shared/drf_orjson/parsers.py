@@ -0,0 +1,42 @@
+"""
+orjson-backed JSON parser (see drf_orjson.renderers.ORJSONRenderer for the renderer).
+"""
+import codecs
+import io
+import re
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+WIDE_NUMBER = re.compile(rb'\d{20}')
+
+
+class ORJSONParser(JSONParser):
+    """
+    ORJSONParser
+    - Drop-in replacement for rest_framework.parsers.JSONParser, decoding UTF-8 bodies with orjson
+      (straight from bytes, no intermediate str).
+    - Bodies orjson rejects or would read differently (syntax errors, NaN/Infinity, integers
+      wider than 64 bits) and other charsets go through JSONParser, so results and error
+      messages are the same as before.
+    - Without orjson installed this is exactly JSONParser.
+    """
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        # orjson turns integers wider than 64 bits into floats; leave those to JSONParser.
+        if WIDE_NUMBER.search(body) is None:
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse(io.BytesIO(body), media_type, parser_context)
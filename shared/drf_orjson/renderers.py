@@ -0,0 +1,64 @@
+"""
+orjson-backed JSON renderer (see drf_orjson.parsers.ORJSONParser for the parser).
+
+orjson encodes straight to UTF-8 bytes in C, several times faster than the
+stdlib json module and without the intermediate str. Output is the same as
+DRF's JSONRenderer:
+
+- Values orjson does not handle the way DRF does (datetimes, dates, times,
+  decimals, lazy translation strings, querysets, ...) are passed to DRF's own
+  JSONEncoder.default(), so they are formatted by the same code.
+- U+2028 / U+2029 are escaped like DRF does.
+- Anything orjson cannot produce identically (indent other than 2 — e.g. the
+  browsable API —, UNICODE_JSON=False, COMPACT_JSON=False, integers wider
+  than 64 bits) falls back to JSONRenderer.
+
+Differences: with STRICT_JSON, NaN and infinities become null instead of
+raising ValueError, and floats Python would write with an exponent may be
+spelled differently (1e23 for 1e+23, 0.00001 for 1e-05: same values).
+
+Without orjson installed this is exactly DRF's JSONRenderer.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+LINE_SEPARATOR = '\u2028'.encode('utf-8')
+PARAGRAPH_SEPARATOR = '\u2029'.encode('utf-8')
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    ORJSONRenderer
+    - Drop-in replacement for rest_framework.renderers.JSONRenderer (same media type and format).
+    """
+    options = (
+        (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS)
+        if orjson else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent not in (None, 2):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        options = self.options | orjson.OPT_INDENT_2 if indent == 2 else self.options
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=options)
+        except orjson.JSONEncodeError:
+            # Let the stdlib encoder either succeed or raise its usual error.
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep the output a strict JavaScript subset, like JSONRenderer.
+        if LINE_SEPARATOR in ret or PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(LINE_SEPARATOR, b'\\u2028').replace(PARAGRAPH_SEPARATOR, b'\\u2029')
+        return ret
@@ -0,0 +1,86 @@
+"""
+Word lists and row helpers for the seed_data management commands.
+
+Every command draws from a random.Random(seed) it owns, so the same --seed and
+sizes always produce the same rows; the helpers here only decide what a row
+looks like.
+"""
+import functools
+import itertools
+
+FIRST_NAMES = [
+    'Chinua', 'Chimamanda', 'Wole', 'Ngugi', 'Buchi', 'Toni', 'Jane', 'Leo', 'Gabriel', 'Haruki',
+    'Margaret', 'James', 'Virginia', 'Fyodor', 'Isabel', 'Orhan', 'Zadie', 'Kazuo', 'Nadine', 'Ama',
+    'Ben', 'Yaa', 'Teju', 'Helon', 'Elena', 'Jhumpa', 'Salman', 'Arundhati', 'Italo', 'Clarice',
+]
+LAST_NAMES = [
+    'Achebe', 'Adichie', 'Soyinka', "wa Thiong'o", 'Emecheta', 'Morrison', 'Austen', 'Tolstoy',
+    'Garcia Marquez', 'Murakami', 'Atwood', 'Baldwin', 'Woolf', 'Dostoevsky', 'Allende', 'Pamuk',
+    'Smith', 'Ishiguro', 'Gordimer', 'Aidoo', 'Okri', 'Gyasi', 'Cole', 'Habila', 'Ferrante',
+    'Lahiri', 'Rushdie', 'Roy', 'Calvino', 'Lispector',
+]
+AUTHOR_NAMES = [f'{first} {last}' for first in FIRST_NAMES for last in LAST_NAMES]
+
+TITLE_ADJECTIVES = [
+    'Silent', 'Broken', 'Golden', 'Last', 'Hidden', 'Yellow', 'Purple', 'Restless', 'Distant',
+    'Burning', 'Lost', 'Bright', 'Forgotten', 'Quiet', 'Wild', 'Secret', 'Open', 'Long', 'Little', 'Great',
+]
+TITLE_NOUNS = [
+    'River', 'Sun', 'Hibiscus', 'Arrow', 'Harvest', 'Kingdom', 'Garden', 'Season', 'Road', 'Houses',
+    'City', 'Mountain', 'Daughter', 'Stranger', 'Night', 'Sea', 'Voices', 'Orchard', 'Letters', 'Bridge',
+]
+TITLE_PATTERNS = [
+    'The {adjective} {noun}',
+    '{adjective} {noun}',
+    'A {noun} for the {noun2}',
+    'The {noun} and the {noun2}',
+    'Songs of the {adjective} {noun2}',
+]
+TITLES = list(dict.fromkeys(  # patterns without {noun2} repeat
+    pattern.format(adjective=adjective, noun=noun, noun2=noun2)
+    for pattern in TITLE_PATTERNS
+    for adjective in TITLE_ADJECTIVES
+    for noun in TITLE_NOUNS
+    for noun2 in TITLE_NOUNS
+    if noun != noun2
+))
+
+# Mostly recent books, back to 1900 (weights grow with the square of the year).
+YEARS = list(range(1900, 2025))
+YEAR_WEIGHTS = list(itertools.accumulate(1 + (year - 1900) ** 2 for year in YEARS))
+
+
+@functools.lru_cache
+def zipf_weights(count):
+    """Cumulative Zipf-like weights: a few authors write most books, then a long tail."""
+    return list(itertools.accumulate(1 / (rank + 10) for rank in range(count)))
+
+
+def book_rows(rng, size, authors, years=False):
+    """
+    `size` (title, author[, publication_year]) rows, with authors drawn from `authors`
+    (names or ids) by zipf_weights(). Whole columns are drawn at once with choices().
+    """
+    columns = [
+        rng.choices(TITLES, k=size),
+        rng.choices(authors, cum_weights=zipf_weights(len(authors)), k=size),
+    ]
+    if years:
+        columns.append(rng.choices(YEARS, cum_weights=YEAR_WEIGHTS, k=size))
+    return list(zip(*columns))
+
+
+def insert_rows(connection, model, fields, rows):
+    """
+    INSERT `rows` (tuples of database values for `fields`) with one executemany().
+
+    bulk_create() would build a model instance per row and compile every value through
+    the fields, which costs more than the INSERTs themselves at millions of rows. Values
+    must already be database values (ints and strings as they are, datetimes through
+    connection.ops.adapt_datetimefield_value()); like bulk_create, no signals are sent.
+    """
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(model._meta.get_field(field).column) for field in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+    with connection.cursor() as cursor:
+        cursor.executemany(f'INSERT INTO {quote(model._meta.db_table)} ({columns}) VALUES ({placeholders})', rows)
@@ -0,0 +1,56 @@
+"""
+SQLite tuned for several worker processes sharing the file
+(settings.DATABASES[...]['OPTIONS'] = SQLITE_OPTIONS):
+
+- timeout: wait up to 20s for the write lock instead of "database is locked"
+  (SQLite's busy_timeout).
+- BEGIN IMMEDIATE: transactions (atomic blocks) take the write lock up front,
+  so they queue on the busy timeout instead of failing when a read
+  transaction later tries to upgrade to a write.
+
+With 'sqlite_options' in INSTALLED_APPS, every new connection to a database
+file using SQLITE_OPTIONS also gets (see tune_connection()):
+
+- mmap_size / cache_size (KiB when negative): read hot pages without syscalls.
+  Skipped for in-memory databases (the test databases), which gain nothing.
+- synchronous=NORMAL once the file is in WAL mode: durable enough there and
+  saves an fsync per commit.
+
+The WAL journal itself (readers no longer wait for a writer, nor block its
+commit) is stored in the database file, so it is switched on once with
+`manage.py enable_wal` rather than on every connection.
+"""
+SQLITE_OPTIONS = {
+    'timeout': 20,
+    'transaction_mode': 'IMMEDIATE',
+}
+
+FILE_PRAGMAS = [
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-65536',
+    'PRAGMA temp_store=MEMORY',
+]
+
+
+def tune_connection(sender, connection, **kwargs):
+    """connection_created receiver applying FILE_PRAGMAS (see the module docstring)."""
+    if connection.vendor != 'sqlite' or connection.settings_dict.get('OPTIONS') != SQLITE_OPTIONS:
+        return
+    if connection.is_in_memory_db():
+        return
+    with connection.cursor() as cursor:
+        for pragma in FILE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.execute('PRAGMA journal_mode')
+        if cursor.fetchone()[0] == 'wal':
+            cursor.execute('PRAGMA synchronous=NORMAL')
+
+
+def enable_wal(connection):
+    """Switch the database file of `connection` to WAL mode; returns the resulting journal mode."""
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode=WAL')
+        mode = cursor.fetchone()[0]
+        if mode == 'wal':
+            cursor.execute('PRAGMA synchronous=NORMAL')
+    return mode
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class SQLiteOptionsConfig(AppConfig):
+    name = 'sqlite_options'
+
+    def ready(self):
+        from . import tune_connection
+        connection_created.connect(tune_connection, dispatch_uid='sqlite_options.tune_connection')
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from sqlite_options import enable_wal
+
+
+class Command(BaseCommand):
+    """
+    Switch the SQLite database files to WAL journal mode.
+
+        python manage.py enable_wal                    # every SQLite database in settings.DATABASES
+        python manage.py enable_wal --database default
+
+    The journal mode is stored in the file, so this is needed once per database
+    (and again after replacing the file). In-memory databases are skipped.
+    """
+    help = "Switch the SQLite databases to WAL journal mode (once per database file)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', help='Only this alias (default: every SQLite database).')
+
+    def handle(self, *args, **options):
+        aliases = [options['database']] if options['database'] else list(connections)
+        for alias in aliases:
+            connection = connections[alias]
+            if connection.vendor != 'sqlite' or connection.is_in_memory_db():
+                if options['database']:
+                    raise CommandError(f"'{alias}' is not a SQLite database file.")
+                continue
+            self.stdout.write(f"{alias}: journal_mode={enable_wal(connection)}")